@@ -1,46 +1,323 @@
 """
 HTTP client for making API requests to the integration platform.
 Handles authentication, error handling, and response parsing.
+
+Requests go through one pooled httpx.AsyncClient, so the MCP tools can await
+them concurrently without blocking the server's event loop. Successful GET
+responses are cached (see response_cache.py), revalidated with
+If-None-Match / If-Modified-Since once they expire, served stale while a
+background refresh runs, and concurrent misses for one key are coalesced.
+An optional SQLite tier (disk_cache.py) keeps entries across restarts.
+
+With API_TRANSPORT=asgi the requests are dispatched straight into the
+rest_api_server FastAPI app in this process (no socket, shared DB pool).
+
+Calls are held to client-side rate and concurrency limits (rate_limit.py).
+GETs are retried with jittered backoff, optionally hedged after the p95
+latency, and a per-endpoint circuit breaker fails fast while an endpoint keeps
+failing (see resilience.py).
 """
 
-import requests
-from typing import Optional, Dict, Any
+import asyncio
+import logging
+import sqlite3
+import time
+import httpx
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit
 from .api_config import api_config
+from .disk_cache import DiskCache
+from .rate_limit import QueueTimeout, RateLimiter
+from .resilience import (
+    RETRY_STATUS_CODES, CircuitBreaker, LatencyTracker, backoff_delay, endpoint_group
+)
+from .response_cache import CacheEntry, ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Base URL of requests dispatched in-process (the host is never resolved)
+IN_PROCESS_BASE_URL = "http://rest-api-server.in-process"
 
 
 class APIClient:
-    """HTTP client for integration platform API."""
+    """Async HTTP client for integration platform API."""
     
     def __init__(self):
         self.base_url = api_config.base_url
         self.timeout = api_config.timeout
-        self.session = requests.Session()
-        self.session.headers.update(api_config.get_auth_headers())
+        self.max_connections_per_host = api_config.max_connections_per_host
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        
+        # In-process mode: the REST app and its lifespan (notify listener,
+        # matview refresher), started before the first request
+        self.app = None
+        self._app_lifespan = None
+        self._app_started: Optional[asyncio.Task] = None
+        if api_config.transport == "asgi":
+            self.base_url = IN_PROCESS_BASE_URL
+            self.client = self._create_in_process_client()
+        else:
+            self.client = self._create_client()
+        self.cache = ResponseCache(
+            default_ttl=api_config.cache_ttl,
+            endpoint_ttls=api_config.cache_endpoint_ttls,
+            max_entries=api_config.cache_max_entries,
+            max_bytes=api_config.cache_max_bytes,
+            stale_ttl=api_config.cache_stale_while_revalidate
+        ) if api_config.cache_enabled else None
+        self.disk_cache = DiskCache(
+            api_config.cache_disk_path,
+            max_bytes=api_config.cache_disk_max_bytes,
+            namespace=self.base_url,
+            stale_ttl=api_config.cache_stale_while_revalidate
+        ) if api_config.cache_enabled and api_config.cache_disk_path else None
+        
+        # In-flight GET requests by cache key (single-flight)
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        
+        # Retries, circuit breaker and hedged requests
+        self.retries = api_config.retries
+        self.breaker = CircuitBreaker(
+            failure_threshold=api_config.breaker_failures,
+            reset_timeout=api_config.breaker_reset_timeout
+        ) if api_config.breaker_failures else None
+        self.latency = LatencyTracker(min_samples=api_config.hedge_min_samples) if api_config.hedge_enabled else None
+        self.hedged_requests = 0
+        
+        # Client-side rate limits; calls over a limit wait up to queue_timeout
+        self.queue_timeout = api_config.queue_timeout
+        self.rate_limiter = RateLimiter(
+            rate=api_config.rate_limit,
+            burst=api_config.rate_burst,
+            max_in_flight=api_config.max_in_flight,
+            prefix_rates=api_config.prefix_rate_limits,
+            prefix_max_in_flight=api_config.prefix_max_in_flight
+        ) if api_config.rate_limiting_enabled() else None
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create the pooled client from the connection settings in api_config."""
+        limits = httpx.Limits(
+            max_connections=api_config.max_connections,
+            max_keepalive_connections=api_config.max_keepalive_connections,
+            keepalive_expiry=api_config.keepalive_expiry,
+        )
+        options = dict(
+            headers=api_config.get_auth_headers(),
+            auth=api_config.get_basic_auth(),
+            timeout=httpx.Timeout(self.timeout, connect=api_config.connect_timeout),
+            limits=limits,
+        )
+        
+        try:
+            return httpx.AsyncClient(http2=api_config.http2, **options)
+        except ImportError:
+            # HTTP/2 needs the h2 package (httpx[http2])
+            logger.warning("API_HTTP2=true but the h2 package is not installed; using HTTP/1.1")
+            return httpx.AsyncClient(**options)
+    
+    def _create_in_process_client(self) -> httpx.AsyncClient:
+        """
+        Create a client that calls the rest_api_server app through ASGI.
+        
+        Routes run in this process and use its database pool; responses are
+        not compressed since nothing crosses a network.
+        """
+        from rest_api_server import app
+        
+        self.app = app
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            headers={**api_config.get_auth_headers(), "Accept-Encoding": "identity"},
+            timeout=httpx.Timeout(self.timeout, connect=api_config.connect_timeout),
+        )
+    
+    async def _start_app(self):
+        lifespan = self.app.router.lifespan_context(self.app)
+        await lifespan.__aenter__()
+        self._app_lifespan = lifespan
+        logger.info("Dispatching API requests in-process to rest_api_server")
+    
+    async def _ensure_app_started(self) -> Optional[Dict[str, Any]]:
+        """
+        Start the in-process app once, before its first request.
+        
+        Returns:
+            None once the app runs, or an error result if it failed to start
+            (the next request tries again)
+        """
+        if self._app_started is None:
+            self._app_started = asyncio.ensure_future(self._start_app())
+        task = self._app_started
+        try:
+            # Shielded so a cancelled caller does not cancel the shared startup
+            await asyncio.shield(task)
+        except Exception as e:
+            if self._app_started is task:
+                self._app_started = None
+            logger.error(f"In-process rest_api_server failed to start: {e!r}")
+            return {
+                "success": False,
+                "error": "Startup Error",
+                "error_detail": f"Could not start the in-process REST API app: {e}"
+            }
+        return None
     
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+    def _host_limit(self, url: str) -> Optional[asyncio.Semaphore]:
+        """Semaphore capping concurrent requests to the URL's host, if configured."""
+        if not self.max_connections_per_host:
+            return None
+        host = urlsplit(url).netloc
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = self._host_limits[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return semaphore
+    
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """
         Make an HTTP request to the API.
         
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
-            **kwargs: Additional arguments for requests
+            **kwargs: Additional arguments for httpx
         
         Returns:
             Dictionary with response data or error information
         """
+        result, _ = await self._request(method, endpoint, **kwargs)
+        return result
+    
+    async def _send(self, method: str, endpoint: str, deadline: float, **kwargs) -> httpx.Response:
+        """
+        Send one attempt, within the rate limits and the per-host limit, and
+        record its latency. Raises QueueTimeout if no slot frees up before
+        the deadline.
+        """
         url = f"{self.base_url}{endpoint}"
+        taken = await self.rate_limiter.acquire(endpoint, deadline) if self.rate_limiter is not None else []
+        try:
+            start = time.perf_counter()
+            semaphore = self._host_limit(url)
+            if semaphore is not None:
+                async with semaphore:
+                    response = await self.client.request(method, url, **kwargs)
+            else:
+                response = await self.client.request(method, url, **kwargs)
+        finally:
+            RateLimiter.release(taken)
         
+        if self.latency is not None and response.status_code < 500:
+            self.latency.record(endpoint_group(endpoint), time.perf_counter() - start)
+        return response
+    
+    async def _send_hedged(self, method: str, endpoint: str, deadline: float, **kwargs) -> httpx.Response:
+        """
+        Send a second attempt if the first is slower than the group's p95
+        latency, and use whichever answers first.
+        """
+        delay = self.latency.threshold(endpoint_group(endpoint))
+        if delay is None:
+            return await self._send(method, endpoint, deadline, **kwargs)
+        
+        first = asyncio.ensure_future(self._send(method, endpoint, deadline, **kwargs))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+        
+        self.hedged_requests += 1
+        pending = {first, asyncio.ensure_future(self._send(method, endpoint, deadline, **kwargs))}
+        error = None
         try:
-            # Add basic auth if configured
-            basic_auth = api_config.get_basic_auth()
-            if basic_auth:
-                kwargs['auth'] = basic_auth
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _send_with_retries(self, method: str, endpoint: str, deadline: float, **kwargs) -> httpx.Response:
+        """
+        Send a request; GETs are retried with jittered exponential backoff on
+        transport errors and 502/503/504. Raises the last transport error.
+        """
+        attempts = 1 + (self.retries if method == "GET" else 0)
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                if method == "GET" and self.latency is not None:
+                    response = await self._send_hedged(method, endpoint, deadline, **kwargs)
+                else:
+                    response = await self._send(method, endpoint, deadline, **kwargs)
+            except httpx.TransportError:
+                if last:
+                    raise
+            else:
+                if last or response.status_code not in RETRY_STATUS_CODES:
+                    return response
             
-            # Set timeout
-            kwargs.setdefault('timeout', self.timeout)
+            await asyncio.sleep(backoff_delay(attempt, api_config.retry_backoff_base, api_config.retry_backoff_max))
+    
+    def _record_outcome(self, group: str, ok: bool):
+        if self.breaker is None:
+            return
+        if ok:
+            self.breaker.record_success(group)
+        else:
+            self.breaker.record_failure(group)
+    
+    async def _request(
+        self, method: str, endpoint: str, **kwargs
+    ) -> Tuple[Dict[str, Any], Optional[httpx.Response]]:
+        """Like _make_request, but also returns the successful response (else None)."""
+        url = f"{self.base_url}{endpoint}"
+        group = endpoint_group(endpoint)
+        
+        if self.app is not None:
+            error = await self._ensure_app_started()
+            if error is not None:
+                return error, None
+        
+        # Whether this call is the breaker's half-open trial
+        trial = self.breaker is not None and self.breaker.state(group) == "half-open"
+        if self.breaker is not None and not self.breaker.allow(group):
+            return {
+                "success": False,
+                "error": "Circuit Open",
+                "error_detail": (
+                    f"Requests to '{group}' endpoints are failing; not calling {url} "
+                    f"for another {self.breaker.retry_after(group):.0f} seconds."
+                )
+            }, None
+        
+        try:
+            return await self._attempt(method, endpoint, group, **kwargs)
+        finally:
+            # A trial that ended without an outcome (rate limited, cancelled,
+            # unexpected error) frees its slot; after an outcome this is a no-op
+            if trial:
+                self.breaker.release(group)
+    
+    async def _attempt(
+        self, method: str, endpoint: str, group: str, **kwargs
+    ) -> Tuple[Dict[str, Any], Optional[httpx.Response]]:
+        """Send a request the breaker let through and record its outcome."""
+        url = f"{self.base_url}{endpoint}"
+        try:
+            deadline = time.monotonic() + self.queue_timeout
+            response = await self._send_with_retries(method, endpoint, deadline, **kwargs)
+            self._record_outcome(group, response.status_code < 500)
             
-            response = self.session.request(method, url, **kwargs)
+            # Answer to a conditional request: the cached body is still current
+            if response.status_code == 304:
+                return {
+                    "success": True,
+                    "status_code": response.status_code,
+                    "data": None
+                }, response
             
             # Check for HTTP errors
             response.raise_for_status()
@@ -56,63 +333,241 @@ class APIClient:
                 "success": True,
                 "status_code": response.status_code,
                 "data": data
-            }
+            }, response
         
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
+            # Already recorded: 4xx count as a working endpoint, 5xx as a failure
             error_message = str(e)
             error_detail = ""
             
             # Try to get error details from response
             try:
-                if e.response is not None:
-                    error_detail = e.response.json()
-            except:
-                if e.response is not None:
-                    error_detail = e.response.text
+                error_detail = e.response.json()
+            except ValueError:
+                error_detail = e.response.text
             
             return {
                 "success": False,
-                "status_code": e.response.status_code if e.response else None,
+                "status_code": e.response.status_code,
                 "error": error_message,
                 "error_detail": error_detail
-            }
+            }, None
         
-        except requests.exceptions.ConnectionError as e:
+        except QueueTimeout:
+            # Held back by our own limits: not a failure of the endpoint
+            return {
+                "success": False,
+                "error": "Rate Limited",
+                "error_detail": (
+                    f"Request to {url} waited more than {self.queue_timeout} seconds "
+                    f"for a rate limit slot (API_RATE_LIMIT / API_MAX_IN_FLIGHT)."
+                )
+            }, None
+        
+        except httpx.ConnectError as e:
+            self._record_outcome(group, False)
             return {
                 "success": False,
                 "error": "Connection Error",
                 "error_detail": f"Could not connect to {url}. Please check the API_BASE_URL and network connection."
-            }
+            }, None
         
-        except requests.exceptions.Timeout as e:
+        except httpx.TimeoutException as e:
+            self._record_outcome(group, False)
             return {
                 "success": False,
                 "error": "Timeout Error",
                 "error_detail": f"Request to {url} timed out after {self.timeout} seconds."
-            }
+            }, None
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
+            self._record_outcome(group, False)
             return {
                 "success": False,
                 "error": "Request Error",
                 "error_detail": str(e)
-            }
+            }, None
+        
+        except (httpx.InvalidURL, httpx.StreamError) as e:
+            # Not HTTPError subclasses; the request never reached the endpoint
+            # (e.g. an id with a control character), so nothing is recorded
+            return {
+                "success": False,
+                "error": "Request Error",
+                "error_detail": str(e)
+            }, None
     
-    def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
-        """Make a GET request."""
-        return self._make_request("GET", endpoint, params=params)
+    async def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Make a GET request, served from the response cache while fresh.
+        
+        Expired entries with an ETag or Last-Modified are revalidated with a
+        conditional request; a 304 restarts their TTL without a new body.
+        Within the stale-while-revalidate window an expired entry is served
+        at once and refreshed in the background. Concurrent calls for the
+        same uncached key share a single upstream request.
+        
+        Successful results carry a "cache" field: status (hit, stale,
+        revalidated, miss, coalesced or bypass), the entry's age when served
+        from the cache, and the endpoint's TTL.
+        """
+        ttl = self.cache.ttl_for(endpoint) if self.cache is not None else 0
+        if not ttl:
+            result = await self._make_request("GET", endpoint, params=params)
+            if result["success"]:
+                result["cache"] = {"status": "bypass"}
+            return result
+        
+        key = self.cache.make_key(endpoint, params)
+        entry = self.cache.get(key)
+        if entry is None and self.disk_cache is not None:
+            entry = await self._load_from_disk(key)
+        if entry is not None and entry.is_fresh():
+            return self._cached_result(entry, "hit")
+        
+        if entry is not None and entry.is_servable_stale(self.cache.stale_ttl):
+            if key not in self._inflight:
+                self._start_fetch(key, endpoint, params, ttl, entry)
+            return self._cached_result(entry, "stale")
+        
+        task = self._inflight.get(key)
+        if task is not None:
+            result = await asyncio.shield(task)
+            if result["success"]:
+                result = {**result, "cache": {**result["cache"], "status": "coalesced"}}
+            return result
+        
+        # Shielded so a cancelled caller does not cancel the shared request
+        return await asyncio.shield(self._start_fetch(key, endpoint, params, ttl, entry))
     
-    def post(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
+    async def _load_from_disk(self, key: Tuple) -> Optional[CacheEntry]:
+        """Promote an entry from the disk tier into memory, if it is still usable."""
+        try:
+            entry = await asyncio.to_thread(self.disk_cache.get, key)
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache read failed: {e}")
+            return None
+        
+        if entry is None:
+            return None
+        if not entry.is_servable_stale(self.cache.stale_ttl) and not entry.can_revalidate():
+            return None
+        self.cache.set(key, entry)
+        return entry
+    
+    async def _store_on_disk(self, key: Tuple, entry: CacheEntry):
+        if self.disk_cache is None:
+            return
+        try:
+            await asyncio.to_thread(self.disk_cache.set, key, entry)
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache write failed: {e}")
+    
+    def _cached_result(self, entry: CacheEntry, status: str) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "status_code": entry.status_code,
+            "data": entry.data,
+            "cache": {"status": status, "age": round(entry.age(), 3), "ttl": entry.ttl}
+        }
+    
+    def _start_fetch(
+        self, key: Tuple, endpoint: str, params: Optional[Dict], ttl: float, entry: Optional[CacheEntry]
+    ) -> asyncio.Task:
+        """Start the single upstream request for a key; callers for the same key await it."""
+        task = asyncio.ensure_future(self._fetch(key, endpoint, params, ttl, entry))
+        self._inflight[key] = task
+        
+        def done(task: asyncio.Task):
+            self._inflight.pop(key, None)
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(f"Request for {endpoint} failed: {task.exception()!r}")
+        
+        task.add_done_callback(done)
+        return task
+    
+    async def _fetch(
+        self, key: Tuple, endpoint: str, params: Optional[Dict], ttl: float, entry: Optional[CacheEntry]
+    ) -> Dict[str, Any]:
+        """Fetch (or revalidate) an entry and store the result in the cache."""
+        headers = entry.conditional_headers() if entry is not None else None
+        result, response = await self._request("GET", endpoint, params=params, headers=headers)
+        if response is None:
+            return result
+        
+        if response.status_code == 304 and entry is not None:
+            entry.ttl = ttl
+            self.cache.refresh(entry, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            await self._store_on_disk(key, entry)
+            return self._cached_result(entry, "revalidated")
+        
+        entry = CacheEntry(
+            response.status_code,
+            result["data"],
+            len(response.content),
+            ttl,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
+        self.cache.set(key, entry)
+        await self._store_on_disk(key, entry)
+        result["cache"] = {"status": "miss", "ttl": ttl}
+        return result
+    
+    async def get_many(self, endpoints: Dict[str, str], concurrency: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Make many GET requests concurrently, at most `concurrency` at a time.
+        
+        Args:
+            endpoints: Endpoint path by caller-chosen key (e.g. the id it was built from)
+            concurrency: Maximum requests in flight (default: API_BULK_CONCURRENCY)
+        
+        Returns:
+            The result of get() for each key; an unexpected exception becomes
+            that key's error result instead of failing the whole call
+        """
+        semaphore = asyncio.Semaphore(concurrency or api_config.bulk_concurrency)
+        
+        async def fetch(endpoint: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.get(endpoint)
+                except Exception as e:
+                    logger.error(f"Request for {endpoint} failed: {e!r}")
+                    return {
+                        "success": False,
+                        "error": "Request Error",
+                        "error_detail": str(e)
+                    }
+        
+        results = await asyncio.gather(*(fetch(endpoint) for endpoint in endpoints.values()))
+        return dict(zip(endpoints, results))
+    
+    async def post(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """Make a POST request."""
-        return self._make_request("POST", endpoint, json=data)
+        return await self._make_request("POST", endpoint, json=data)
     
-    def put(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
+    async def put(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """Make a PUT request."""
-        return self._make_request("PUT", endpoint, json=data)
+        return await self._make_request("PUT", endpoint, json=data)
     
-    def delete(self, endpoint: str) -> Dict[str, Any]:
+    async def delete(self, endpoint: str) -> Dict[str, Any]:
         """Make a DELETE request."""
-        return self._make_request("DELETE", endpoint)
+        return await self._make_request("DELETE", endpoint)
+    
+    async def aclose(self):
+        """Close the pooled connections, the disk cache and an in-process app."""
+        try:
+            await self.client.aclose()
+        finally:
+            try:
+                if self._app_lifespan is not None:
+                    lifespan, self._app_lifespan = self._app_lifespan, None
+                    self._app_started = None
+                    await lifespan.__aexit__(None, None, None)
+            finally:
+                if self.disk_cache is not None:
+                    self.disk_cache.close()
     
     def validate_schema(self, schema: str) -> bool:
         """Validate schema parameter."""
@@ -30,12 +30,98 @@ class APIConfig:
         self.basic_username = os.getenv("API_BASIC_USERNAME", "")
         self.basic_password = os.getenv("API_BASIC_PASSWORD", "")
         
+        # Transport: "http" calls API_BASE_URL; "asgi" dispatches in-process to
+        # the rest_api_server app (same host deployments, shares its DB pool)
+        self.transport = os.getenv("API_TRANSPORT", "http").lower()
+        
         # Request timeout in seconds
         self.timeout = int(os.getenv("API_TIMEOUT", "30"))
+        self.connect_timeout = float(os.getenv("API_CONNECT_TIMEOUT", "5"))
+        
+        # Connection pool: total and idle keep-alive connections, how long an
+        # idle connection is kept, and a per-host cap on concurrent requests
+        # (0 = only the total limit applies)
+        self.max_connections = int(os.getenv("API_MAX_CONNECTIONS", "100"))
+        self.max_keepalive_connections = int(os.getenv("API_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        self.keepalive_expiry = float(os.getenv("API_KEEPALIVE_EXPIRY", "30"))
+        self.max_connections_per_host = int(os.getenv("API_MAX_CONNECTIONS_PER_HOST", "0"))
+        
+        # Multiplex requests over HTTP/2 connections (requires httpx[http2])
+        self.http2 = os.getenv("API_HTTP2", "false").lower() == "true"
+        
+        # GET response cache: default TTL, per-endpoint TTLs by the endpoint's
+        # last path segment ("name=seconds,..."; 0 disables caching), and
+        # bounds on entry count and total body size
+        self.cache_enabled = os.getenv("API_CACHE_ENABLED", "true").lower() == "true"
+        self.cache_ttl = float(os.getenv("API_CACHE_TTL", "60"))
+        self.cache_endpoint_ttls = self._parse_mapping(os.getenv(
+            "API_CACHE_ENDPOINT_TTLS",
+            "property_types=3600,properties=600,metadata=600,runtime=5"
+        ))
+        self.cache_max_entries = int(os.getenv("API_CACHE_MAX_ENTRIES", "1000"))
+        self.cache_max_bytes = int(float(os.getenv("API_CACHE_MAX_MB", "64")) * 1024 * 1024)
+        
+        # Seconds after expiry an entry is still served while a background
+        # request refreshes it (0 = always wait for the refresh)
+        self.cache_stale_while_revalidate = float(os.getenv("API_CACHE_STALE_WHILE_REVALIDATE", "30"))
+        
+        # Optional persistent tier: a SQLite file shared across restarts and
+        # local server processes (empty = memory only)
+        self.cache_disk_path = os.getenv("API_CACHE_DISK_PATH", "")
+        self.cache_disk_max_bytes = int(float(os.getenv("API_CACHE_DISK_MAX_MB", "256")) * 1024 * 1024)
+        
+        # Retries for idempotent GETs (extra attempts, jittered exponential
+        # backoff in seconds), the per-endpoint circuit breaker (consecutive
+        # failures that open it, 0 = disabled; seconds before a trial call),
+        # and hedged GETs sent after the endpoint's p95 latency
+        self.retries = int(os.getenv("API_RETRIES", "2"))
+        self.retry_backoff_base = float(os.getenv("API_RETRY_BACKOFF_BASE", "0.2"))
+        self.retry_backoff_max = float(os.getenv("API_RETRY_BACKOFF_MAX", "5"))
+        self.breaker_failures = int(os.getenv("API_BREAKER_FAILURES", "5"))
+        self.breaker_reset_timeout = float(os.getenv("API_BREAKER_RESET_TIMEOUT", "30"))
+        self.hedge_enabled = os.getenv("API_HEDGE_ENABLED", "false").lower() == "true"
+        self.hedge_min_samples = int(os.getenv("API_HEDGE_MIN_SAMPLES", "20"))
+        
+        # Client-side rate limits: requests per second (token bucket, 0 =
+        # unlimited) and requests in flight (0 = unlimited), globally and per
+        # endpoint prefix ("/azure/=20,/btp/=10"); calls over a limit wait up
+        # to API_QUEUE_TIMEOUT seconds
+        self.rate_limit = float(os.getenv("API_RATE_LIMIT", "0"))
+        self.rate_burst = float(os.getenv("API_RATE_BURST", "0")) or None
+        self.max_in_flight = int(os.getenv("API_MAX_IN_FLIGHT", "0"))
+        self.prefix_rate_limits = self._parse_mapping(os.getenv("API_PREFIX_RATE_LIMITS", ""))
+        self.prefix_max_in_flight = self._parse_mapping(os.getenv("API_PREFIX_MAX_IN_FLIGHT", ""))
+        self.queue_timeout = float(os.getenv("API_QUEUE_TIMEOUT", "10"))
+        
+        # Bulk tools: maximum ids per call and concurrent upstream requests
+        self.bulk_max_ids = int(os.getenv("API_BULK_MAX_IDS", "100"))
+        self.bulk_concurrency = int(os.getenv("API_BULK_CONCURRENCY", "10"))
+        
+        # crawl_landscape: concurrent requests, maximum depth and graph size
+        self.crawl_workers = int(os.getenv("API_CRAWL_WORKERS", "8"))
+        self.crawl_max_depth = int(os.getenv("API_CRAWL_MAX_DEPTH", "4"))
+        self.crawl_max_nodes = int(os.getenv("API_CRAWL_MAX_NODES", "500"))
         
         # Valid schemas
         self.valid_schemas = ["dev", "prod", "test"]
     
+    @staticmethod
+    def _parse_mapping(value: str):
+        """Parse "name=number,name=number" into a dict of floats."""
+        ttls = {}
+        for item in value.split(","):
+            if "=" in item:
+                name, seconds = item.split("=", 1)
+                ttls[name.strip()] = float(seconds)
+        return ttls
+    
+    def rate_limiting_enabled(self) -> bool:
+        """Whether any client-side rate or concurrency limit is configured."""
+        return bool(
+            self.rate_limit or self.max_in_flight
+            or self.prefix_rate_limits or self.prefix_max_in_flight
+        )
+    
     def get_auth_headers(self):
         """Get authentication headers based on auth method."""
         headers = {
@@ -4,9 +4,12 @@ A Model Context Protocol server that provides tools for interacting with the int
 Covers General, Core Relationships, Azure, SAP BTP, and SAP ABAP endpoints.
 """
 
+import asyncio
+from typing import List
 from mcp.server.fastmcp import FastMCP
 from .api_client import APIClient
 from .api_config import api_config
+from .landscape import RELATIONS, crawl
 
 # Create MCP server
 mcp = FastMCP("Integration Platform API Server", json_response=True, port=8020)
@@ -20,7 +23,7 @@ client = APIClient()
 # ============================================================================
 
 @mcp.tool()
-def get_properties(schema: str) -> dict:
+async def get_properties(schema: str) -> dict:
     """
     Retrieves a list of all Properties from the database.
     
@@ -36,11 +39,11 @@ def get_properties(schema: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/properties")
+    return await client.get(f"/{schema}/properties")
 
 
 @mcp.tool()
-def get_property_types(schema: str) -> dict:
+async def get_property_types(schema: str) -> dict:
     """
     Retrieves a list of all available PropertyTypes.
     
@@ -56,11 +59,11 @@ def get_property_types(schema: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/property_types")
+    return await client.get(f"/{schema}/property_types")
 
 
 @mcp.tool()
-def get_metadata(schema: str) -> dict:
+async def get_metadata(schema: str) -> dict:
     """
     Retrieves a list of all Metadata entries from the database.
     
@@ -76,7 +79,7 @@ def get_metadata(schema: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/metadata")
+    return await client.get(f"/{schema}/metadata")
 
 
 # ============================================================================
@@ -84,7 +87,7 @@ def get_metadata(schema: str) -> dict:
 # ============================================================================
 
 @mcp.tool()
-def get_datasources_to_tenants(schema: str) -> dict:
+async def get_datasources_to_tenants(schema: str) -> dict:
     """
     Retrieves all DataSources and their associated AzureTenants relationships.
     
@@ -100,11 +103,11 @@ def get_datasources_to_tenants(schema: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/relationships/datasources_to_tenants")
+    return await client.get(f"/{schema}/relationships/datasources_to_tenants")
 
 
 @mcp.tool()
-def get_system_datasources(schema: str, system_id: str) -> dict:
+async def get_system_datasources(schema: str, system_id: str) -> dict:
     """
     Retrieves all DataSources that belong to a specific System.
     
@@ -121,11 +124,11 @@ def get_system_datasources(schema: str, system_id: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/systems/{system_id}/datasources")
+    return await client.get(f"/{schema}/systems/{system_id}/datasources")
 
 
 @mcp.tool()
-def get_dataflow_systems(schema: str, dataflow_id: str) -> dict:
+async def get_dataflow_systems(schema: str, dataflow_id: str) -> dict:
     """
     Retrieves the sender and receiver Systems for a specific DataFlow.
     
@@ -142,11 +145,11 @@ def get_dataflow_systems(schema: str, dataflow_id: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/dataflows/{dataflow_id}/systems")
+    return await client.get(f"/{schema}/dataflows/{dataflow_id}/systems")
 
 
 @mcp.tool()
-def get_dataflow_inventories(schema: str, dataflow_id: str) -> dict:
+async def get_dataflow_inventories(schema: str, dataflow_id: str) -> dict:
     """
     Retrieves all technical interfaces (Inventories) that make up a specific DataFlow.
     
@@ -163,7 +166,7 @@ def get_dataflow_inventories(schema: str, dataflow_id: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/dataflows/{dataflow_id}/inventories")
+    return await client.get(f"/{schema}/dataflows/{dataflow_id}/inventories")
 
 
 # ============================================================================
@@ -171,7 +174,7 @@ def get_dataflow_inventories(schema: str, dataflow_id: str) -> dict:
 # ============================================================================
 
 @mcp.tool()
-def get_azure_tenant_subscriptions(schema: str, tenant_id: str) -> dict:
+async def get_azure_tenant_subscriptions(schema: str, tenant_id: str) -> dict:
     """
     Retrieves all Subscriptions within a specific AzureTenant.
     
@@ -188,11 +191,11 @@ def get_azure_tenant_subscriptions(schema: str, tenant_id: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/azure/tenants/{tenant_id}/subscriptions")
+    return await client.get(f"/{schema}/azure/tenants/{tenant_id}/subscriptions")
 
 
 @mcp.tool()
-def get_azure_subscription_resource_groups(schema: str, subscription_id: str) -> dict:
+async def get_azure_subscription_resource_groups(schema: str, subscription_id: str) -> dict:
     """
     Retrieves all ResourceGroups within a specific AzureSubscription.
     
@@ -209,11 +212,11 @@ def get_azure_subscription_resource_groups(schema: str, subscription_id: str) ->
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/azure/subscriptions/{subscription_id}/resource_groups")
+    return await client.get(f"/{schema}/azure/subscriptions/{subscription_id}/resource_groups")
 
 
 @mcp.tool()
-def get_azure_api_management_service_apis(schema: str, service_id: str) -> dict:
+async def get_azure_api_management_service_apis(schema: str, service_id: str) -> dict:
     """
     Retrieves all APIs managed by a specific ApiManagementService.
     
@@ -230,11 +233,11 @@ def get_azure_api_management_service_apis(schema: str, service_id: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/azure/api_management_services/{service_id}/apis")
+    return await client.get(f"/{schema}/azure/api_management_services/{service_id}/apis")
 
 
 @mcp.tool()
-def get_azure_api_management_api_products(schema: str, api_id: str) -> dict:
+async def get_azure_api_management_api_products(schema: str, api_id: str) -> dict:
     """
     Retrieves all Products that a specific API is part of.
     
@@ -251,11 +254,11 @@ def get_azure_api_management_api_products(schema: str, api_id: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/azure/api_management_apis/{api_id}/products")
+    return await client.get(f"/{schema}/azure/api_management_apis/{api_id}/products")
 
 
 @mcp.tool()
-def get_azure_standard_app_workflows(schema: str, app_id: str) -> dict:
+async def get_azure_standard_app_workflows(schema: str, app_id: str) -> dict:
     """
     Retrieves all Workflows inside a specific StandardApp.
     
@@ -272,11 +275,11 @@ def get_azure_standard_app_workflows(schema: str, app_id: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/azure/standard_apps/{app_id}/workflows")
+    return await client.get(f"/{schema}/azure/standard_apps/{app_id}/workflows")
 
 
 @mcp.tool()
-def get_azure_logic_app_workflow_versions(schema: str, workflow_id: str) -> dict:
+async def get_azure_logic_app_workflow_versions(schema: str, workflow_id: str) -> dict:
     """
     Retrieves all historical Versions of a specific LogicAppWorkflow.
     
@@ -285,7 +288,7 @@ def get_azure_logic_app_workflow_versions(schema: str, workflow_id: str) -> dict
         workflow_id: Unique identifier for the Logic App workflow
     
     Returns:
-        Dictionary with list of workflow versions
+        Dictionary with list of workflow versions (id, version_number, created_at)
     """
     if not client.validate_schema(schema):
         return {
@@ -293,7 +296,7 @@ def get_azure_logic_app_workflow_versions(schema: str, workflow_id: str) -> dict
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/azure/logic_app_workflows/{workflow_id}/versions")
+    return await client.get(f"/{schema}/azure/logic_app_workflows/{workflow_id}/versions")
 
 
 # ============================================================================
@@ -301,7 +304,7 @@ def get_azure_logic_app_workflow_versions(schema: str, workflow_id: str) -> dict
 # ============================================================================
 
 @mcp.tool()
-def get_btp_cloud_integration_package_artefacts(schema: str, package_id: str) -> dict:
+async def get_btp_cloud_integration_package_artefacts(schema: str, package_id: str) -> dict:
     """
     Retrieves all integration Artefacts (like iFlows) within a Package.
     
@@ -318,11 +321,11 @@ def get_btp_cloud_integration_package_artefacts(schema: str, package_id: str) ->
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/btp/cloud_integration_packages/{package_id}/artefacts")
+    return await client.get(f"/{schema}/btp/cloud_integration_packages/{package_id}/artefacts")
 
 
 @mcp.tool()
-def get_btp_cloud_integration_artefact_runtime(schema: str, artefact_id: str) -> dict:
+async def get_btp_cloud_integration_artefact_runtime(schema: str, artefact_id: str) -> dict:
     """
     Shows the runtime status and details for a specific deployed Artefact.
     
@@ -339,11 +342,11 @@ def get_btp_cloud_integration_artefact_runtime(schema: str, artefact_id: str) ->
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/btp/cloud_integration_artefacts/{artefact_id}/runtime")
+    return await client.get(f"/{schema}/btp/cloud_integration_artefacts/{artefact_id}/runtime")
 
 
 @mcp.tool()
-def get_btp_api_management_provider_proxies(schema: str, provider_id: str) -> dict:
+async def get_btp_api_management_provider_proxies(schema: str, provider_id: str) -> dict:
     """
     Retrieves all API Proxies associated with a specific API Provider.
     
@@ -360,11 +363,11 @@ def get_btp_api_management_provider_proxies(schema: str, provider_id: str) -> di
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/btp/api_management_providers/{provider_id}/proxies")
+    return await client.get(f"/{schema}/btp/api_management_providers/{provider_id}/proxies")
 
 
 @mcp.tool()
-def get_btp_api_management_proxy_products(schema: str, proxy_id: str) -> dict:
+async def get_btp_api_management_proxy_products(schema: str, proxy_id: str) -> dict:
     """
     Lists which Products a specific API Proxy is included in.
     
@@ -381,7 +384,7 @@ def get_btp_api_management_proxy_products(schema: str, proxy_id: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/btp/api_management_proxies/{proxy_id}/products")
+    return await client.get(f"/{schema}/btp/api_management_proxies/{proxy_id}/products")
 
 
 # ============================================================================
@@ -389,7 +392,7 @@ def get_btp_api_management_proxy_products(schema: str, proxy_id: str) -> dict:
 # ============================================================================
 
 @mcp.tool()
-def get_abap_datasource_partner_profiles(schema: str, datasource_id: str) -> dict:
+async def get_abap_datasource_partner_profiles(schema: str, datasource_id: str) -> dict:
     """
     Retrieves all PartnerProfiles (e.g., iDoc partners) for a specific DataSource.
     
@@ -406,11 +409,11 @@ def get_abap_datasource_partner_profiles(schema: str, datasource_id: str) -> dic
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/abap/datasources/{datasource_id}/partner_profiles")
+    return await client.get(f"/{schema}/abap/datasources/{datasource_id}/partner_profiles")
 
 
 @mcp.tool()
-def get_abap_port_rfc_destinations(schema: str, port_id: str) -> dict:
+async def get_abap_port_rfc_destinations(schema: str, port_id: str) -> dict:
     """
     Shows the RfcDestinations (RFC destinations) associated with a specific AbapPort.
     
@@ -427,11 +430,11 @@ def get_abap_port_rfc_destinations(schema: str, port_id: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/abap/ports/{port_id}/rfc_destinations")
+    return await client.get(f"/{schema}/abap/ports/{port_id}/rfc_destinations")
 
 
 @mcp.tool()
-def get_abap_soap_service_bindings(schema: str, service_id: str) -> dict:
+async def get_abap_soap_service_bindings(schema: str, service_id: str) -> dict:
     """
     Retrieves all Bindings (endpoints) for a specific AbapSoapService.
     
@@ -448,7 +451,198 @@ def get_abap_soap_service_bindings(schema: str, service_id: str) -> dict:
             "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
         }
     
-    return client.get(f"/{schema}/abap/soap_services/{service_id}/bindings")
+    return await client.get(f"/{schema}/abap/soap_services/{service_id}/bindings")
+
+
+# ============================================================================
+# BULK ENDPOINTS
+# ============================================================================
+
+async def fetch_bulk(schema: str, ids: List[str], endpoint: str) -> dict:
+    """
+    Fetch one relationship endpoint for many ids concurrently.
+    
+    Args:
+        schema: Database schema (dev, prod, or test)
+        ids: Ids to look up (duplicates are fetched once)
+        endpoint: Endpoint template with {schema} and {id} placeholders
+    
+    Returns:
+        Dictionary with the data per id under "results", the error per id
+        under "errors", and counts of requested, succeeded and failed ids
+    """
+    if not client.validate_schema(schema):
+        return {
+            "success": False,
+            "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
+        }
+    
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > api_config.bulk_max_ids:
+        return {
+            "success": False,
+            "error": f"Too many ids ({len(ids)}). At most {api_config.bulk_max_ids} per call"
+        }
+    
+    responses = await client.get_many({id: endpoint.format(schema=schema, id=id) for id in ids})
+    results = {}
+    errors = {}
+    for id, response in responses.items():
+        if response["success"]:
+            results[id] = response["data"]
+        else:
+            errors[id] = {k: v for k, v in response.items() if k != "success"}
+    
+    return {
+        "success": not errors,
+        "results": results,
+        "errors": errors,
+        "requested": len(ids),
+        "succeeded": len(results),
+        "failed": len(errors)
+    }
+
+
+@mcp.tool()
+async def get_system_datasources_bulk(schema: str, system_ids: List[str]) -> dict:
+    """
+    Retrieves the DataSources of many Systems in one call.
+    
+    Args:
+        schema: Database schema (dev, prod, or test)
+        system_ids: Unique identifiers of the systems
+    
+    Returns:
+        Dictionary with datasources per system id and errors per system id
+    """
+    return await fetch_bulk(schema, system_ids, "/{schema}/systems/{id}/datasources")
+
+
+@mcp.tool()
+async def get_dataflow_systems_bulk(schema: str, dataflow_ids: List[str]) -> dict:
+    """
+    Retrieves the sender and receiver Systems of many DataFlows in one call.
+    
+    Args:
+        schema: Database schema (dev, prod, or test)
+        dataflow_ids: Unique identifiers of the dataflows
+    
+    Returns:
+        Dictionary with systems per dataflow id and errors per dataflow id
+    """
+    return await fetch_bulk(schema, dataflow_ids, "/{schema}/dataflows/{id}/systems")
+
+
+@mcp.tool()
+async def get_dataflow_inventories_bulk(schema: str, dataflow_ids: List[str]) -> dict:
+    """
+    Retrieves the Inventories (technical interfaces) of many DataFlows in one call.
+    
+    Args:
+        schema: Database schema (dev, prod, or test)
+        dataflow_ids: Unique identifiers of the dataflows
+    
+    Returns:
+        Dictionary with inventories per dataflow id and errors per dataflow id
+    """
+    return await fetch_bulk(schema, dataflow_ids, "/{schema}/dataflows/{id}/inventories")
+
+
+@mcp.tool()
+async def get_azure_tenant_subscriptions_bulk(schema: str, tenant_ids: List[str]) -> dict:
+    """
+    Retrieves the Subscriptions of many AzureTenants in one call.
+    
+    Args:
+        schema: Database schema (dev, prod, or test)
+        tenant_ids: Unique identifiers of the Azure tenants
+    
+    Returns:
+        Dictionary with subscriptions per tenant id and errors per tenant id
+    """
+    return await fetch_bulk(schema, tenant_ids, "/{schema}/azure/tenants/{id}/subscriptions")
+
+
+@mcp.tool()
+async def get_azure_subscription_resource_groups_bulk(schema: str, subscription_ids: List[str]) -> dict:
+    """
+    Retrieves the ResourceGroups of many AzureSubscriptions in one call.
+    
+    Args:
+        schema: Database schema (dev, prod, or test)
+        subscription_ids: Unique identifiers of the Azure subscriptions
+    
+    Returns:
+        Dictionary with resource groups per subscription id and errors per subscription id
+    """
+    return await fetch_bulk(schema, subscription_ids, "/{schema}/azure/subscriptions/{id}/resource_groups")
+
+
+@mcp.tool()
+async def get_btp_cloud_integration_artefact_runtime_bulk(schema: str, artefact_ids: List[str]) -> dict:
+    """
+    Retrieves the runtime status of many deployed Artefacts in one call.
+    
+    Args:
+        schema: Database schema (dev, prod, or test)
+        artefact_ids: Unique identifiers of the artefacts
+    
+    Returns:
+        Dictionary with runtime status per artefact id and errors per artefact id
+    """
+    return await fetch_bulk(schema, artefact_ids, "/{schema}/btp/cloud_integration_artefacts/{id}/runtime")
+
+
+# ============================================================================
+# LANDSCAPE CRAWL
+# ============================================================================
+
+@mcp.tool()
+async def crawl_landscape(schema: str, root_type: str, root_id: str, depth: int = 2) -> dict:
+    """
+    Walks the relationships below an entity and returns them as one graph.
+    
+    Hierarchies followed:
+    - azure_tenant -> subscriptions -> resource groups
+    - azure_api_management_service -> APIs -> products
+    - btp_api_management_provider -> proxies -> products
+    - btp_cloud_integration_package -> artefacts -> runtime
+    Any entity type in these chains can be the root (e.g. azure_subscription).
+    
+    Args:
+        schema: Database schema (dev, prod, or test)
+        root_type: Entity type of the root (e.g. azure_tenant)
+        root_id: Unique identifier of the root entity
+        depth: Number of relationship levels to follow (default 2)
+    
+    Returns:
+        Dictionary with the graph: nodes keyed by "<type>:<id>", edges
+        (from, to, relation), errors per node and a truncated flag
+    """
+    if not client.validate_schema(schema):
+        return {
+            "success": False,
+            "error": f"Invalid schema '{schema}'. Must be one of: dev, prod, test"
+        }
+    
+    if root_type not in RELATIONS:
+        return {
+            "success": False,
+            "error": f"Invalid root_type '{root_type}'. Must be one of: {', '.join(RELATIONS)}"
+        }
+    
+    if not 1 <= depth <= api_config.crawl_max_depth:
+        return {
+            "success": False,
+            "error": f"depth must be between 1 and {api_config.crawl_max_depth}"
+        }
+    
+    graph = await crawl(
+        client, schema, root_type, root_id, depth,
+        workers=api_config.crawl_workers,
+        max_nodes=api_config.crawl_max_nodes
+    )
+    return {"success": not graph["errors"], **graph}
 
 
 # ============================================================================
@@ -461,25 +655,61 @@ def get_api_config() -> str:
     import json
     config_info = {
         "base_url": api_config.base_url,
+        "transport": api_config.transport,
         "auth_method": api_config.auth_method,
         "timeout": api_config.timeout,
+        "max_connections": api_config.max_connections,
+        "max_connections_per_host": api_config.max_connections_per_host,
+        "http2": api_config.http2,
+        "retries": api_config.retries,
+        "hedging": api_config.hedge_enabled,
+        "hedged_requests": client.hedged_requests,
+        "open_circuits": client.breaker.stats() if client.breaker is not None else {},
         "valid_schemas": api_config.valid_schemas,
         "authenticated": bool(api_config.bearer_token or api_config.api_key or api_config.basic_username)
     }
     return json.dumps(config_info, indent=2)
 
 
+@mcp.resource("api://cache")
+def get_cache_stats() -> str:
+    """Get response cache statistics."""
+    import json
+    if client.cache is None:
+        return json.dumps({"enabled": False}, indent=2)
+    stats = {"enabled": True, **client.cache.stats()}
+    if client.disk_cache is not None:
+        stats["disk"] = client.disk_cache.stats()
+    return json.dumps(stats, indent=2)
+
+
+async def serve():
+    """
+    Run the MCP server over streamable HTTP, then close the API client on
+    the same event loop (pooled connections, disk cache, in-process app).
+    """
+    try:
+        await mcp.run_streamable_http_async()
+    finally:
+        await client.aclose()
+
+
 # Run with streamable HTTP transport
 if __name__ == "__main__":
     print("Starting Integration Platform API MCP Server...")
-    print(f"API Base URL: {api_config.base_url}")
+    if api_config.transport == "asgi":
+        print("API: rest_api_server in-process (API_TRANSPORT=asgi)")
+    else:
+        print(f"API Base URL: {api_config.base_url}")
     print(f"Authentication: {api_config.auth_method}")
     print(f"Valid Schemas: {', '.join(api_config.valid_schemas)}")
     print("Server will run on http://localhost:8020")
-    print("\nAvailable Tools: 20")
+    print("\nAvailable Tools: 27")
     print("  - General: 3 tools")
     print("  - Core Relationships: 4 tools")
     print("  - Azure: 6 tools")
     print("  - SAP BTP: 4 tools")
     print("  - SAP ABAP: 3 tools")
-    mcp.run(transport="streamable-http")
+    print("  - Bulk: 6 tools")
+    print("  - Landscape crawl: 1 tool")
+    asyncio.run(serve())
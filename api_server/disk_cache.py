@@ -0,0 +1,209 @@
+"""
+Persistent response cache tier for APIClient.
+A SQLite file under the in-memory cache, so warm entries survive restarts and
+are shared by several local MCP server processes. Bodies are stored as
+zlib-compressed compact JSON; the least recently used entries are evicted
+when the file's total body size exceeds its cap.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional, Tuple
+
+from .response_cache import CacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Bump when the schema changes; files with another version are recreated
+SCHEMA_VERSION = 2
+
+# Triggers keep the total stored body size in one row, so eviction reads a
+# running total instead of summing the table on every write
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        status_code INTEGER NOT NULL,
+        body BLOB NOT NULL,
+        body_size INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        ttl REAL NOT NULL,
+        stored_at REAL NOT NULL,
+        accessed_at REAL NOT NULL,
+        etag TEXT,
+        last_modified TEXT
+    );
+    CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+    CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (stored_at + ttl);
+    
+    CREATE TABLE IF NOT EXISTS totals (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        bytes INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO totals (id, bytes) VALUES (0, 0);
+    
+    CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+        UPDATE totals SET bytes = bytes + NEW.body_size WHERE id = 0;
+    END;
+    CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF body_size ON entries BEGIN
+        UPDATE totals SET bytes = bytes + NEW.body_size - OLD.body_size WHERE id = 0;
+    END;
+    CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+        UPDATE totals SET bytes = bytes - OLD.body_size WHERE id = 0;
+    END;
+"""
+
+# Reads refresh an entry's LRU position at most this often (seconds), so
+# cache hits rarely write to the file
+ACCESS_UPDATE_INTERVAL = 60
+
+# Eviction frees space down to this fraction of the cap, so it runs in
+# batches rather than on every write once the file is full
+EVICT_TO = 0.9
+
+
+class DiskCache:
+    """
+    SQLite-backed cache of CacheEntry objects.
+    
+    Methods block on file I/O; the client calls them through asyncio.to_thread.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, namespace: str = "", stale_ttl: float = 0):
+        """
+        Args:
+            path: SQLite database file
+            max_bytes: Cap on the total compressed body size
+            namespace: Prefix for keys (the API base URL), so processes
+                talking to different upstreams can share one file
+            stale_ttl: Seconds after expiry an entry stays useful without a
+                validator; older ones are purged
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        
+        # WAL lets several processes read while one writes
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+    
+    def _create_schema(self):
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+            return
+        # A cache: entries in an older layout are simply dropped
+        self._conn.executescript(f"""
+            BEGIN IMMEDIATE;
+            DROP TABLE IF EXISTS entries;
+            DROP TABLE IF EXISTS totals;
+            {SCHEMA}
+            PRAGMA user_version = {SCHEMA_VERSION};
+            COMMIT;
+        """)
+    
+    def _key(self, key: Tuple) -> str:
+        return self.namespace + " " + json.dumps(key, separators=(",", ":"), default=str)
+    
+    def get(self, key: Tuple) -> Optional[CacheEntry]:
+        """Load an entry, or None if it is missing or unreadable."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, body, size, ttl, stored_at, accessed_at, etag, last_modified "
+                "FROM entries WHERE key = ?",
+                (self._key(key),)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[5] >= ACCESS_UPDATE_INTERVAL:
+                self._conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                    (now, self._key(key))
+                )
+        
+        status_code, body, size, ttl, stored_at, _, etag, last_modified = row
+        try:
+            data = json.loads(zlib.decompress(body))
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Dropping unreadable disk cache entry: {e}")
+            self.delete(key)
+            return None
+        
+        entry = CacheEntry(status_code, data, size, ttl, etag=etag, last_modified=last_modified)
+        entry.stored_at = stored_at
+        return entry
+    
+    def set(self, key: Tuple, entry: CacheEntry):
+        """Store an entry, then evict old entries beyond the size cap."""
+        body = zlib.compress(json.dumps(entry.data, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # An upsert, not INSERT OR REPLACE: REPLACE would skip the delete trigger
+                self._conn.execute(
+                    "INSERT INTO entries "
+                    "(key, status_code, body, body_size, size, ttl, stored_at, accessed_at, etag, last_modified) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET "
+                    "status_code = excluded.status_code, body = excluded.body, "
+                    "body_size = excluded.body_size, size = excluded.size, ttl = excluded.ttl, "
+                    "stored_at = excluded.stored_at, accessed_at = excluded.accessed_at, "
+                    "etag = excluded.etag, last_modified = excluded.last_modified",
+                    (self._key(key), entry.status_code, body, len(body), entry.size, entry.ttl,
+                     entry.stored_at, now, entry.etag, entry.last_modified)
+                )
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def delete(self, key: Tuple):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (self._key(key),))
+    
+    def clear(self):
+        """Delete every entry of this namespace."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key LIKE ?", (self.namespace + " %",))
+    
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT count(*) FROM entries").fetchone()[0]
+            total = self._total_bytes()
+        return {"path": self.path, "entries": entries, "bytes": total, "max_bytes": self.max_bytes}
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+    
+    def _evict(self, now: float):
+        """Purge useless expired entries, then LRU entries over the cap. Caller holds the lock."""
+        self._conn.execute(
+            "DELETE FROM entries WHERE stored_at + ttl < ? "
+            "AND etag IS NULL AND last_modified IS NULL",
+            (now - self.stale_ttl,)
+        )
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * EVICT_TO)
+        
+        # Walk the least recently used entries (by index) until enough is freed
+        keys = []
+        for key, body_size in self._conn.execute("SELECT key, body_size FROM entries ORDER BY accessed_at"):
+            keys.append((key,))
+            excess -= body_size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", keys)
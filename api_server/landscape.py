@@ -0,0 +1,161 @@
+"""
+Landscape crawler for the API MCP server.
+Walks the relationship endpoints breadth-first from a root entity with a pool
+of async workers and assembles the entities and relations into one graph.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from .api_client import APIClient
+
+
+class Relation:
+    """An endpoint leading from an entity to its related entities."""
+    
+    def __init__(self, name: str, endpoint: str, child_type: str):
+        """
+        Args:
+            name: Relation name used on graph edges
+            endpoint: Endpoint template with {schema} and {id} placeholders
+            child_type: Entity type of the returned rows
+        """
+        self.name = name
+        self.endpoint = endpoint
+        self.child_type = child_type
+
+
+# Relations followed from each entity type; types without an entry are leaves
+RELATIONS: Dict[str, List[Relation]] = {
+    "azure_tenant": [
+        Relation("subscriptions", "/{schema}/azure/tenants/{id}/subscriptions", "azure_subscription"),
+    ],
+    "azure_subscription": [
+        Relation("resource_groups", "/{schema}/azure/subscriptions/{id}/resource_groups", "azure_resource_group"),
+    ],
+    "azure_api_management_service": [
+        Relation("apis", "/{schema}/azure/api_management_services/{id}/apis", "azure_api_management_api"),
+    ],
+    "azure_api_management_api": [
+        Relation("products", "/{schema}/azure/api_management_apis/{id}/products", "azure_api_management_product"),
+    ],
+    "btp_api_management_provider": [
+        Relation("proxies", "/{schema}/btp/api_management_providers/{id}/proxies", "btp_api_management_proxy"),
+    ],
+    "btp_api_management_proxy": [
+        Relation("products", "/{schema}/btp/api_management_proxies/{id}/products", "btp_api_management_product"),
+    ],
+    "btp_cloud_integration_package": [
+        Relation("artefacts", "/{schema}/btp/cloud_integration_packages/{id}/artefacts", "btp_cloud_integration_artefact"),
+    ],
+    "btp_cloud_integration_artefact": [
+        Relation("runtime", "/{schema}/btp/cloud_integration_artefacts/{id}/runtime", "btp_cloud_integration_artefact_runtime"),
+    ],
+}
+
+
+def node_key(entity_type: str, entity_id: Any) -> str:
+    return f"{entity_type}:{entity_id}"
+
+
+async def crawl(
+    client: APIClient,
+    schema: str,
+    root_type: str,
+    root_id: str,
+    depth: int,
+    workers: int = 8,
+    max_nodes: int = 500
+) -> Dict[str, Any]:
+    """
+    Crawl the landscape breadth-first from one entity.
+    
+    Args:
+        client: API client (requests go through its cache)
+        schema: Database schema
+        root_type: Entity type of the root, a key of RELATIONS
+        root_id: Id of the root entity
+        depth: Number of relation hops to follow
+        workers: Concurrent requests
+        max_nodes: Stop expanding once the graph has this many nodes
+    
+    Returns:
+        Dictionary with nodes (by "<type>:<id>"), edges, errors per
+        expanded node, and whether the crawl stopped at max_nodes
+    """
+    root = node_key(root_type, root_id)
+    nodes: Dict[str, Dict[str, Any]] = {
+        root: {"type": root_type, "id": root_id, "depth": 0, "data": None}
+    }
+    edges: List[Dict[str, str]] = []
+    errors: Dict[str, Any] = {}
+    truncated = False
+    
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    if depth > 0:
+        queue.put_nowait(root)
+    
+    async def expand(key: str):
+        nonlocal truncated
+        node = nodes[key]
+        for relation in RELATIONS.get(node["type"], []):
+            endpoint = relation.endpoint.format(schema=schema, id=node["id"])
+            response = await client.get(endpoint)
+            if not response["success"]:
+                # Single-object relations (runtime) answer 404 when there is nothing to link
+                if response.get("status_code") != 404:
+                    errors[key] = {k: v for k, v in response.items() if k != "success"}
+                continue
+            
+            rows = response["data"]
+            if isinstance(rows, dict):
+                rows = [rows]
+            for row in rows or []:
+                # Only entities can be linked (not e.g. a non-JSON {"text": ...} body)
+                if not isinstance(row, dict) or row.get("id") is None:
+                    continue
+                child = node_key(relation.child_type, row["id"])
+                
+                # Visited set: each entity is fetched and expanded once
+                if child in nodes:
+                    edges.append({"from": key, "to": child, "relation": relation.name})
+                    continue
+                if len(nodes) >= max_nodes:
+                    truncated = True
+                    continue
+                edges.append({"from": key, "to": child, "relation": relation.name})
+                nodes[child] = {
+                    "type": relation.child_type,
+                    "id": row["id"],
+                    "depth": node["depth"] + 1,
+                    "data": row
+                }
+                if node["depth"] + 1 < depth and relation.child_type in RELATIONS:
+                    queue.put_nowait(child)
+    
+    async def worker():
+        while True:
+            key = await queue.get()
+            try:
+                await expand(key)
+            except Exception as e:
+                # Keep the worker alive, or queue.join() would never return
+                errors[key] = {"error": type(e).__name__, "error_detail": str(e)}
+            finally:
+                queue.task_done()
+    
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        await queue.join()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    return {
+        "root": root,
+        "nodes": nodes,
+        "edges": edges,
+        "errors": errors,
+        "truncated": truncated
+    }
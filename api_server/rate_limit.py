@@ -0,0 +1,136 @@
+"""
+Client-side rate limiting for APIClient.
+A token bucket caps the request rate and a semaphore caps requests in flight,
+globally and per endpoint prefix (e.g. /azure/ vs /btp/). Calls over a limit
+wait in line until their deadline instead of failing or hitting the backend.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+
+class QueueTimeout(Exception):
+    """A call could not get a rate limit slot before its deadline."""
+
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts of up to `burst`."""
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self, deadline: float):
+        """
+        Take one token, waiting for the bucket to refill.
+        
+        Raises:
+            QueueTimeout: If no token will be available before the deadline
+        """
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            
+            wait = (1 - self._tokens) / self.rate
+            if time.monotonic() + wait > deadline:
+                raise QueueTimeout()
+            await asyncio.sleep(wait)
+
+
+class Limit:
+    """Rate and in-flight limits for one scope (global or a prefix)."""
+    
+    def __init__(self, rate: float = 0, burst: Optional[float] = None, max_in_flight: int = 0):
+        """
+        Args:
+            rate: Requests per second (0 = unlimited)
+            burst: Bucket size (default: one second's worth of requests)
+            max_in_flight: Concurrent requests (0 = unlimited)
+        """
+        self.bucket = TokenBucket(rate, burst or max(1.0, rate)) if rate else None
+        self.semaphore = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self.max_in_flight = max_in_flight
+
+
+class RateLimiter:
+    """Global limit plus per-prefix limits, applied together."""
+    
+    def __init__(
+        self,
+        rate: float = 0,
+        burst: Optional[float] = None,
+        max_in_flight: int = 0,
+        prefix_rates: Optional[Dict[str, float]] = None,
+        prefix_max_in_flight: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            rate: Global requests per second (0 = unlimited)
+            burst: Global bucket size
+            max_in_flight: Global concurrent requests (0 = unlimited)
+            prefix_rates: Requests per second by endpoint prefix
+            prefix_max_in_flight: Concurrent requests by endpoint prefix
+        """
+        prefix_rates = prefix_rates or {}
+        prefix_max_in_flight = prefix_max_in_flight or {}
+        self.global_limit = Limit(rate, burst, max_in_flight)
+        self.prefix_limits: Dict[str, Limit] = {
+            prefix: Limit(prefix_rates.get(prefix, 0), None, int(prefix_max_in_flight.get(prefix, 0)))
+            for prefix in set(prefix_rates) | set(prefix_max_in_flight)
+        }
+    
+    def limits_for(self, endpoint: str) -> List[Limit]:
+        """
+        Limits that apply to an endpoint. Prefixes match the path with or
+        without its leading schema segment ("/azure/" matches "/dev/azure/...").
+        """
+        without_schema = "/" + endpoint.lstrip("/").partition("/")[2]
+        limits = [self.global_limit]
+        for prefix, limit in self.prefix_limits.items():
+            if endpoint.startswith(prefix) or without_schema.startswith(prefix):
+                limits.append(limit)
+        return limits
+    
+    async def acquire(self, endpoint: str, deadline: float) -> List[asyncio.Semaphore]:
+        """
+        Wait for an in-flight slot and a token in every applicable limit.
+        
+        Returns:
+            The semaphores taken; pass them to release() when the call is done
+        
+        Raises:
+            QueueTimeout: If the deadline passes first
+        """
+        taken: List[asyncio.Semaphore] = []
+        try:
+            for limit in self.limits_for(endpoint):
+                if limit.semaphore is not None:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        raise QueueTimeout()
+                    try:
+                        await asyncio.wait_for(limit.semaphore.acquire(), timeout)
+                    except asyncio.TimeoutError:
+                        raise QueueTimeout()
+                    taken.append(limit.semaphore)
+                if limit.bucket is not None:
+                    await limit.bucket.acquire(deadline)
+        except BaseException:
+            self.release(taken)
+            raise
+        return taken
+    
+    @staticmethod
+    def release(taken: List[asyncio.Semaphore]):
+        for semaphore in taken:
+            semaphore.release()
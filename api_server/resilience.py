@@ -0,0 +1,138 @@
+"""
+Resilience helpers for APIClient.
+Jittered exponential backoff for retries, a per-endpoint circuit breaker that
+fails fast while an endpoint keeps failing, and latency tracking used to
+decide when to send a hedged request.
+"""
+
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# Upstream answers worth retrying: the request may succeed on another attempt
+RETRY_STATUS_CODES = {502, 503, 504}
+
+# First path segments after the schema that name a product, not a resource
+PRODUCTS = {"abap", "azure", "btp"}
+
+
+def endpoint_group(endpoint: str) -> str:
+    """
+    Group endpoints by route template: schema, product and resource names,
+    with ids replaced by {id}.
+    
+    Below the schema and product, paths alternate resource and id
+    ("tenants/{id}/subscriptions"), so every second segment but the last is
+    an id. "/dev/azure/tenants/t1/subscriptions" and ".../t2/subscriptions"
+    share a group; "/prod/..." or another product's "products" do not.
+    """
+    segments = endpoint.strip("/").split("/")
+    prefix = 2 if len(segments) > 1 and segments[1] in PRODUCTS else 1
+    resource = segments[prefix:]
+    for i in range(1, len(resource) - 1, 2):
+        resource[i] = "{id}"
+    return "/".join(segments[:prefix] + resource)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Delay before retry number `attempt` (0-based), with full jitter.
+    
+    A random delay between 0 and min(cap, base * 2^attempt) spreads retries of
+    many clients over time rather than synchronizing them.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint-group breaker: opens after consecutive failures, rejects
+    calls while open, then lets one trial call through (half-open). A trial
+    that reports no outcome within reset_timeout is given up, and another
+    call may try.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        # Start time of the half-open trial call in flight, by group
+        self._trial: Dict[str, float] = {}
+    
+    def allow(self, group: str) -> bool:
+        """Whether a call may go out now."""
+        opened_at = self._opened_at.get(group)
+        if opened_at is None:
+            return True
+        if time.monotonic() - opened_at < self.reset_timeout:
+            return False
+        
+        # Half-open: one trial call at a time
+        now = time.monotonic()
+        started = self._trial.get(group)
+        if started is not None and now - started < self.reset_timeout:
+            return False
+        self._trial[group] = now
+        return True
+    
+    def release(self, group: str):
+        """End a trial call that finished without an outcome, so another may go out."""
+        self._trial.pop(group, None)
+    
+    def retry_after(self, group: str) -> float:
+        """Seconds until the open circuit allows a trial call."""
+        opened_at = self._opened_at.get(group)
+        if opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - opened_at))
+    
+    def record_success(self, group: str):
+        self._failures.pop(group, None)
+        self._opened_at.pop(group, None)
+        self._trial.pop(group, None)
+    
+    def record_failure(self, group: str):
+        failures = self._failures.get(group, 0) + 1
+        self._failures[group] = failures
+        if self._trial.pop(group, None) is not None or failures >= self.failure_threshold:
+            self._opened_at[group] = time.monotonic()
+    
+    def state(self, group: str) -> str:
+        if group not in self._opened_at:
+            return "closed"
+        return "open" if self.retry_after(group) > 0 else "half-open"
+    
+    def stats(self) -> Dict[str, str]:
+        """State of every circuit that is not closed."""
+        return {group: self.state(group) for group in self._opened_at}
+
+
+class LatencyTracker:
+    """Recent request latencies per endpoint group, for the hedging delay."""
+    
+    def __init__(self, window: int = 200, min_samples: int = 20, quantile: float = 0.95):
+        self.window = window
+        self.min_samples = min_samples
+        self.quantile = quantile
+        self._samples: Dict[str, Deque[float]] = {}
+    
+    def record(self, group: str, seconds: float):
+        samples = self._samples.get(group)
+        if samples is None:
+            samples = self._samples[group] = deque(maxlen=self.window)
+        samples.append(seconds)
+    
+    def threshold(self, group: str) -> Optional[float]:
+        """Latency quantile (p95 by default), or None until enough samples."""
+        samples = self._samples.get(group)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
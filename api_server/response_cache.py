@@ -0,0 +1,178 @@
+"""
+Response cache for APIClient GET requests.
+Successful responses are kept in memory, keyed by endpoint and query params,
+with a TTL per endpoint and an LRU bound on both entry count and body size.
+Expired entries that carry a validator (ETag or Last-Modified) are kept so
+the client can revalidate them with a conditional request, and every expired
+entry is kept for a stale-while-revalidate window.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class CacheEntry:
+    """A cached GET result and its freshness metadata."""
+    
+    def __init__(
+        self,
+        status_code: int,
+        data: Any,
+        size: int,
+        ttl: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        self.status_code = status_code
+        self.data = data
+        self.size = size
+        self.ttl = ttl
+        self.stored_at = time.time()
+        
+        # Validators for conditional requests (If-None-Match / If-Modified-Since)
+        self.etag = etag
+        self.last_modified = last_modified
+    
+    def age(self) -> float:
+        return time.time() - self.stored_at
+    
+    def is_fresh(self) -> bool:
+        return self.age() < self.ttl
+    
+    def is_servable_stale(self, stale_ttl: float) -> bool:
+        """Whether an expired entry may still be served while it is refreshed."""
+        return self.age() < self.ttl + stale_ttl
+    
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that ask the server for the body only if it changed."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    LRU cache with per-endpoint TTLs and a memory bound.
+    
+    Used from the MCP server's event loop only, so it takes no locks.
+    """
+    
+    def __init__(
+        self,
+        default_ttl: float = 60,
+        endpoint_ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        stale_ttl: float = 0
+    ):
+        """
+        Args:
+            default_ttl: Seconds an entry stays fresh
+            endpoint_ttls: TTL overrides by the endpoint's last path segment
+                (e.g. {"property_types": 3600, "runtime": 5}); 0 disables caching
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total size of the cached response bodies
+            stale_ttl: Seconds after expiry an entry may still be served
+                while it is refreshed in the background
+        """
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = endpoint_ttls or {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> Tuple:
+        """Build a cache key from the endpoint path and query params."""
+        return (endpoint, tuple(sorted((params or {}).items())))
+    
+    def ttl_for(self, endpoint: str) -> float:
+        """TTL for an endpoint, looked up by its last path segment."""
+        resource = endpoint.rstrip("/").rsplit("/", 1)[-1]
+        return self.endpoint_ttls.get(resource, self.default_ttl)
+    
+    def get(self, key: Tuple) -> Optional[CacheEntry]:
+        """
+        Return an entry and mark it as recently used, or None.
+        
+        The entry is either fresh, within the stale window, or expired but
+        revalidatable (check is_fresh()); other expired entries are dropped.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        if not entry.is_fresh():
+            self.misses += 1
+            if not entry.can_revalidate() and not entry.is_servable_stale(self.stale_ttl):
+                self._remove(key)
+                return None
+        else:
+            self.hits += 1
+        
+        self._entries.move_to_end(key)
+        return entry
+    
+    def refresh(self, entry: CacheEntry, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Restart an entry's TTL after the server confirmed it (304 Not Modified)."""
+        entry.stored_at = time.time()
+        entry.etag = etag or entry.etag
+        entry.last_modified = last_modified or entry.last_modified
+        self.revalidations += 1
+    
+    def set(self, key: Tuple, entry: CacheEntry):
+        """Store an entry, evicting least recently used ones to fit the bounds."""
+        if entry.size > self.max_bytes:
+            return
+        
+        if key in self._entries:
+            self._remove(key)
+        
+        self._entries[key] = entry
+        self._bytes += entry.size
+        
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+    
+    def clear(self):
+        """Evict everything."""
+        self._entries.clear()
+        self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+        }
+    
+    def _remove(self, key: Tuple):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
@@ -0,0 +1,43 @@
+-- Table change notifications for the REST API response cache
+-- Sends NOTIFY table_changed, '<schema>.<table>' after any write so that
+-- rest_api_server.py can evict cached responses that read from that table.
+--
+-- The server listens on REST_NOTIFY_CHANNEL (default table_changed). If you
+-- change that setting, change the channel name in pg_notify() below to match
+-- and re-run this file, or no invalidations will arrive.
+--
+-- Statement-level triggers fire once per statement, and Postgres collapses
+-- identical notifications within a transaction, so bulk writes send one
+-- message per table.
+
+CREATE OR REPLACE FUNCTION public.notify_table_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('table_changed', TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Attach the trigger to every table in the dev, prod and test schemas.
+-- Re-run this file after adding tables.
+DO $$
+DECLARE
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT schemaname, tablename
+        FROM pg_tables
+        WHERE schemaname IN ('dev', 'prod', 'test')
+    LOOP
+        EXECUTE format(
+            'DROP TRIGGER IF EXISTS table_changed_notify ON %I.%I',
+            r.schemaname, r.tablename
+        );
+        EXECUTE format(
+            'CREATE TRIGGER table_changed_notify '
+            'AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I.%I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION public.notify_table_changed()',
+            r.schemaname, r.tablename
+        );
+    END LOOP;
+END;
+$$;
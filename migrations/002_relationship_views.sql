@@ -0,0 +1,80 @@
+-- Materialized views for the heavy relationship endpoints
+-- Used by rest_api_server.py when REST_MATVIEWS_ENABLED=true.
+--
+--   mv_datasources_to_tenants  -> /{schema}/relationships/datasources_to_tenants
+--   mv_dataflow_systems        -> /{schema}/dataflows/{dataflow_id}/systems
+--
+-- Each view has a unique index so it can be refreshed with
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY, which does not block readers.
+-- matview_refresh_log records when each view was last refreshed so the
+-- routes can report how stale their data is.
+
+DO $$
+DECLARE
+    s TEXT;
+BEGIN
+    FOREACH s IN ARRAY ARRAY['dev', 'prod', 'test']
+    LOOP
+        IF to_regclass(format('%I.datasources', s)) IS NULL THEN
+            CONTINUE;
+        END IF;
+        
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I.matview_refresh_log ('
+            '    view_name VARCHAR(100) PRIMARY KEY,'
+            '    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now()'
+            ')', s
+        );
+        
+        -- DataSources to Azure Tenants
+        EXECUTE format(
+            'CREATE MATERIALIZED VIEW IF NOT EXISTS %1$I.mv_datasources_to_tenants AS '
+            'SELECT '
+            '    d.id as datasource_id, '
+            '    d.name as datasource_name, '
+            '    d.datasource_type, '
+            '    t.id as tenant_id, '
+            '    t.tenant_name, '
+            '    t.tenant_id_guid '
+            'FROM %1$I.datasources d '
+            'LEFT JOIN %1$I.datasource_tenant_mapping dtm ON d.id = dtm.datasource_id '
+            'LEFT JOIN %1$I.azure_tenants t ON dtm.tenant_id = t.id', s
+        );
+        EXECUTE format(
+            'CREATE UNIQUE INDEX IF NOT EXISTS mv_datasources_to_tenants_pk '
+            'ON %I.mv_datasources_to_tenants (datasource_id, tenant_id)', s
+        );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS mv_datasources_to_tenants_name '
+            'ON %I.mv_datasources_to_tenants (datasource_name)', s
+        );
+        
+        -- DataFlow sender/receiver Systems
+        EXECUTE format(
+            'CREATE MATERIALIZED VIEW IF NOT EXISTS %1$I.mv_dataflow_systems AS '
+            'SELECT '
+            '    df.id as dataflow_id, '
+            '    df.name as dataflow_name, '
+            '    sender.id as sender_system_id, '
+            '    sender.name as sender_system_name, '
+            '    sender.system_type as sender_system_type, '
+            '    receiver.id as receiver_system_id, '
+            '    receiver.name as receiver_system_name, '
+            '    receiver.system_type as receiver_system_type '
+            'FROM %1$I.dataflows df '
+            'LEFT JOIN %1$I.systems sender ON df.sender_system_id = sender.id '
+            'LEFT JOIN %1$I.systems receiver ON df.receiver_system_id = receiver.id', s
+        );
+        EXECUTE format(
+            'CREATE UNIQUE INDEX IF NOT EXISTS mv_dataflow_systems_pk '
+            'ON %I.mv_dataflow_systems (dataflow_id)', s
+        );
+        
+        EXECUTE format(
+            'INSERT INTO %I.matview_refresh_log (view_name) '
+            'VALUES (''mv_datasources_to_tenants''), (''mv_dataflow_systems'') '
+            'ON CONFLICT (view_name) DO NOTHING', s
+        );
+    END LOOP;
+END;
+$$;
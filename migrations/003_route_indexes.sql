@@ -0,0 +1,87 @@
+-- Generated by: python -m rest_api.index_advisor --offline
+-- Indexes for the REST API route queries (rest_api/route_queries.py).
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction; run with psql -f.
+
+-- dev
+-- get_abap_datasource_partner_profiles
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_abap_partner_profiles_abap_datasource_id_part_ba8c7775 ON dev.abap_partner_profiles (abap_datasource_id, partner_number) INCLUDE (id, partner_type, created_at, updated_at);
+-- get_abap_port_rfc_destinations
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_abap_rfc_destinations_port_id_destination_name ON dev.abap_rfc_destinations (port_id, destination_name) INCLUDE (id, connection_type, target_host, created_at, updated_at);
+-- get_abap_soap_service_bindings
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_abap_soap_service_bindings_service_id_binding_name ON dev.abap_soap_service_bindings (service_id, binding_name) INCLUDE (id, binding_type, created_at, updated_at);
+-- get_azure_api_management_service_apis
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_api_management_apis_service_id_api_name ON dev.azure_api_management_apis (service_id, api_name) INCLUDE (id, api_path, api_version, created_at, updated_at);
+-- get_azure_logic_app_workflow_versions
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_logic_app_workflow_versions_workflow_id_55de3b39 ON dev.azure_logic_app_workflow_versions (workflow_id, created_at DESC) INCLUDE (id, version_number);
+-- get_azure_standard_app_workflows
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_logic_app_workflows_standard_app_id_wor_dc0c7957 ON dev.azure_logic_app_workflows (standard_app_id, workflow_name) INCLUDE (id, state, created_at, updated_at);
+-- get_azure_subscription_resource_groups
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_resource_groups_subscription_id_resourc_8b0ae69d ON dev.azure_resource_groups (subscription_id, resource_group_name) INCLUDE (id, location, created_at, updated_at);
+-- get_azure_tenant_subscriptions
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_subscriptions_tenant_id_subscription_name ON dev.azure_subscriptions (tenant_id, subscription_name) INCLUDE (id, subscription_id_guid, status, created_at, updated_at);
+-- get_btp_api_management_provider_proxies
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_btp_api_management_proxies_provider_id_proxy_name ON dev.btp_api_management_proxies (provider_id, proxy_name) INCLUDE (id, created_at, updated_at);
+-- get_btp_cloud_integration_artefact_runtime
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_btp_cloud_integration_artefact_runtime_artefact_id ON dev.btp_cloud_integration_artefact_runtime (artefact_id) INCLUDE (id, status, deployment_status, last_deployed_at, updated_at);
+-- get_btp_cloud_integration_package_artefacts
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_btp_cloud_integration_artefacts_package_id_ar_405aee83 ON dev.btp_cloud_integration_artefacts (package_id, artefact_name) INCLUDE (id, artefact_type, version, created_at, updated_at);
+-- get_system_datasources
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_datasources_system_id_name ON dev.datasources (system_id, name) INCLUDE (id, datasource_type, created_at, updated_at);
+-- get_dataflow_inventories
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_inventories_dataflow_id_name ON dev.inventories (dataflow_id, name) INCLUDE (id, interface_type, created_at, updated_at);
+
+-- prod
+-- get_abap_datasource_partner_profiles
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_abap_partner_profiles_abap_datasource_id_part_ba8c7775 ON prod.abap_partner_profiles (abap_datasource_id, partner_number) INCLUDE (id, partner_type, created_at, updated_at);
+-- get_abap_port_rfc_destinations
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_abap_rfc_destinations_port_id_destination_name ON prod.abap_rfc_destinations (port_id, destination_name) INCLUDE (id, connection_type, target_host, created_at, updated_at);
+-- get_abap_soap_service_bindings
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_abap_soap_service_bindings_service_id_binding_name ON prod.abap_soap_service_bindings (service_id, binding_name) INCLUDE (id, binding_type, created_at, updated_at);
+-- get_azure_api_management_service_apis
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_api_management_apis_service_id_api_name ON prod.azure_api_management_apis (service_id, api_name) INCLUDE (id, api_path, api_version, created_at, updated_at);
+-- get_azure_logic_app_workflow_versions
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_logic_app_workflow_versions_workflow_id_55de3b39 ON prod.azure_logic_app_workflow_versions (workflow_id, created_at DESC) INCLUDE (id, version_number);
+-- get_azure_standard_app_workflows
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_logic_app_workflows_standard_app_id_wor_dc0c7957 ON prod.azure_logic_app_workflows (standard_app_id, workflow_name) INCLUDE (id, state, created_at, updated_at);
+-- get_azure_subscription_resource_groups
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_resource_groups_subscription_id_resourc_8b0ae69d ON prod.azure_resource_groups (subscription_id, resource_group_name) INCLUDE (id, location, created_at, updated_at);
+-- get_azure_tenant_subscriptions
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_subscriptions_tenant_id_subscription_name ON prod.azure_subscriptions (tenant_id, subscription_name) INCLUDE (id, subscription_id_guid, status, created_at, updated_at);
+-- get_btp_api_management_provider_proxies
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_btp_api_management_proxies_provider_id_proxy_name ON prod.btp_api_management_proxies (provider_id, proxy_name) INCLUDE (id, created_at, updated_at);
+-- get_btp_cloud_integration_artefact_runtime
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_btp_cloud_integration_artefact_runtime_artefact_id ON prod.btp_cloud_integration_artefact_runtime (artefact_id) INCLUDE (id, status, deployment_status, last_deployed_at, updated_at);
+-- get_btp_cloud_integration_package_artefacts
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_btp_cloud_integration_artefacts_package_id_ar_405aee83 ON prod.btp_cloud_integration_artefacts (package_id, artefact_name) INCLUDE (id, artefact_type, version, created_at, updated_at);
+-- get_system_datasources
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_datasources_system_id_name ON prod.datasources (system_id, name) INCLUDE (id, datasource_type, created_at, updated_at);
+-- get_dataflow_inventories
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_inventories_dataflow_id_name ON prod.inventories (dataflow_id, name) INCLUDE (id, interface_type, created_at, updated_at);
+
+-- test
+-- get_abap_datasource_partner_profiles
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_abap_partner_profiles_abap_datasource_id_part_ba8c7775 ON test.abap_partner_profiles (abap_datasource_id, partner_number) INCLUDE (id, partner_type, created_at, updated_at);
+-- get_abap_port_rfc_destinations
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_abap_rfc_destinations_port_id_destination_name ON test.abap_rfc_destinations (port_id, destination_name) INCLUDE (id, connection_type, target_host, created_at, updated_at);
+-- get_abap_soap_service_bindings
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_abap_soap_service_bindings_service_id_binding_name ON test.abap_soap_service_bindings (service_id, binding_name) INCLUDE (id, binding_type, created_at, updated_at);
+-- get_azure_api_management_service_apis
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_api_management_apis_service_id_api_name ON test.azure_api_management_apis (service_id, api_name) INCLUDE (id, api_path, api_version, created_at, updated_at);
+-- get_azure_logic_app_workflow_versions
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_logic_app_workflow_versions_workflow_id_55de3b39 ON test.azure_logic_app_workflow_versions (workflow_id, created_at DESC) INCLUDE (id, version_number);
+-- get_azure_standard_app_workflows
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_logic_app_workflows_standard_app_id_wor_dc0c7957 ON test.azure_logic_app_workflows (standard_app_id, workflow_name) INCLUDE (id, state, created_at, updated_at);
+-- get_azure_subscription_resource_groups
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_resource_groups_subscription_id_resourc_8b0ae69d ON test.azure_resource_groups (subscription_id, resource_group_name) INCLUDE (id, location, created_at, updated_at);
+-- get_azure_tenant_subscriptions
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_azure_subscriptions_tenant_id_subscription_name ON test.azure_subscriptions (tenant_id, subscription_name) INCLUDE (id, subscription_id_guid, status, created_at, updated_at);
+-- get_btp_api_management_provider_proxies
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_btp_api_management_proxies_provider_id_proxy_name ON test.btp_api_management_proxies (provider_id, proxy_name) INCLUDE (id, created_at, updated_at);
+-- get_btp_cloud_integration_artefact_runtime
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_btp_cloud_integration_artefact_runtime_artefact_id ON test.btp_cloud_integration_artefact_runtime (artefact_id) INCLUDE (id, status, deployment_status, last_deployed_at, updated_at);
+-- get_btp_cloud_integration_package_artefacts
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_btp_cloud_integration_artefacts_package_id_ar_405aee83 ON test.btp_cloud_integration_artefacts (package_id, artefact_name) INCLUDE (id, artefact_type, version, created_at, updated_at);
+-- get_system_datasources
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_datasources_system_id_name ON test.datasources (system_id, name) INCLUDE (id, datasource_type, created_at, updated_at);
+-- get_dataflow_inventories
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rest_inventories_dataflow_id_name ON test.inventories (dataflow_id, name) INCLUDE (id, interface_type, created_at, updated_at);
@@ -0,0 +1,47 @@
+-- Compressed storage for Logic App workflow version definitions
+-- Keeps large definition documents out of the heap rows of
+-- azure_logic_app_workflow_versions, so version listings (which only read
+-- metadata) scan narrow rows and never touch the definitions.
+--
+--   toast_tuple_target = 256  -> definitions are compressed and moved to the
+--                                TOAST table once a row exceeds 256 bytes
+--                                (the default threshold is about 2 KB)
+--   COMPRESSION lz4           -> faster compression than the default pglz
+--                                (PostgreSQL 14+ built with lz4; skipped
+--                                otherwise)
+--
+-- Only values written after this migration use the new settings. Existing
+-- rows are moved when they are next rewritten.
+
+DO $$
+DECLARE
+    s TEXT;
+BEGIN
+    FOREACH s IN ARRAY ARRAY['dev', 'prod', 'test']
+    LOOP
+        IF to_regclass(format('%I.azure_logic_app_workflow_versions', s)) IS NULL THEN
+            CONTINUE;
+        END IF;
+        
+        EXECUTE format(
+            'ALTER TABLE %I.azure_logic_app_workflow_versions '
+            'ALTER COLUMN definition SET STORAGE EXTENDED', s
+        );
+        EXECUTE format(
+            'ALTER TABLE %I.azure_logic_app_workflow_versions '
+            'SET (toast_tuple_target = 256)', s
+        );
+        
+        IF current_setting('server_version_num')::int >= 140000 THEN
+            BEGIN
+                EXECUTE format(
+                    'ALTER TABLE %I.azure_logic_app_workflow_versions '
+                    'ALTER COLUMN definition SET COMPRESSION lz4', s
+                );
+            EXCEPTION WHEN feature_not_supported THEN
+                RAISE NOTICE 'lz4 is not available, %.azure_logic_app_workflow_versions keeps pglz', s;
+            END;
+        END IF;
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,74 @@
+-- Unified search index for GET /{schema}/search
+-- One materialized view per schema with a row per searchable entity, a
+-- weighted tsvector (name A, details B) and a trigram index on the name, so
+-- both word matches and "named like X" substring matches use an index.
+--
+-- Refreshed by rest_api_server.py (rest_api/matviews.py): with the other
+-- views when REST_MATVIEWS_ENABLED=true, otherwise every
+-- REST_SEARCH_REFRESH_SECONDS.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DO $$
+DECLARE
+    s TEXT;
+BEGIN
+    FOREACH s IN ARRAY ARRAY['dev', 'prod', 'test']
+    LOOP
+        IF to_regclass(format('%I.systems', s)) IS NULL THEN
+            CONTINUE;
+        END IF;
+        
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I.matview_refresh_log ('
+            '    view_name VARCHAR(100) PRIMARY KEY,'
+            '    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now()'
+            ')', s
+        );
+        
+        EXECUTE format(
+            'CREATE MATERIALIZED VIEW IF NOT EXISTS %1$I.mv_search AS '
+            'SELECT entity_type, entity_id, name, detail, '
+            '    setweight(to_tsvector(''simple'', name), ''A'') || '
+            '    setweight(to_tsvector(''simple'', coalesce(detail, '''')), ''B'') AS document '
+            'FROM ('
+            '    SELECT ''system'', id, name, concat_ws('' '', system_type, description) FROM %1$I.systems '
+            '    UNION ALL '
+            '    SELECT ''datasource'', id, name, datasource_type FROM %1$I.datasources '
+            '    UNION ALL '
+            '    SELECT ''dataflow'', id, name, description FROM %1$I.dataflows '
+            '    UNION ALL '
+            '    SELECT ''azure_api'', id, api_name, api_path FROM %1$I.azure_api_management_apis '
+            '    UNION ALL '
+            '    SELECT ''azure_logic_app_workflow'', id, workflow_name, state FROM %1$I.azure_logic_app_workflows '
+            '    UNION ALL '
+            '    SELECT ''btp_package'', id, package_name, description FROM %1$I.btp_cloud_integration_packages '
+            '    UNION ALL '
+            '    SELECT ''btp_artefact'', id, artefact_name, artefact_type FROM %1$I.btp_cloud_integration_artefacts '
+            '    UNION ALL '
+            '    SELECT ''btp_api_proxy'', id, proxy_name, proxy_endpoint FROM %1$I.btp_api_management_proxies '
+            '    UNION ALL '
+            '    SELECT ''abap_soap_service'', id, service_name, NULL FROM %1$I.abap_soap_services '
+            ') AS entities (entity_type, entity_id, name, detail)', s
+        );
+        EXECUTE format(
+            'CREATE UNIQUE INDEX IF NOT EXISTS mv_search_pk '
+            'ON %I.mv_search (entity_type, entity_id)', s
+        );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS mv_search_document '
+            'ON %I.mv_search USING gin (document)', s
+        );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS mv_search_name_trgm '
+            'ON %I.mv_search USING gin (name gin_trgm_ops)', s
+        );
+        
+        EXECUTE format(
+            'INSERT INTO %I.matview_refresh_log (view_name) '
+            'VALUES (''mv_search'') '
+            'ON CONFLICT (view_name) DO NOTHING', s
+        );
+    END LOOP;
+END;
+$$;
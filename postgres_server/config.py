@@ -23,6 +23,19 @@ class DatabaseConfig:
         self.database = os.getenv("DB_NAME", "postgres")
         self.user = os.getenv("DB_USER", "postgres")
         self.password = os.getenv("DB_PASSWORD", "")
+        
+        # Read replicas (comma-separated URLs) for read-only sessions
+        self.replica_urls = [u.strip() for u in os.getenv("DB_REPLICA_URLS", "").split(",") if u.strip()]
+        self.replica_max_lag_seconds = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "30"))
+        self.replica_check_interval = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))
+        
+        # SQLAlchemy connection pool (per process)
+        self.pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
+        self.max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+        
+        # Read-only transactions (get_read_db)
+        self.read_statement_timeout_ms = int(os.getenv("DB_READ_STATEMENT_TIMEOUT_MS", "5000"))
+        self.read_deferrable = os.getenv("DB_READ_DEFERRABLE", "false").lower() == "true"
     
     def get_connection_params(self):
         """Get connection parameters as a dictionary."""
@@ -40,6 +53,24 @@ class DatabaseConfig:
             return self.database_url
         
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+    
+    def get_read_transaction_sql(self, replica: bool = False):
+        """
+        Get the statements that start a read-only transaction.
+        
+        DEFERRABLE only has an effect on SERIALIZABLE READ ONLY transactions:
+        they wait for a safe snapshot and then run without serialization
+        checks or the risk of serialization failures. Replicas (hot
+        standbys) do not support SERIALIZABLE, so they always use READ ONLY.
+        """
+        if self.read_deferrable and not replica:
+            sql = "SET TRANSACTION ISOLATION LEVEL SERIALIZABLE, READ ONLY, DEFERRABLE"
+        else:
+            sql = "SET TRANSACTION READ ONLY"
+        
+        if self.read_statement_timeout_ms:
+            sql += f"; SET LOCAL statement_timeout = {self.read_statement_timeout_ms}"
+        return sql
 
 
 # Global config instance
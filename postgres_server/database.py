@@ -2,25 +2,53 @@
 Database connection and session management for REST API.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import config
+from .replicas import ReplicaRouter
+
+
+def _sqlalchemy_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+psycopg2://")
+
+
+def _create_engine(url: str):
+    return create_engine(
+        _sqlalchemy_url(url),
+        pool_pre_ping=True,
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow
+    )
+
 
 # Create database URL
-DATABASE_URL = config.get_connection_string().replace("postgresql://", "postgresql+psycopg2://")
-
-# Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+DATABASE_URL = _sqlalchemy_url(config.get_connection_string())
+
+# Create SQLAlchemy engine (primary)
+engine = _create_engine(config.get_connection_string())
+
+# Read replicas: read-only sessions are balanced across the healthy ones
+replica_router = ReplicaRouter(
+    [_create_engine(url) for url in config.replica_urls],
+    max_lag=config.replica_max_lag_seconds,
+    check_interval=config.replica_check_interval
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions whose transactions are READ ONLY with a statement timeout (REST API reads)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@event.listens_for(ReadSessionLocal, "after_begin")
+def _begin_read_only(session, transaction, connection):
+    """Make each read session transaction read-only before its first query."""
+    replica = connection.engine is not engine
+    connection.exec_driver_sql(config.get_read_transaction_sql(replica=replica))
+
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -37,6 +65,22 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """
+    Dependency function to get a read-only database session.
+    
+    Transactions run as SET TRANSACTION READ ONLY with the configured
+    statement_timeout. Sessions go to a healthy replica (round-robin) when
+    DB_REPLICA_URLS is set, otherwise to the primary. No connection is
+    checked out until the first query.
+    """
+    db = ReadSessionLocal(bind=replica_router.choose() or engine)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def get_schema_prefix(schema: str) -> str:
     """
     Get the schema prefix for table names.
@@ -0,0 +1,138 @@
+"""
+Read replica routing for the REST API.
+Balances read-only sessions round-robin across healthy replicas and takes a
+replica out of rotation when it is unreachable or lags too far behind.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Replay lag in seconds; 0 when the replica has replayed everything it received
+# (pg_last_xact_replay_timestamp alone grows while the primary is idle). That
+# only holds while WAL keeps arriving, so the WAL receiver status is checked
+# too: NULL when no receiver runs, 'unknown' when the role may not see it
+# (it needs pg_monitor or pg_read_all_stats). With 'unknown' only the lag
+# is checked.
+LAG_QUERY = text("""
+    SELECT
+        pg_is_in_recovery() AS in_recovery,
+        (SELECT COALESCE(status, 'unknown') FROM pg_stat_wal_receiver) AS receiver_status,
+        CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END AS lag
+""")
+
+
+class ReplicaRouter:
+    """
+    Round-robin over healthy replica engines, with a background health check.
+    
+    Call start() when the application starts; until the first check has
+    run, no replica is healthy and reads go to the primary.
+    """
+    
+    def __init__(self, engines: List[Engine], max_lag: float = 30, check_interval: float = 5):
+        """
+        Args:
+            engines: One engine per replica
+            max_lag: Replicas lagging more than this many seconds are skipped
+            check_interval: Seconds between health checks
+        """
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._status = {id(e): {"healthy": False, "lag": None, "error": None} for e in engines}
+        self._healthy: List[Engine] = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        # Replicas whose WAL receiver the role cannot see, already reported
+        self._unmonitored = set()
+    
+    def choose(self) -> Optional[Engine]:
+        """Next healthy replica, or None to use the primary."""
+        with self._lock:
+            if not self._healthy:
+                return None
+            engine = self._healthy[self._next % len(self._healthy)]
+            self._next += 1
+            return engine
+    
+    def check(self):
+        """Probe every replica once and update the rotation."""
+        healthy = []
+        for engine in self.engines:
+            status = {"healthy": False, "lag": None, "error": None}
+            try:
+                with engine.connect() as conn:
+                    row = conn.execute(LAG_QUERY).one()
+                status["lag"] = float(row.lag)
+                if row.receiver_status == "unknown" and id(engine) not in self._unmonitored:
+                    self._unmonitored.add(id(engine))
+                    logger.error(
+                        f"Replica {engine.url!r}: the database role cannot read pg_stat_wal_receiver "
+                        f"(grant it pg_monitor), so a stopped WAL receiver goes unnoticed; "
+                        f"checking replay lag only"
+                    )
+                if row.in_recovery and row.receiver_status not in ("streaming", "unknown"):
+                    # Replayed all it received, but receives nothing new
+                    status["error"] = f"WAL receiver is {row.receiver_status or 'not running'}"
+                else:
+                    status["healthy"] = status["lag"] <= self.max_lag
+            except Exception as e:
+                status["error"] = str(e)
+            
+            previous = self._status[id(engine)]
+            if previous["healthy"] != status["healthy"]:
+                if status["healthy"]:
+                    logger.info(f"Replica {engine.url!r} back in rotation (lag {status['lag']:.1f}s)")
+                elif status["error"]:
+                    logger.warning(f"Replica {engine.url!r} out of rotation: {status['error']}")
+                else:
+                    logger.warning(f"Replica {engine.url!r} out of rotation: lag {status['lag']:.1f}s > {self.max_lag}s")
+            
+            self._status[id(engine)] = status
+            if status["healthy"]:
+                healthy.append(engine)
+        
+        with self._lock:
+            self._healthy = healthy
+    
+    def start(self):
+        """Start the health check thread; its first check runs at once."""
+        if not self.engines or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the health check thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.check_interval + 1)
+            self._thread = None
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Health of each replica."""
+        return [
+            {"url": repr(engine.url), **self._status[id(engine)]}
+            for engine in self.engines
+        ]
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Replica health check failed: {e}")
+            self._stop.wait(self.check_interval)
@@ -0,0 +1,184 @@
+"""
+Response compression for the REST API server.
+Negotiates gzip, brotli or zstd from Accept-Encoding. brotli and zstd are
+used only when their packages (brotli, zstandard) are installed.
+"""
+
+import gzip
+import logging
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+
+def available_encodings() -> List[str]:
+    """Content-codings supported by the installed packages."""
+    encodings = ["gzip"]
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    return encodings
+
+
+class Compressor:
+    """Chooses and applies a content-coding for response bodies."""
+    
+    def __init__(
+        self,
+        encodings: List[str],
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        zstd_level: int = 3
+    ):
+        """
+        Args:
+            encodings: Content-codings in order of server preference;
+                unavailable ones are dropped
+            minimum_size: Bodies smaller than this (bytes) are sent as-is
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: brotli quality (0-11)
+            zstd_level: zstd compression level (1-22)
+        """
+        available = available_encodings()
+        skipped = [e for e in encodings if e not in available]
+        if skipped:
+            logger.info(f"Response compression: {', '.join(skipped)} not installed, skipping")
+        
+        self.encodings = [e for e in encodings if e in available]
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+    
+    def negotiate(self, accept_encoding: Optional[str], size: int) -> Optional[str]:
+        """
+        Pick the content-coding for a body of the given size.
+        
+        Takes the client's highest q-value among the supported codings,
+        breaking ties by server preference.
+        
+        Returns:
+            The coding name, or None to send the body uncompressed
+        """
+        if not accept_encoding or size < self.minimum_size:
+            return None
+        
+        accepted: Dict[str, float] = {}
+        for item in accept_encoding.split(","):
+            coding, _, params = item.strip().partition(";")
+            q = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    q = float(params[2:])
+                except ValueError:
+                    continue
+            accepted[coding.strip().lower()] = q
+        
+        best, best_q = None, 0.0
+        for coding in self.encodings:
+            q = accepted.get(coding, accepted.get("*", 0.0))
+            if q > best_q:
+                best, best_q = coding, q
+        return best
+    
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress a body with the given content-coding."""
+        if encoding == "gzip":
+            return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=self.zstd_level).compress(body)
+        raise ValueError(f"Unsupported content-coding '{encoding}'")
+    
+    def encoded_body(self, entry, encoding: str) -> bytes:
+        """
+        Compressed body of a CachedResponse, compressed at most once.
+        
+        The result is kept on the entry, so cache hits reuse it.
+        """
+        body = entry.encoded.get(encoding)
+        if body is None:
+            body = self.compress(entry.body, encoding)
+            entry.encoded[encoding] = body
+        return body
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses buffered responses.
+    
+    Responses that already carry a Content-Encoding (e.g. precompressed
+    cache entries) and streamed responses are passed through untouched.
+    """
+    
+    def __init__(self, app, compressor: Compressor):
+        self.app = app
+        self.compressor = compressor
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        if not accept_encoding:
+            await self.app(scope, receive, send)
+            return
+        
+        start = None
+        passthrough = False
+        
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            content_type = headers.get("content-type", "")
+            encoding = None
+            if (
+                not message.get("more_body", False)
+                and "content-encoding" not in headers
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                encoding = self.compressor.negotiate(accept_encoding, len(body))
+            
+            if encoding is None:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            
+            body = self.compressor.compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+        
+        await self.app(scope, receive, send_wrapper)
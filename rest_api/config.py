@@ -0,0 +1,85 @@
+"""
+Configuration management for the REST API server.
+Loads HTTP-layer settings from environment variables or .env file.
+"""
+
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+
+class RestAPIConfig:
+    """REST API configuration with environment variable support."""
+    
+    def __init__(self):
+        # HTTP caching: max-age (seconds) sent in Cache-Control headers.
+        # 0 means clients must revalidate with If-None-Match on every request.
+        self.http_cache_max_age = int(os.getenv("REST_HTTP_CACHE_MAX_AGE", "0"))
+        
+        # Response compression (brotli/zstd need the brotli/zstandard packages)
+        self.compression_enabled = os.getenv("REST_COMPRESSION_ENABLED", "true").lower() == "true"
+        self.compression_encodings = [
+            e.strip() for e in os.getenv("REST_COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",") if e.strip()
+        ]
+        self.compression_min_size = int(os.getenv("REST_COMPRESSION_MIN_SIZE", "1024"))
+        self.compression_gzip_level = int(os.getenv("REST_COMPRESSION_GZIP_LEVEL", "6"))
+        self.compression_brotli_quality = int(os.getenv("REST_COMPRESSION_BROTLI_QUALITY", "5"))
+        self.compression_zstd_level = int(os.getenv("REST_COMPRESSION_ZSTD_LEVEL", "3"))
+        
+        # Server-side response cache
+        self.response_cache_enabled = os.getenv("REST_RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+        self.response_cache_max_entries = int(os.getenv("REST_RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+        self.response_cache_ttl = float(os.getenv("REST_RESPONSE_CACHE_TTL", "300"))
+        
+        # Cache for Logic App workflow version diffs (always on; versions rarely change)
+        self.diff_cache_max_entries = int(os.getenv("REST_DIFF_CACHE_MAX_ENTRIES", "256"))
+        
+        # LISTEN/NOTIFY invalidation (requires migrations/001_table_change_notify.sql)
+        self.notify_enabled = os.getenv("REST_NOTIFY_ENABLED", "true").lower() == "true"
+        # Must match the channel the migration's trigger function notifies on
+        self.notify_channel = os.getenv("REST_NOTIFY_CHANNEL", "table_changed")
+        
+        # Materialized relationship views (requires migrations/002_relationship_views.sql)
+        self.matviews_enabled = os.getenv("REST_MATVIEWS_ENABLED", "false").lower() == "true"
+        self.matview_refresh_interval = float(os.getenv("REST_MATVIEW_REFRESH_INTERVAL", "300"))
+        self.matview_refresh_on_change = os.getenv("REST_MATVIEW_REFRESH_ON_CHANGE", "true").lower() == "true"
+        self.matview_refresh_debounce = float(os.getenv("REST_MATVIEW_REFRESH_DEBOUNCE", "2"))
+        
+        # Search view refresh interval when the materialized views above are
+        # disabled (requires migrations/005_search_index.sql; 0 = never)
+        self.search_refresh_seconds = float(os.getenv("REST_SEARCH_REFRESH_SECONDS", "300"))
+        
+        # Observability: /metrics, and how long /health caches its DB probe
+        self.metrics_enabled = os.getenv("REST_METRICS_ENABLED", "true").lower() == "true"
+        self.readiness_cache_seconds = float(os.getenv("REST_READINESS_CACHE_SECONDS", "5"))
+        
+        # Server-Timing response header, and opt-in per-request profiling
+        # (X-Profile: 1 request header and/or a random sample of requests)
+        self.server_timing_enabled = os.getenv("REST_SERVER_TIMING_ENABLED", "true").lower() == "true"
+        self.profile_header_enabled = os.getenv("REST_PROFILE_HEADER_ENABLED", "false").lower() == "true"
+        self.profile_sample_rate = float(os.getenv("REST_PROFILE_SAMPLE_RATE", "0"))
+        self.profile_dir = os.getenv("REST_PROFILE_DIR", "profiles")
+        self.profile_interval_ms = float(os.getenv("REST_PROFILE_INTERVAL_MS", "5"))
+        
+        # Production launcher (python -m rest_api.launcher)
+        self.host = os.getenv("REST_HOST", "0.0.0.0")
+        self.port = int(os.getenv("REST_PORT", "3000"))
+        self.workers = int(os.getenv("REST_WORKERS", "0"))  # 0 = CPU count
+        self.db_connection_budget = int(os.getenv("REST_DB_CONNECTION_BUDGET", "0"))  # 0 = from max_connections
+        self.db_reserved_connections = int(os.getenv("REST_DB_RESERVED_CONNECTIONS", "10"))
+        self.max_requests = int(os.getenv("REST_MAX_REQUESTS", "0"))  # 0 = never recycle
+        self.max_requests_jitter = int(os.getenv("REST_MAX_REQUESTS_JITTER", "0"))
+        self.graceful_timeout = int(os.getenv("REST_GRACEFUL_TIMEOUT", "30"))
+        
+        # Batch endpoint: maximum number of ids per request
+        self.batch_max_ids = int(os.getenv("REST_BATCH_MAX_IDS", "1000"))
+    
+    def get_cache_control(self):
+        """Get the Cache-Control header value for cacheable GET responses."""
+        return f"private, max-age={self.http_cache_max_age}, must-revalidate"
+
+
+# Global config instance
+rest_config = RestAPIConfig()
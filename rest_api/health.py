@@ -0,0 +1,44 @@
+"""
+Readiness probe for the REST API server.
+Checks the database with SELECT 1 at most once per TTL and serves the cached
+result in between, so frequent probes do not load the pool.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.engine import Engine
+
+
+class ReadinessProbe:
+    """Cached database probe."""
+    
+    def __init__(self, engine: Engine, ttl: float = 5):
+        self.engine = engine
+        self.ttl = ttl
+        self._result: Dict[str, Any] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def check(self) -> Dict[str, Any]:
+        """
+        Probe result: {"ready": bool, "error": str or None, "checked_at": epoch seconds}.
+        
+        Only one caller probes when the cached result expires; the others
+        wait for it and share its result.
+        """
+        with self._lock:
+            if time.time() - self._checked_at < self.ttl:
+                return self._result
+            
+            try:
+                with self.engine.connect() as conn:
+                    conn.exec_driver_sql("SELECT 1")
+                self._result = {"ready": True, "error": None}
+            except Exception as e:
+                self._result = {"ready": False, "error": str(e)}
+            
+            self._checked_at = time.time()
+            self._result["checked_at"] = self._checked_at
+            return self._result
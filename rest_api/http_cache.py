@@ -0,0 +1,50 @@
+"""
+HTTP caching helpers for the REST API server.
+Computes strong ETags and evaluates If-None-Match conditional requests.
+"""
+
+import hashlib
+from typing import Optional
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a strong ETag from the serialized response body.
+    
+    Args:
+        body: Encoded response body
+    
+    Returns:
+        Quoted ETag value
+    """
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+    
+    Uses the weak comparison required for If-None-Match (RFC 9110 13.1.2),
+    so a W/ prefix added by an intermediary still matches.
+    
+    Args:
+        if_none_match: Raw If-None-Match header value (may be None)
+        etag: Current ETag of the resource
+    
+    Returns:
+        True if the client already holds the current representation
+    """
+    if not if_none_match:
+        return False
+    
+    if if_none_match.strip() == "*":
+        return True
+    
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
@@ -0,0 +1,345 @@
+"""
+Index advisor for the REST API route queries.
+Derives the indexes each route in ROUTE_QUERIES needs (filter and join
+columns, ORDER BY keys and covering INCLUDE columns), applies them across the
+dev, prod and test schemas, and flags routes whose plans still fall back to
+sequential scans.
+
+Usage:
+    python -m rest_api.index_advisor                # print missing indexes (live catalog)
+    python -m rest_api.index_advisor --offline      # derive from sample_schema.sql, no DB
+    python -m rest_api.index_advisor --apply        # create missing indexes concurrently
+    python -m rest_api.index_advisor --check        # flag routes whose plans use seq scans
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from typing import Dict, List, Optional, Sequence
+
+from .route_queries import ROUTE_QUERIES, RouteQuery
+
+SCHEMAS = ["dev", "prod", "test"]
+
+# Column types that are safe to copy into a btree index as INCLUDE columns.
+# Unbounded types (text, jsonb, bytea) are left out: they bloat the index and
+# can exceed the btree tuple size limit.
+NARROW_TYPES = {
+    "smallint", "integer", "bigint", "serial", "bigserial", "boolean", "uuid",
+    "date", "timestamp", "timestamp without time zone", "timestamp with time zone",
+    "timestamptz", "real", "double precision",
+}
+MAX_INCLUDE_VARCHAR = 255
+
+SAMPLE_SCHEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample_schema.sql")
+
+
+class TableInfo:
+    """Column types and existing index keys for one schema."""
+    
+    def __init__(self):
+        # table -> column -> (data_type, max_length)
+        self.columns: Dict[str, Dict[str, tuple]] = {}
+        # table -> list of key column lists (primary keys included)
+        self.indexes: Dict[str, List[List[str]]] = {}
+    
+    def has_column(self, table: str, column: str) -> bool:
+        return column in self.columns.get(table, {})
+    
+    def is_narrow(self, table: str, column: str) -> bool:
+        data_type, max_length = self.columns.get(table, {}).get(column, (None, None))
+        if data_type in NARROW_TYPES:
+            return True
+        if data_type in ("character varying", "varchar", "character", "char"):
+            return max_length is not None and max_length <= MAX_INCLUDE_VARCHAR
+        return False
+    
+    def is_covered(self, table: str, key: Sequence[str]) -> bool:
+        """Check whether an existing index already leads with these key columns."""
+        key = [k.split()[0] for k in key]
+        for existing in self.indexes.get(table, []):
+            if existing[:len(key)] == key:
+                return True
+        return False
+
+
+class IndexSpec:
+    """An index derived for a route."""
+    
+    def __init__(self, table: str, key: List[str], include: List[str], routes: List[str]):
+        self.table = table
+        self.key = key
+        self.include = include
+        self.routes = routes
+    
+    @property
+    def name(self) -> str:
+        name = "idx_rest_" + self.table + "_" + "_".join(k.split()[0] for k in self.key)
+        if len(name) > 63:
+            digest = hashlib.sha1(name.encode()).hexdigest()[:8]
+            name = name[:54] + "_" + digest
+        return name
+    
+    def sql(self, schema: str, concurrently: bool = True) -> str:
+        sql = "CREATE INDEX "
+        if concurrently:
+            sql += "CONCURRENTLY "
+        sql += f"IF NOT EXISTS {self.name} ON {schema}.{self.table} ({', '.join(self.key)})"
+        if self.include:
+            sql += f" INCLUDE ({', '.join(self.include)})"
+        return sql + ";"
+
+
+def derive_indexes(route: RouteQuery, info: TableInfo) -> List[IndexSpec]:
+    """
+    Derive the indexes one route needs.
+    
+    - Filtered routes get an index on the filter column, followed by any
+      ORDER BY columns of the same table, so rows come back pre-sorted.
+    - Unfiltered single-table listings get an index on their ORDER BY columns.
+    - Joined tables get an index on their join column.
+    Other narrow columns the route reads from the indexed table are added as
+    INCLUDE columns so the planner can use an index-only scan.
+    """
+    aliases = route.alias_tables()
+    refs = route.column_refs()
+    specs = []
+    
+    def table_columns(alias, column_expr):
+        match = re.match(r"^(\w+)\.(\w+)(\s+(?:ASC|DESC))?$", column_expr)
+        if not match or match.group(1) != alias:
+            return None
+        return match.group(2) + (match.group(3) or "")
+    
+    def make_spec(table, key):
+        if not all(info.has_column(table, k.split()[0]) for k in key):
+            return None
+        if info.is_covered(table, key):
+            return None
+        key_names = {k.split()[0] for k in key}
+        include = [
+            column for ref_table, column in refs
+            if ref_table == table and column not in key_names and info.is_narrow(table, column)
+        ]
+        return IndexSpec(table, key, include, [route.name])
+    
+    driving_alias = route.alias
+    if route.filter:
+        driving_alias = route.filter[0].split(".")[0]
+        table = aliases[driving_alias]
+        key = [table_columns(driving_alias, route.filter[0])]
+        key += [c for c in (table_columns(driving_alias, o) for o in route.order_by) if c]
+        spec = make_spec(table, key)
+        if spec:
+            specs.append(spec)
+    elif not route.joins and route.order_by:
+        key = [c for c in (table_columns(route.alias, o) for o in route.order_by) if c]
+        if key:
+            spec = make_spec(route.table, key)
+            if spec:
+                specs.append(spec)
+    
+    for join in route.joins:
+        if join.alias == driving_alias:
+            continue
+        spec = make_spec(join.table, [join.column])
+        if spec:
+            specs.append(spec)
+    
+    return specs
+
+
+def advise(info: TableInfo, routes: Optional[Sequence[RouteQuery]] = None) -> List[IndexSpec]:
+    """Derive the missing indexes for all routes, merging duplicates."""
+    merged: Dict[tuple, IndexSpec] = {}
+    for route in routes or ROUTE_QUERIES.values():
+        for spec in derive_indexes(route, info):
+            key = (spec.table, tuple(spec.key))
+            if key in merged:
+                existing = merged[key]
+                existing.include += [c for c in spec.include if c not in existing.include]
+                existing.routes += spec.routes
+            else:
+                merged[key] = spec
+    return sorted(merged.values(), key=lambda s: (s.table, s.key))
+
+
+def load_offline_info(schema: str, path: str = SAMPLE_SCHEMA) -> TableInfo:
+    """
+    Build TableInfo from sample_schema.sql.
+    
+    The sample file only defines the dev schema; prod and test are expected
+    to be copies of it, with only the primary keys (not the explicit indexes).
+    """
+    info = TableInfo()
+    with open(path) as f:
+        sql = f.read()
+    
+    for match in re.finditer(r"CREATE TABLE IF NOT EXISTS dev\.(\w+) \((.*?)\n\);", sql, re.S):
+        table, body = match.group(1), match.group(2)
+        columns = {}
+        indexes = []
+        for line in body.splitlines():
+            line = line.strip().rstrip(",")
+            pk = re.match(r"PRIMARY KEY \(([^)]*)\)", line)
+            if pk:
+                indexes.append([c.strip() for c in pk.group(1).split(",")])
+                continue
+            col = re.match(r"(\w+)\s+([A-Za-z ]+?)(?:\((\d+)\))?(?:[\s,]|$)", line)
+            if not col:
+                continue
+            name, data_type, length = col.group(1), col.group(2).strip().lower(), col.group(3)
+            for keyword in (" not", " primary", " references", " default", " unique"):
+                data_type = data_type.split(keyword)[0]
+            data_type = {"varchar": "character varying"}.get(data_type, data_type)
+            columns[name] = (data_type, int(length) if length else None)
+            if "PRIMARY KEY" in line:
+                indexes.append([name])
+        info.columns[table] = columns
+        info.indexes[table] = indexes
+    
+    if schema == "dev":
+        for match in re.finditer(r"CREATE INDEX IF NOT EXISTS \w+ ON dev\.(\w+)\(([^)]*)\)", sql):
+            info.indexes.setdefault(match.group(1), []).append(
+                [c.strip() for c in match.group(2).split(",")]
+            )
+    
+    return info
+
+
+def load_live_info(conn, schema: str) -> TableInfo:
+    """Build TableInfo from the database catalog."""
+    from sqlalchemy import text
+    
+    info = TableInfo()
+    rows = conn.execute(text("""
+        SELECT table_name, column_name, data_type, character_maximum_length
+        FROM information_schema.columns
+        WHERE table_schema = :schema
+    """), {"schema": schema})
+    for table, column, data_type, max_length in rows:
+        info.columns.setdefault(table, {})[column] = (data_type, max_length)
+    
+    rows = conn.execute(text("""
+        SELECT t.relname,
+               array(
+                   SELECT pg_get_indexdef(ix.indexrelid, k, true)
+                   FROM generate_series(1, ix.indnkeyatts) AS k
+                   ORDER BY k
+               )
+        FROM pg_index ix
+        JOIN pg_class t ON t.oid = ix.indrelid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+        WHERE n.nspname = :schema AND ix.indisvalid
+    """), {"schema": schema})
+    for table, columns in rows:
+        info.indexes.setdefault(table, []).append(list(columns))
+    
+    return info
+
+
+def find_seq_scans(plan: dict) -> List[str]:
+    """Collect the relation names of all Seq Scan nodes in an EXPLAIN plan."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found += find_seq_scans(child)
+    return found
+
+
+def check_routes(conn, schema: str) -> List[dict]:
+    """
+    EXPLAIN every route with sequential scans disabled.
+    
+    With enable_seqscan off the planner only picks a Seq Scan when no usable
+    index exists, so this works the same on tiny dev tables as on production
+    sized ones. Unfiltered listings are allowed to scan their driving table.
+    """
+    from sqlalchemy import text
+    
+    problems = []
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    for route in ROUTE_QUERIES.values():
+        if conn.execute(text("SELECT to_regclass(:t)"), {"t": f"{schema}.{route.table}"}).scalar() is None:
+            continue
+        
+        params = {route.param: "__index_advisor__"} if route.param else {}
+        savepoint = conn.begin_nested()
+        try:
+            plan = conn.execute(
+                text("EXPLAIN (FORMAT JSON) " + route.build_sql(schema)), params
+            ).scalar()
+            savepoint.commit()
+        except Exception as e:
+            savepoint.rollback()
+            problems.append({"route": route.name, "schema": schema, "error": str(e).splitlines()[0]})
+            continue
+        
+        scans = find_seq_scans(plan[0]["Plan"])
+        if not route.filter:
+            scans = [s for s in scans if s != route.table]
+        if scans:
+            problems.append({"route": route.name, "schema": schema, "seq_scans": sorted(set(scans))})
+    return problems
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Derive, apply and check indexes for REST API routes.")
+    parser.add_argument("--schemas", nargs="+", default=SCHEMAS, choices=SCHEMAS)
+    parser.add_argument("--offline", action="store_true", help="derive from sample_schema.sql without a database")
+    parser.add_argument("--apply", action="store_true", help="create the missing indexes")
+    parser.add_argument("--check", action="store_true", help="flag routes whose plans fall back to seq scans")
+    args = parser.parse_args(argv)
+    
+    if args.offline:
+        print("-- Generated by: python -m rest_api.index_advisor --offline")
+        print("-- Indexes for the REST API route queries (rest_api/route_queries.py).")
+        print("-- CREATE INDEX CONCURRENTLY cannot run inside a transaction; run with psql -f.")
+        for schema in args.schemas:
+            print(f"\n-- {schema}")
+            for spec in advise(load_offline_info(schema)):
+                print(f"-- {', '.join(spec.routes)}")
+                print(spec.sql(schema))
+        return 0
+    
+    from postgres_server.database import engine
+    
+    exit_code = 0
+    for schema in args.schemas:
+        with engine.connect() as conn:
+            specs = advise(load_live_info(conn, schema))
+        
+        if not specs:
+            print(f"-- {schema}: no missing indexes")
+        for spec in specs:
+            statement = spec.sql(schema)
+            if not args.apply:
+                print(statement)
+                continue
+            
+            # CONCURRENTLY must run outside a transaction block
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                if conn.exec_driver_sql(f"SELECT to_regclass('{schema}.{spec.table}')").scalar() is None:
+                    print(f"-- skipped {schema}.{spec.table}: table does not exist")
+                    continue
+                conn.exec_driver_sql(statement)
+                print(f"-- created {spec.name} on {schema}.{spec.table}")
+        
+        if args.check:
+            with engine.connect() as conn:
+                for problem in check_routes(conn, schema):
+                    exit_code = 1
+                    if "error" in problem:
+                        print(f"!! {schema} {problem['route']}: could not EXPLAIN ({problem['error']})")
+                    else:
+                        print(f"!! {schema} {problem['route']}: seq scan on {', '.join(problem['seq_scans'])}")
+                conn.rollback()
+    
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
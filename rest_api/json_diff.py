@@ -0,0 +1,58 @@
+"""
+JSON diff for the REST API server.
+Produces RFC 6902 JSON Patch operations that turn one JSON document into
+another, used to compare Logic App workflow definition versions.
+"""
+
+from typing import Any, Dict, List
+
+
+def _escape(token: str) -> str:
+    """Escape a key for use in a JSON Pointer (RFC 6901)."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    Compute the JSON Patch that turns old into new.
+    
+    Objects are compared key by key and arrays index by index; anything
+    else that differs is replaced as a whole.
+    
+    Args:
+        old: Source document
+        new: Target document
+        path: JSON Pointer of the documents (empty for the root)
+    
+    Returns:
+        List of {"op", "path", "value"} operations (add, remove, replace)
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff(old[key], value, child))
+        return ops
+    
+    if isinstance(old, list) and isinstance(new, list):
+        ops = []
+        common = min(len(old), len(new))
+        for i in range(common):
+            ops.extend(diff(old[i], new[i], f"{path}/{i}"))
+        # Remove from the end so earlier indexes stay valid
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        for i in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        return ops
+    
+    # bool is an int subclass: 1 == True must still count as a change
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
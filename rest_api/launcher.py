@@ -0,0 +1,143 @@
+"""
+Production launcher for the REST API server.
+Runs rest_api_server:app in several uvicorn worker processes (CPU count by
+default) and sizes each worker's connection pool from a global database
+connection budget, so adding workers never exceeds max_connections.
+
+Usage:
+    python -m rest_api.launcher                    # CPU-count workers, budget from max_connections
+    python -m rest_api.launcher --workers 4 --db-budget 80
+    python -m rest_api.launcher --max-requests 10000 --max-requests-jitter 1000
+    python -m rest_api.launcher --dry-run          # print the pool plan and exit
+
+Send SIGHUP to the launcher to replace the workers one at a time (each new
+worker is ready before the old one is stopped); SIGTERM/SIGINT stop it.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from typing import Optional, Sequence, Tuple
+
+from postgres_server.config import config
+from rest_api.config import rest_config
+
+logger = logging.getLogger(__name__)
+
+
+def server_connection_budget(reserved: int) -> int:
+    """
+    Connections available to the REST API on the database server.
+    
+    max_connections minus the superuser-reserved slots minus `reserved`
+    connections left for other clients (MCP servers, psql, migrations).
+    """
+    import psycopg2
+    
+    conn = psycopg2.connect(config.get_connection_string())
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT current_setting('max_connections')::int
+                     - current_setting('superuser_reserved_connections')::int
+            """)
+            available = cursor.fetchone()[0]
+    finally:
+        conn.close()
+    return available - reserved
+
+
+def plan_pools(budget: int, workers: int, extra_per_worker: int = 0) -> Tuple[int, int, int]:
+    """
+    Split a connection budget across worker processes.
+    
+    Each worker gets an equal share, minus connections it opens outside the
+    pool (e.g. the LISTEN connection). A third of the share is kept open as
+    pool_size and the rest is burst capacity (max_overflow), the same 1:2
+    ratio as the single-process defaults.
+    
+    Args:
+        budget: Total connections all workers may open
+        workers: Requested number of workers
+        extra_per_worker: Connections each worker opens outside its pool
+    
+    Returns:
+        (workers, pool_size, max_overflow); workers is reduced if the budget
+        cannot give each worker at least one pooled connection
+    
+    Raises:
+        ValueError: If the budget cannot support even one worker
+    """
+    per_worker = budget // workers - extra_per_worker
+    if per_worker < 1:
+        fitted = budget // (extra_per_worker + 1)
+        if fitted < 1:
+            raise ValueError(f"Connection budget {budget} is too small for a single worker")
+        logger.warning(f"Connection budget {budget} only fits {fitted} worker(s), not {workers}")
+        workers = fitted
+        per_worker = budget // workers - extra_per_worker
+    
+    pool_size = max(1, per_worker // 3)
+    return workers, pool_size, per_worker - pool_size
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the REST API server with multiple workers.")
+    parser.add_argument("--host", default=rest_config.host)
+    parser.add_argument("--port", type=int, default=rest_config.port)
+    parser.add_argument("--workers", type=int, default=rest_config.workers,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--db-budget", type=int, default=rest_config.db_connection_budget,
+                        help="total DB connections for all workers (default: from max_connections)")
+    parser.add_argument("--db-reserved", type=int, default=rest_config.db_reserved_connections,
+                        help="connections left for other clients when the budget comes from max_connections")
+    parser.add_argument("--max-requests", type=int, default=rest_config.max_requests,
+                        help="recycle a worker after this many requests (0: never)")
+    parser.add_argument("--max-requests-jitter", type=int, default=rest_config.max_requests_jitter,
+                        help="random extra requests per worker, so workers do not recycle together")
+    parser.add_argument("--graceful-timeout", type=int, default=rest_config.graceful_timeout,
+                        help="seconds to let in-flight requests finish on shutdown")
+    parser.add_argument("--dry-run", action="store_true", help="print the pool plan and exit")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.INFO)
+    
+    workers = args.workers or os.cpu_count() or 1
+    budget = args.db_budget or server_connection_budget(args.db_reserved)
+    
+    # Each worker holds one LISTEN connection outside the pool
+    extra = 1 if rest_config.notify_enabled else 0
+    try:
+        workers, pool_size, max_overflow = plan_pools(budget, workers, extra)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    
+    logger.info(
+        f"{workers} worker(s), connection budget {budget}: "
+        f"pool_size={pool_size}, max_overflow={max_overflow} per worker"
+    )
+    if args.dry_run:
+        return 0
+    
+    # Workers are separate processes: pass the pool plan through the environment
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    
+    import uvicorn
+    
+    uvicorn.run(
+        "rest_api_server:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        limit_max_requests=args.max_requests or None,
+        limit_max_requests_jitter=args.max_requests_jitter,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
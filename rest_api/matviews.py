@@ -0,0 +1,160 @@
+"""
+Materialized view maintenance for the REST API server.
+Refreshes the relationship views from migrations/002_relationship_views.sql
+and the search view from migrations/005_search_index.sql concurrently, on a schedule and/or shortly after their base tables change.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# View name -> base tables it is built from
+MATERIALIZED_VIEWS: Dict[str, List[str]] = {
+    "mv_datasources_to_tenants": ["datasources", "datasource_tenant_mapping", "azure_tenants"],
+    "mv_dataflow_systems": ["dataflows", "systems"],
+    # migrations/005_search_index.sql
+    "mv_search": [
+        "systems", "datasources", "dataflows", "azure_api_management_apis",
+        "azure_logic_app_workflows", "btp_cloud_integration_packages",
+        "btp_cloud_integration_artefacts", "btp_api_management_proxies", "abap_soap_services",
+    ],
+}
+
+SCHEMAS = ["dev", "prod", "test"]
+
+
+def get_refreshed_at(db, schema: str, view: str):
+    """Get when a view was last refreshed, or None if unknown."""
+    return db.execute(
+        text(f"SELECT refreshed_at FROM {schema}.matview_refresh_log WHERE view_name = :view"),
+        {"view": view}
+    ).scalar()
+
+
+class MatviewRefresher:
+    """
+    Background refresher for the materialized views (all of them, or the
+    given subset).
+    
+    REFRESH MATERIALIZED VIEW CONCURRENTLY only takes an EXCLUSIVE lock, so
+    SELECTs keep reading the previous contents while a refresh runs. An
+    advisory lock makes sure only one process refreshes a given view at a time.
+    """
+    
+    def __init__(
+        self,
+        engine: Engine,
+        interval: float = 300,
+        debounce: float = 2,
+        notify_channel: Optional[str] = None,
+        views: Optional[List[str]] = None
+    ):
+        self.engine = engine
+        self.views = list(views or MATERIALIZED_VIEWS)
+        self.interval = interval
+        self.debounce = debounce
+        self.notify_channel = notify_channel
+        self._dirty = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_full_refresh = time.monotonic()
+    
+    def mark_stale(self, schema: str, table: str):
+        """
+        Schedule a refresh of every view built from schema.table.
+        
+        Meant as a NotifyListener callback. Changes are debounced so a burst
+        of writes causes one refresh.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for view in self.views:
+                if table in MATERIALIZED_VIEWS[view]:
+                    self._dirty.setdefault((schema, view), now)
+    
+    def refresh(self, schema: str, view: str) -> bool:
+        """
+        Refresh one view concurrently and record the refresh time.
+        
+        Returns:
+            True if the view was refreshed, False if it does not exist or
+            another process is already refreshing it
+        """
+        name = f"{schema}.{view}"
+        try:
+            with self.engine.begin() as conn:
+                if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None:
+                    return False
+                
+                locked = conn.execute(
+                    text("SELECT pg_try_advisory_xact_lock(hashtext(:name))"), {"name": name}
+                ).scalar()
+                if not locked:
+                    return False
+                
+                start = time.monotonic()
+                conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}"))
+                conn.execute(
+                    text(f"""
+                        INSERT INTO {schema}.matview_refresh_log (view_name, refreshed_at)
+                        VALUES (:view, now())
+                        ON CONFLICT (view_name) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at
+                    """),
+                    {"view": view}
+                )
+                
+                # Let every worker evict cached responses read from the view
+                if self.notify_channel:
+                    conn.execute(
+                        text("SELECT pg_notify(:channel, :payload)"),
+                        {"channel": self.notify_channel, "payload": name}
+                    )
+            
+            logger.info(f"Refreshed {name} in {time.monotonic() - start:.2f}s")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Failed to refresh {name}: {e}")
+            return False
+    
+    def start(self):
+        """Start the refresher thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="matview-refresher", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Signal the refresher thread to exit and wait for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+    
+    def _run(self):
+        while not self._stop.wait(1.0):
+            now = time.monotonic()
+            due = set()
+            
+            with self._lock:
+                for key, since in list(self._dirty.items()):
+                    if now - since >= self.debounce:
+                        due.add(key)
+                        del self._dirty[key]
+            
+            if self.interval and now - self._last_full_refresh >= self.interval:
+                self._last_full_refresh = now
+                due.update((schema, view) for schema in SCHEMAS for view in self.views)
+            
+            for schema, view in sorted(due):
+                if self._stop.is_set():
+                    break
+                self.refresh(schema, view)
@@ -0,0 +1,287 @@
+"""
+Request metrics for the REST API server.
+Records per-route latency and per-phase time (pool checkout, SQL, row
+fetching, JSON encoding, compression) and pool checkouts that waited or timed
+out, and renders them, with pool and cache gauges, in the Prometheus text
+format. Metrics are kept per process; with several workers each one reports
+its own (labelled by pid).
+
+The same timings are returned to the client in a Server-Timing header, and a
+request can be profiled with rest_api.profiler (X-Profile header or sampling).
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from rest_api.profiler import RequestProfiler, new_profile_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestTimings:
+    """Time spent in each phase of one request."""
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        # Threadpool threads that ran the route handler. The event loop thread
+        # is shared by every request in flight, so it is left out.
+        self.loop_thread = threading.get_ident()
+        self.threads: Set[int] = set()
+    
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+    
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Timings of the request being handled, or None outside a request."""
+    return _current_timings.get()
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the time spent in the block to the current request's phase."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    if threading.get_ident() != timings.loop_thread:
+        timings.threads.add(threading.get_ident())
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    parts = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """Thread-safe Prometheus histogram with labels."""
+    
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...], buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, *label_values: str):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            series[1] += value
+            series[2] += 1
+    
+    def render(self, const_labels: List[Tuple[str, str]]) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v[0]), v[1], v[2]) for k, v in self._series.items()]
+        for label_values, counts, total, count in sorted(items):
+            labels = const_labels + list(zip(self.labels, label_values))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', repr(bound))])} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Counter:
+    """Thread-safe Prometheus counter with labels."""
+    
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+    
+    def value(self, *label_values: str) -> float:
+        with self._lock:
+            return self._values.get(label_values, 0)
+    
+    def render(self, const_labels: List[Tuple[str, str]]) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(const_labels + list(zip(self.labels, label_values)))} {value}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "rest_request_duration_seconds",
+    "Time to handle a request, by route template, method and status.",
+    ("route", "method", "status"),
+)
+PHASE_SECONDS = Histogram(
+    "rest_request_phase_seconds",
+    "Time per request spent in a phase (pool, sql, fetch, encode, compress).",
+    ("route", "phase"),
+)
+POOL_WAITS = Counter(
+    "rest_db_pool_wait_total",
+    "Connection checkouts that found the pool exhausted and had to wait.",
+    ("engine",),
+)
+POOL_TIMEOUTS = Counter(
+    "rest_db_pool_timeouts_total",
+    "Connection checkouts that gave up after the pool timeout.",
+    ("engine",),
+)
+
+# Callables returning (name, type, help, [(labels, value)]) for gauges and
+# counters read at scrape time (pools, caches, replicas)
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+_collectors: List[Collector] = []
+
+
+def register_collector(collector: Collector):
+    """Add a scrape-time collector."""
+    _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    const_labels = [("pid", str(os.getpid()))]
+    lines = []
+    lines += REQUEST_SECONDS.render(const_labels)
+    lines += PHASE_SECONDS.render(const_labels)
+    lines += POOL_WAITS.render(const_labels)
+    lines += POOL_TIMEOUTS.render(const_labels)
+    for collector in _collectors:
+        for name, metric_type, help, samples in collector():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(const_labels + list(labels.items()))} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def route_label(scope) -> str:
+    """Route template of a handled request (bounded label cardinality)."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def server_timing(timings: RequestTimings) -> str:
+    """Server-Timing header value: each phase and the total, in milliseconds."""
+    entries = [f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in timings.phases.items()]
+    entries.append(f"total;dur={timings.elapsed() * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that times requests and records their phases.
+    
+    Optionally adds a Server-Timing header to every response and profiles
+    selected requests (X-Profile: 1 header and/or a random sample), writing
+    one collapsed-stack file per request to profile_dir. Profiles sample the
+    threadpool thread running the route handler, from its first timed phase
+    until the response starts, so concurrent requests do not show up in them.
+    """
+    
+    def __init__(
+        self,
+        app,
+        record_metrics: bool = True,
+        server_timing: bool = True,
+        profile_header: bool = False,
+        profile_sample_rate: float = 0.0,
+        profile_dir: str = "profiles",
+        profile_interval: float = 0.005,
+    ):
+        self.app = app
+        self.record_metrics = record_metrics
+        self.server_timing = server_timing
+        self.profile_header = profile_header
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_dir = profile_dir
+        self.profile_interval = profile_interval
+    
+    def should_profile(self, scope) -> bool:
+        if self.profile_header and (b"x-profile", b"1") in scope.get("headers", []):
+            return True
+        return self.profile_sample_rate > 0 and random.random() < self.profile_sample_rate
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        status = 500
+        
+        profiler = None
+        profile_id = None
+        if self.should_profile(scope):
+            profile_id = new_profile_id()
+            profiler = RequestProfiler(timings.threads, self.profile_interval)
+            profiler.start()
+        
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # The handler is done; its threadpool thread may now serve
+                # other requests, so stop sampling it
+                timings.threads.clear()
+                headers = list(message.get("headers", []))
+                if self.server_timing:
+                    headers.append((b"server-timing", server_timing(timings).encode("latin-1")))
+                if profile_id is not None:
+                    headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_timings.reset(token)
+            route = route_label(scope)
+            if self.record_metrics:
+                REQUEST_SECONDS.observe(timings.elapsed(), route, scope["method"], str(status))
+                for phase, seconds in timings.phases.items():
+                    PHASE_SECONDS.observe(seconds, route, phase)
+            if profiler is not None:
+                profiler.stop()
+                try:
+                    path = await run_in_threadpool(profiler.write, self.profile_dir, f"{profile_id}-{route}")
+                    logger.info(f"Profile of {scope['method']} {scope['path']} written to {path}")
+                except OSError as e:
+                    logger.error(f"Could not write profile {profile_id}: {e}")
@@ -0,0 +1,139 @@
+"""
+Background LISTEN/NOTIFY consumer for the REST API server.
+Receives 'schema.table' payloads sent by the table change triggers in
+migrations/001_table_change_notify.sql and dispatches them to callbacks.
+"""
+
+import logging
+import select
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+
+class NotifyListener:
+    """Listens on a Postgres channel in a daemon thread."""
+    
+    def __init__(self, dsn: str, channel: str, poll_interval: float = 5.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._callbacks: List[Callable[[str, str], None]] = []
+        self._reconnect_callbacks: List[Callable[[], None]] = []
+        self._delayed_callbacks: List[Tuple[Callable[[str, str], None], float]] = []
+        
+        # Due time of each pending delayed call, by (callback index, schema, table)
+        self._pending: Dict[Tuple[int, str, str], float] = {}
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def add_callback(self, callback: Callable[[str, str], None]):
+        """Register a callback called with (schema, table) for each notification."""
+        self._callbacks.append(callback)
+    
+    def add_delayed_callback(self, callback: Callable[[str, str], None], delay: float):
+        """
+        Register a callback called with (schema, table) `delay` seconds after
+        a notification. Further notifications for the same table push the
+        call back, so it runs once, `delay` seconds after the last change.
+        """
+        self._delayed_callbacks.append((callback, delay))
+    
+    def add_reconnect_callback(self, callback: Callable[[], None]):
+        """
+        Register a callback called whenever the connection is (re)established.
+        
+        Notifications sent while disconnected are lost, so callers should
+        drop anything that relies on them here.
+        """
+        self._reconnect_callbacks.append(callback)
+    
+    def has_callbacks(self) -> bool:
+        """Check whether anything is subscribed to notifications."""
+        return bool(self._callbacks or self._delayed_callbacks)
+    
+    def start(self):
+        """Start the listener thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"notify-{self.channel}", daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self):
+        """Signal the listener thread to exit and wait for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+    
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                logger.info(f"Listening for table changes on channel '{self.channel}'")
+                
+                for callback in self._reconnect_callbacks:
+                    callback()
+                backoff = 1.0
+                
+                while not self._stop.is_set():
+                    ready, _, _ = select.select([conn], [], [], self._wait_time())
+                    if ready:
+                        conn.poll()
+                        while conn.notifies:
+                            self._dispatch(conn.notifies.pop(0).payload)
+                    self._run_due()
+            
+            except Exception as e:
+                logger.error(f"Notify listener error on '{self.channel}': {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            
+            finally:
+                if conn is not None:
+                    conn.close()
+    
+    def _dispatch(self, payload: str):
+        schema, _, table = payload.partition(".")
+        if not table:
+            logger.warning(f"Ignoring malformed notification payload '{payload}'")
+            return
+        for callback in self._callbacks:
+            self._call(callback, schema, table)
+        
+        now = time.monotonic()
+        for index, (_, delay) in enumerate(self._delayed_callbacks):
+            self._pending[(index, schema, table)] = now + delay
+    
+    def _wait_time(self) -> float:
+        """Seconds to wait for notifications before the next delayed call is due."""
+        if not self._pending:
+            return self.poll_interval
+        return max(0.0, min(self.poll_interval, min(self._pending.values()) - time.monotonic()))
+    
+    def _run_due(self):
+        now = time.monotonic()
+        for key, due in list(self._pending.items()):
+            if due <= now:
+                del self._pending[key]
+                index, schema, table = key
+                self._call(self._delayed_callbacks[index][0], schema, table)
+    
+    def _call(self, callback: Callable[[str, str], None], schema: str, table: str):
+        try:
+            callback(schema, table)
+        except Exception as e:
+            logger.error(f"Notify callback failed for '{schema}.{table}': {e}")
@@ -0,0 +1,87 @@
+"""
+Per-request sampling profiler for the REST API server.
+Samples the stacks of the threads working on one request at a fixed interval
+and writes them as collapsed stacks ("frame;frame;frame count"), the input
+format of flamegraph.pl, speedscope and inferno.
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RequestProfiler:
+    """Samples a set of threads in a background thread until stopped."""
+    
+    def __init__(self, threads: Set[int], interval: float = 0.005):
+        """
+        Args:
+            threads: Idents of the threads to sample; may change while
+                sampling (e.g. when the request moves to a threadpool thread)
+            interval: Seconds between samples
+        """
+        self.threads = threads
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def write(self, directory: str, name: str) -> str:
+        """
+        Write the collapsed stacks to <directory>/<name>.folded.
+        
+        Returns:
+            Path of the written file
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, re.sub(r"[^\w.-]+", "_", name) + ".folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+        return path
+    
+    def _run(self):
+        names = {}
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident in list(self.threads):
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if ident not in names:
+                    threads = {t.ident: t.name for t in threading.enumerate()}
+                    names[ident] = f"thread {threads.get(ident, ident)}"
+                stack.append(names[ident])
+                self.samples[tuple(reversed(stack))] += 1
+
+
+def new_profile_id() -> str:
+    """Unique id for a request profile: <time>-<pid>-<random>."""
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    return f"{stamp}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
@@ -0,0 +1,165 @@
+"""
+In-process response cache for REST API routes.
+Entries are keyed by route, schema and path params and track which tables
+they were read from, so a write to any of those tables evicts them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class CachedResponse:
+    """A serialized route result plus the metadata needed to serve it."""
+    
+    def __init__(self, data: Any, body: bytes, etag: str, refreshed_at: Optional[datetime] = None):
+        self.data = data
+        self.body = body
+        self.etag = etag
+        self.created_at = time.time()
+        
+        # Compressed bodies by content-coding, filled on first use
+        self.encoded: Dict[str, bytes] = {}
+        
+        # When the underlying snapshot (e.g. a materialized view) was refreshed
+        self.refreshed_at = refreshed_at
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with TTL and per-table dependency tracking."""
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._entry_tables = {}
+        self._dependents = {}
+        self._table_versions = {}
+        # Bumped by clear(), which may follow writes to tables never seen here
+        self._epoch = 0
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+    
+    @staticmethod
+    def make_key(route: str, schema: str, params: Optional[Dict] = None) -> Tuple:
+        """Build a cache key from route name, schema and path/query params."""
+        return (route, schema, tuple(sorted((params or {}).items())))
+    
+    def get(self, key: Tuple) -> Optional[CachedResponse]:
+        """Return a live entry and mark it as recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            if self.ttl and time.time() - entry.created_at > self.ttl:
+                self._remove(key)
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+    
+    def table_versions(self, schema: str, tables: Iterable[str]) -> Tuple:
+        """
+        Snapshot invalidation counters for a set of tables.
+        
+        Take the snapshot before loading from the database and pass it to
+        set(); if a table changed or the cache was cleared while the query
+        ran, the result is not cached.
+        """
+        with self._lock:
+            return self._versions(schema, tables)
+    
+    def set(
+        self,
+        key: Tuple,
+        entry: CachedResponse,
+        schema: str,
+        tables: Iterable[str],
+        versions: Optional[Tuple] = None
+    ) -> CachedResponse:
+        """
+        Store an entry and register its table dependencies.
+        
+        Returns the entry so callers can serve it directly.
+        """
+        tables = tuple(tables)
+        with self._lock:
+            if versions is not None:
+                if self._versions(schema, tables) != versions:
+                    return entry
+            
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = entry
+            self._entry_tables[key] = [(schema, t) for t in tables]
+            for dep in self._entry_tables[key]:
+                self._dependents.setdefault(dep, set()).add(key)
+            
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+        
+        return entry
+    
+    def invalidate_table(self, schema: str, table: str) -> int:
+        """
+        Evict every entry that depends on schema.table.
+        
+        Returns:
+            Number of entries evicted
+        """
+        with self._lock:
+            dep = (schema, table)
+            self._table_versions[dep] = self._table_versions.get(dep, 0) + 1
+            keys = self._dependents.pop(dep, set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+    
+    def clear(self):
+        """Evict everything (e.g. after losing the invalidation feed)."""
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._entry_tables.clear()
+            self._dependents.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+    
+    def _versions(self, schema: str, tables: Iterable[str]) -> Tuple:
+        """Current epoch and table counters. Caller holds the lock."""
+        return (self._epoch,) + tuple(self._table_versions.get((schema, t), 0) for t in tables)
+    
+    def _remove(self, key: Tuple):
+        """Remove an entry and its dependency links. Caller holds the lock."""
+        self._entries.pop(key, None)
+        for dep in self._entry_tables.pop(key, []):
+            dependents = self._dependents.get(dep)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self._dependents[dep]
@@ -0,0 +1,503 @@
+"""
+Route query registry for the REST API server.
+Declares the SQL behind each relationship route (tables, joins, filter and
+ordering) so routes, the response cache and the index advisor share one
+definition.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_COLUMN_REF = re.compile(r"^(\w+)\.(\w+)$")
+
+# Column used to group batch query rows back to the id they belong to
+BATCH_KEY = "_batch_key"
+
+# statement_timeout for routes that list whole tables rather than look up by id
+LISTING_TIMEOUT_MS = 30000
+
+
+class Join:
+    """A join of the form: <kind> JOIN schema.table alias ON references = alias.column"""
+    
+    def __init__(self, kind: str, table: str, alias: str, column: str, references: str):
+        self.kind = kind
+        self.table = table
+        self.alias = alias
+        self.column = column
+        self.references = references
+    
+    def sql(self, schema: str) -> str:
+        return (
+            f"{self.kind} JOIN {schema}.{self.table} {self.alias} "
+            f"ON {self.references} = {self.alias}.{self.column}"
+        )
+
+
+class RouteQuery:
+    """Declarative definition of the SELECT a route runs."""
+    
+    def __init__(
+        self,
+        name: str,
+        table: str,
+        alias: str,
+        columns: Sequence[str],
+        joins: Sequence[Join] = (),
+        filter: Optional[Tuple[str, str]] = None,
+        order_by: Sequence[str] = (),
+        single: bool = False,
+        not_found: Optional[str] = None,
+        depends_on: Sequence[str] = (),
+        default_fields: Optional[Sequence[str]] = None,
+        timeout_ms: Optional[int] = None
+    ):
+        """
+        Args:
+            name: Route function name
+            table: Driving table
+            alias: Alias of the driving table
+            columns: SELECT list entries, e.g. "d.name" or "pt.kind as description"
+            joins: Joined tables
+            filter: (column expression, path param name) for the WHERE clause
+            order_by: ORDER BY expressions, e.g. "v.created_at DESC"
+            single: Route returns one object (404 when missing) instead of a list
+            not_found: 404 message, formatted with the route params
+            depends_on: Extra relations the route may read (e.g. materialized views)
+            default_fields: Output columns returned when no projection is
+                requested (defaults to all columns)
+            timeout_ms: statement_timeout for this route (defaults to
+                DB_READ_STATEMENT_TIMEOUT_MS)
+        """
+        self.name = name
+        self.table = table
+        self.alias = alias
+        self.columns = list(columns)
+        self.joins = list(joins)
+        self.filter = filter
+        self.order_by = list(order_by)
+        self.single = single
+        self.not_found = not_found
+        self.depends_on = list(depends_on)
+        self.default_fields = list(default_fields) if default_fields else None
+        self.timeout_ms = timeout_ms
+    
+    @property
+    def tables(self) -> List[str]:
+        """All tables and views the route reads from."""
+        return [self.table] + [j.table for j in self.joins] + self.depends_on
+    
+    @property
+    def param(self) -> Optional[str]:
+        """Name of the path param used in the WHERE clause."""
+        return self.filter[1] if self.filter else None
+    
+    def alias_tables(self) -> Dict[str, str]:
+        """Map of alias -> table name."""
+        aliases = {self.alias: self.table}
+        for join in self.joins:
+            aliases[join.alias] = join.table
+        return aliases
+    
+    def output_columns(self) -> Dict[str, str]:
+        """Map of output column name -> SQL expression, in SELECT order."""
+        result = {}
+        for column in self.columns:
+            expression, sep, name = column.rpartition(" as ")
+            if not sep:
+                expression, name = column, column.rsplit(".", 1)[-1]
+            result[name] = expression
+        return result
+    
+    def select_columns(self, fields: Optional[Sequence[str]] = None) -> List[str]:
+        """
+        SELECT list entries for the requested output columns.
+        
+        Args:
+            fields: Output column names to keep (None for the route's default
+                fields). Validated against the route's output columns.
+        
+        Raises:
+            ValueError: If a field is not an output column of the route
+        """
+        if not fields:
+            fields = self.default_fields
+        if not fields:
+            return self.columns
+        
+        available = self.output_columns()
+        unknown = [f for f in fields if f not in available]
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s) {', '.join(unknown)}. "
+                f"Available: {', '.join(available)}"
+            )
+        return [column for column, name in zip(self.columns, available) if name in fields]
+    
+    def column_refs(self) -> List[Tuple[str, str]]:
+        """Every (table, column) the query touches, in first-use order."""
+        aliases = self.alias_tables()
+        expressions = list(self.output_columns().values())
+        expressions += [j.references for j in self.joins]
+        expressions += [f"{j.alias}.{j.column}" for j in self.joins]
+        if self.filter:
+            expressions.append(self.filter[0])
+        expressions += [o.split()[0] for o in self.order_by]
+        
+        refs = []
+        for expression in expressions:
+            match = _COLUMN_REF.match(expression)
+            if match and match.group(1) in aliases:
+                ref = (aliases[match.group(1)], match.group(2))
+                if ref not in refs:
+                    refs.append(ref)
+        return refs
+    
+    def build_sql(self, schema: str, fields: Optional[Sequence[str]] = None) -> str:
+        """Render the query for a schema, optionally projected to some fields."""
+        where = f"{self.filter[0]} = :{self.filter[1]}" if self.filter else None
+        return self._render(schema, self.select_columns(fields), where, self.order_by)
+    
+    def build_batch_sql(self, schema: str) -> str:
+        """
+        Render the query for many filter values at once.
+        
+        Uses WHERE <filter> = ANY(:ids) and returns the filter value as
+        _batch_key so rows can be grouped back per id.
+        """
+        if not self.filter:
+            raise ValueError(f"Route '{self.name}' has no filter and cannot be batched")
+        expression = self.filter[0]
+        columns = [f"{expression} as {BATCH_KEY}"] + self.select_columns()
+        return self._render(
+            schema, columns, f"{expression} = ANY(:ids)", [expression] + self.order_by
+        )
+    
+    def _render(self, schema: str, columns: Sequence[str], where: Optional[str], order_by: Sequence[str]) -> str:
+        select = ",\n    ".join(columns)
+        sql = f"SELECT\n    {select}\nFROM {schema}.{self.table} {self.alias}"
+        for join in self.joins:
+            sql += "\n" + join.sql(schema)
+        if where:
+            sql += f"\nWHERE {where}"
+        if order_by:
+            sql += "\nORDER BY " + ", ".join(order_by)
+        return sql
+
+
+ROUTE_QUERIES: Dict[str, RouteQuery] = {q.name: q for q in [
+    # ------------------------------------------------------------------
+    # General
+    # ------------------------------------------------------------------
+    RouteQuery(
+        "get_properties",
+        table="properties", alias="p",
+        columns=[
+            "p.id",
+            "pt.name as name",
+            "p.value",
+            "pt.kind as description",
+            "p.create_time as created_at",
+            "p.change_time as updated_at",
+        ],
+        joins=[Join("LEFT", "property_types", "pt", "id", "p.type_id")],
+        order_by=["pt.name"],
+        timeout_ms=LISTING_TIMEOUT_MS,
+    ),
+    RouteQuery(
+        "get_property_types",
+        table="property_types", alias="pt",
+        columns=[
+            "pt.id",
+            "pt.name as type_name",
+            "pt.kind as description",
+            "pt.create_time as created_at",
+        ],
+        order_by=["pt.name"],
+        timeout_ms=LISTING_TIMEOUT_MS,
+    ),
+    RouteQuery(
+        "get_metadata",
+        table="metadata", alias="m",
+        columns=[
+            "m.id",
+            "m.name as key",
+            "m.value",
+            "'system' as category",
+            "m.create_time as created_at",
+            "m.change_time as updated_at",
+        ],
+        order_by=["m.name"],
+        timeout_ms=LISTING_TIMEOUT_MS,
+    ),
+    
+    # ------------------------------------------------------------------
+    # Core & high-level relationships
+    # ------------------------------------------------------------------
+    RouteQuery(
+        "get_datasources_to_tenants",
+        table="datasources", alias="d",
+        columns=[
+            "d.id as datasource_id",
+            "d.name as datasource_name",
+            "d.datasource_type",
+            "t.id as tenant_id",
+            "t.tenant_name",
+            "t.tenant_id_guid",
+        ],
+        joins=[
+            Join("LEFT", "datasource_tenant_mapping", "dtm", "datasource_id", "d.id"),
+            Join("LEFT", "azure_tenants", "t", "id", "dtm.tenant_id"),
+        ],
+        order_by=["d.name"],
+        depends_on=["mv_datasources_to_tenants"],
+        timeout_ms=LISTING_TIMEOUT_MS,
+    ),
+    RouteQuery(
+        "get_system_datasources",
+        table="datasources", alias="d",
+        columns=[
+            "d.id",
+            "d.name",
+            "d.datasource_type",
+            "d.connection_string",
+            "d.created_at",
+            "d.updated_at",
+        ],
+        filter=("d.system_id", "system_id"),
+        order_by=["d.name"],
+    ),
+    RouteQuery(
+        "get_dataflow_systems",
+        table="dataflows", alias="df",
+        columns=[
+            "df.id as dataflow_id",
+            "df.name as dataflow_name",
+            "sender.id as sender_system_id",
+            "sender.name as sender_system_name",
+            "sender.system_type as sender_system_type",
+            "receiver.id as receiver_system_id",
+            "receiver.name as receiver_system_name",
+            "receiver.system_type as receiver_system_type",
+        ],
+        joins=[
+            Join("LEFT", "systems", "sender", "id", "df.sender_system_id"),
+            Join("LEFT", "systems", "receiver", "id", "df.receiver_system_id"),
+        ],
+        filter=("df.id", "dataflow_id"),
+        single=True,
+        not_found="DataFlow '{dataflow_id}' not found",
+        depends_on=["mv_dataflow_systems"],
+    ),
+    RouteQuery(
+        "get_dataflow_inventories",
+        table="inventories", alias="i",
+        columns=[
+            "i.id",
+            "i.name",
+            "i.interface_type",
+            "i.endpoint_url",
+            "i.created_at",
+            "i.updated_at",
+        ],
+        filter=("i.dataflow_id", "dataflow_id"),
+        order_by=["i.name"],
+    ),
+    
+    # ------------------------------------------------------------------
+    # Microsoft Azure
+    # ------------------------------------------------------------------
+    RouteQuery(
+        "get_azure_tenant_subscriptions",
+        table="azure_subscriptions", alias="s",
+        columns=[
+            "s.id",
+            "s.subscription_name",
+            "s.subscription_id_guid",
+            "s.status",
+            "s.created_at",
+            "s.updated_at",
+        ],
+        filter=("s.tenant_id", "tenant_id"),
+        order_by=["s.subscription_name"],
+    ),
+    RouteQuery(
+        "get_azure_subscription_resource_groups",
+        table="azure_resource_groups", alias="rg",
+        columns=[
+            "rg.id",
+            "rg.resource_group_name",
+            "rg.location",
+            "rg.created_at",
+            "rg.updated_at",
+        ],
+        filter=("rg.subscription_id", "subscription_id"),
+        order_by=["rg.resource_group_name"],
+    ),
+    RouteQuery(
+        "get_azure_api_management_service_apis",
+        table="azure_api_management_apis", alias="a",
+        columns=[
+            "a.id",
+            "a.api_name",
+            "a.api_path",
+            "a.api_version",
+            "a.created_at",
+            "a.updated_at",
+        ],
+        filter=("a.service_id", "service_id"),
+        order_by=["a.api_name"],
+    ),
+    RouteQuery(
+        "get_azure_api_management_api_products",
+        table="azure_api_management_products", alias="p",
+        columns=[
+            "p.id",
+            "p.product_name",
+            "p.description",
+            "p.requires_subscription",
+            "p.created_at",
+            "p.updated_at",
+        ],
+        joins=[Join("INNER", "azure_api_product_mapping", "apm", "product_id", "p.id")],
+        filter=("apm.api_id", "api_id"),
+        order_by=["p.product_name"],
+    ),
+    RouteQuery(
+        "get_azure_standard_app_workflows",
+        table="azure_logic_app_workflows", alias="w",
+        columns=[
+            "w.id",
+            "w.workflow_name",
+            "w.state",
+            "w.created_at",
+            "w.updated_at",
+        ],
+        filter=("w.standard_app_id", "app_id"),
+        order_by=["w.workflow_name"],
+    ),
+    RouteQuery(
+        "get_azure_logic_app_workflow_versions",
+        table="azure_logic_app_workflow_versions", alias="v",
+        columns=[
+            "v.id",
+            "v.version_number",
+            "v.definition",
+            "pg_column_size(v.definition) as definition_size",
+            "v.created_at",
+        ],
+        filter=("v.workflow_id", "workflow_id"),
+        order_by=["v.created_at DESC"],
+        # Definitions can be large: list metadata only unless asked for
+        default_fields=["id", "version_number", "created_at"],
+    ),
+    
+    # ------------------------------------------------------------------
+    # SAP BTP
+    # ------------------------------------------------------------------
+    RouteQuery(
+        "get_btp_cloud_integration_package_artefacts",
+        table="btp_cloud_integration_artefacts", alias="a",
+        columns=[
+            "a.id",
+            "a.artefact_name",
+            "a.artefact_type",
+            "a.version",
+            "a.created_at",
+            "a.updated_at",
+        ],
+        filter=("a.package_id", "package_id"),
+        order_by=["a.artefact_name"],
+    ),
+    RouteQuery(
+        "get_btp_cloud_integration_artefact_runtime",
+        table="btp_cloud_integration_artefact_runtime", alias="r",
+        columns=[
+            "r.id",
+            "r.artefact_id",
+            "a.artefact_name",
+            "r.status",
+            "r.deployment_status",
+            "r.last_deployed_at",
+            "r.error_message",
+            "r.updated_at",
+        ],
+        joins=[Join("INNER", "btp_cloud_integration_artefacts", "a", "id", "r.artefact_id")],
+        filter=("r.artefact_id", "artefact_id"),
+        single=True,
+        not_found="Runtime info for artefact '{artefact_id}' not found",
+    ),
+    RouteQuery(
+        "get_btp_api_management_provider_proxies",
+        table="btp_api_management_proxies", alias="p",
+        columns=[
+            "p.id",
+            "p.proxy_name",
+            "p.proxy_endpoint",
+            "p.created_at",
+            "p.updated_at",
+        ],
+        filter=("p.provider_id", "provider_id"),
+        order_by=["p.proxy_name"],
+    ),
+    RouteQuery(
+        "get_btp_api_management_proxy_products",
+        table="btp_api_management_products", alias="p",
+        columns=[
+            "p.id",
+            "p.product_name",
+            "p.description",
+            "p.created_at",
+            "p.updated_at",
+        ],
+        joins=[Join("INNER", "btp_proxy_product_mapping", "ppm", "product_id", "p.id")],
+        filter=("ppm.proxy_id", "proxy_id"),
+        order_by=["p.product_name"],
+    ),
+    
+    # ------------------------------------------------------------------
+    # SAP ABAP
+    # ------------------------------------------------------------------
+    RouteQuery(
+        "get_abap_datasource_partner_profiles",
+        table="abap_partner_profiles", alias="pp",
+        columns=[
+            "pp.id",
+            "pp.partner_number",
+            "pp.partner_type",
+            "pp.description",
+            "pp.created_at",
+            "pp.updated_at",
+        ],
+        filter=("pp.abap_datasource_id", "datasource_id"),
+        order_by=["pp.partner_number"],
+    ),
+    RouteQuery(
+        "get_abap_port_rfc_destinations",
+        table="abap_rfc_destinations", alias="rd",
+        columns=[
+            "rd.id",
+            "rd.destination_name",
+            "rd.connection_type",
+            "rd.target_host",
+            "rd.created_at",
+            "rd.updated_at",
+        ],
+        filter=("rd.port_id", "port_id"),
+        order_by=["rd.destination_name"],
+    ),
+    RouteQuery(
+        "get_abap_soap_service_bindings",
+        table="abap_soap_service_bindings", alias="b",
+        columns=[
+            "b.id",
+            "b.binding_name",
+            "b.endpoint_url",
+            "b.binding_type",
+            "b.created_at",
+            "b.updated_at",
+        ],
+        filter=("b.service_id", "service_id"),
+        order_by=["b.binding_name"],
+    ),
+]}
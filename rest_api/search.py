@@ -0,0 +1,79 @@
+"""
+Search across integration entities for the REST API server.
+Queries the unified mv_search view from migrations/005_search_index.sql:
+word matches use its tsvector index, substring and fuzzy name matches its
+trigram index.
+"""
+
+from typing import List, Optional, Sequence
+
+SEARCH_VIEW = "mv_search"
+
+# entity_type values in mv_search -> base table
+ENTITY_TABLES = {
+    "system": "systems",
+    "datasource": "datasources",
+    "dataflow": "dataflows",
+    "azure_api": "azure_api_management_apis",
+    "azure_logic_app_workflow": "azure_logic_app_workflows",
+    "btp_package": "btp_cloud_integration_packages",
+    "btp_artefact": "btp_cloud_integration_artefacts",
+    "btp_api_proxy": "btp_api_management_proxies",
+    "abap_soap_service": "abap_soap_services",
+}
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE/ILIKE wildcards so user input matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_search_sql(schema: str, entity_types: Optional[Sequence[str]] = None) -> str:
+    """
+    Render the ranked search query.
+    
+    Params: :q (search text), :pattern (escaped ILIKE pattern), :limit and,
+    when entity_types is given, :entity_types.
+    
+    Hits match the tsvector, contain the text in their name, or are close
+    to it by trigram word similarity. Rank favours exact names, then the
+    better of full-text rank and name similarity.
+    """
+    type_filter = "\n          AND s.entity_type = ANY(:entity_types)" if entity_types else ""
+    return f"""
+        SELECT
+            s.entity_type,
+            s.entity_id,
+            s.name,
+            s.detail,
+            round((
+                (lower(s.name) = lower(:q))::int
+                + GREATEST(ts_rank(s.document, tsq.query), word_similarity(:q, s.name))
+            )::numeric, 4) AS rank
+        FROM {schema}.{SEARCH_VIEW} s,
+             websearch_to_tsquery('simple', :q) AS tsq(query)
+        WHERE (s.document @@ tsq.query
+               OR s.name ILIKE :pattern
+               OR :q <% s.name){type_filter}
+        ORDER BY rank DESC, s.name
+        LIMIT :limit
+    """
+
+
+def parse_entity_types(value: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated entity type filter.
+    
+    Raises:
+        ValueError: If a type is unknown
+    """
+    if not value:
+        return []
+    types = [t.strip() for t in value.split(",") if t.strip()]
+    unknown = [t for t in types if t not in ENTITY_TABLES]
+    if unknown:
+        raise ValueError(
+            f"Unknown entity type(s) {', '.join(unknown)}. "
+            f"Available: {', '.join(ENTITY_TABLES)}"
+        )
+    return types
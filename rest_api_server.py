@@ -3,23 +3,139 @@ REST API Server for Integration Platform
 FastAPI application that exposes all integration platform endpoints backed by PostgreSQL.
 """
 
-from fastapi import FastAPI, Depends, HTTPException, Path
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from fastapi import FastAPI, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from typing import List, Dict, Any
-from postgres_server.database import get_db, get_schema_prefix
+from sqlalchemy import exc, text
+from typing import List, Dict, Any, Callable, Optional
+from postgres_server.config import config
+from postgres_server.database import engine, get_read_db, get_schema_prefix, replica_router
+from rest_api.compression import Compressor, CompressionMiddleware
+from rest_api.config import rest_config
+from rest_api.health import ReadinessProbe
+from rest_api.http_cache import make_etag, etag_matches
+from rest_api.json_diff import diff as json_diff
+from rest_api.matviews import MatviewRefresher, get_refreshed_at
+from rest_api.metrics import (
+    POOL_TIMEOUTS, POOL_WAITS, MetricsMiddleware, register_collector, render_metrics, timed
+)
+from rest_api.notify_listener import NotifyListener
+from rest_api.response_cache import ResponseCache, CachedResponse
+from rest_api.route_queries import ROUTE_QUERIES, BATCH_KEY
+from rest_api.search import SEARCH_VIEW, build_search_sql, escape_like, parse_entity_types
+import json
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Server-side response cache (None when disabled)
+response_cache = None
+if rest_config.response_cache_enabled:
+    response_cache = ResponseCache(
+        max_entries=rest_config.response_cache_max_entries,
+        ttl=rest_config.response_cache_ttl
+    )
+
+# Response compression (None when disabled)
+compressor = None
+if rest_config.compression_enabled:
+    compressor = Compressor(
+        encodings=rest_config.compression_encodings,
+        minimum_size=rest_config.compression_min_size,
+        gzip_level=rest_config.compression_gzip_level,
+        brotli_quality=rest_config.compression_brotli_quality,
+        zstd_level=rest_config.compression_zstd_level
+    )
+
+# Server-side cache for workflow version diffs
+diff_cache = ResponseCache(
+    max_entries=rest_config.diff_cache_max_entries,
+    ttl=rest_config.response_cache_ttl
+)
+
+# Database probe for /health, cached so frequent probes stay cheap
+readiness_probe = ReadinessProbe(engine, ttl=rest_config.readiness_cache_seconds)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background workers with the application."""
+    # Replica health checks run in the background from the start
+    replica_router.start()
+    
+    listener = None
+    if rest_config.notify_enabled:
+        listener = NotifyListener(config.get_connection_string(), rest_config.notify_channel)
+    
+    if response_cache is not None and listener is not None:
+        listener.add_callback(response_cache.invalidate_table)
+        listener.add_reconnect_callback(response_cache.clear)
+    if listener is not None:
+        listener.add_callback(diff_cache.invalidate_table)
+        listener.add_reconnect_callback(diff_cache.clear)
+    
+    # NOTIFY comes from the primary, but a miss right after a write may be
+    # refilled from a replica that has not replayed it yet. Invalidate again
+    # once any healthy replica must have caught up, so a stale refill lives
+    # no longer than an uncached replica read could be behind.
+    if listener is not None and replica_router.engines:
+        replica_delay = config.replica_max_lag_seconds + config.replica_check_interval
+        if response_cache is not None:
+            listener.add_delayed_callback(response_cache.invalidate_table, replica_delay)
+        listener.add_delayed_callback(diff_cache.invalidate_table, replica_delay)
+    
+    refresher = None
+    if rest_config.matviews_enabled:
+        refresher = MatviewRefresher(
+            engine,
+            interval=rest_config.matview_refresh_interval,
+            debounce=rest_config.matview_refresh_debounce,
+            notify_channel=rest_config.notify_channel if listener is not None else None
+        )
+        if listener is not None and rest_config.matview_refresh_on_change:
+            listener.add_callback(refresher.mark_stale)
+    elif rest_config.search_refresh_seconds > 0:
+        # /search needs its view refreshed even without the relationship views
+        refresher = MatviewRefresher(
+            engine,
+            interval=rest_config.search_refresh_seconds,
+            notify_channel=rest_config.notify_channel if listener is not None else None,
+            views=[SEARCH_VIEW]
+        )
+    else:
+        logger.warning(
+            f"{SEARCH_VIEW} is never refreshed (REST_MATVIEWS_ENABLED=false, REST_SEARCH_REFRESH_SECONDS=0); "
+            "/search results will go stale, see their X-Data-Refreshed-At header"
+        )
+    if refresher is not None:
+        refresher.start()
+    
+    if listener is not None and listener.has_callbacks():
+        listener.start()
+    
+    yield
+    
+    if refresher is not None:
+        refresher.stop()
+    if listener is not None:
+        listener.stop()
+    replica_router.stop()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Integration Platform API",
     description="REST API for integration platform with Azure, SAP BTP, and SAP ABAP endpoints",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -29,8 +145,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Data-Refreshed-At", "X-Data-Age", "Server-Timing", "X-Profile-Id"],
 )
 
+# Compress responses that routes did not already compress themselves
+if compressor is not None:
+    app.add_middleware(CompressionMiddleware, compressor=compressor)
+
+# Outermost: time every request and its phases for /metrics, Server-Timing
+# and the profiler
+profiling_enabled = rest_config.profile_header_enabled or rest_config.profile_sample_rate > 0
+if rest_config.metrics_enabled or rest_config.server_timing_enabled or profiling_enabled:
+    app.add_middleware(
+        MetricsMiddleware,
+        record_metrics=rest_config.metrics_enabled,
+        server_timing=rest_config.server_timing_enabled,
+        profile_header=rest_config.profile_header_enabled,
+        profile_sample_rate=rest_config.profile_sample_rate,
+        profile_dir=rest_config.profile_dir,
+        profile_interval=rest_config.profile_interval_ms / 1000,
+    )
+
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -47,17 +182,302 @@ def validate_schema(schema: str):
     return schema
 
 
+def database_error(e: Exception) -> HTTPException:
+    """Map a database exception to an HTTP error (504 when statement_timeout fired)."""
+    logger.error(f"Query execution error: {e}")
+    if getattr(getattr(e, "orig", None), "pgcode", None) == "57014":
+        return HTTPException(status_code=504, detail="Database query timed out")
+    return HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+def engine_label(bind) -> str:
+    """Metrics label of an engine: primary, or replicaN."""
+    if bind is engine:
+        return "primary"
+    return f"replica{replica_router.engines.index(bind)}"
+
+
+def checkout_connection(db: Session):
+    """
+    Check out the session's connection, timed as the "pool" phase.
+    
+    Counts checkouts that find the pool exhausted (no idle connection and no
+    overflow slot left), which wait for a connection to be returned, and
+    those that give up after the pool timeout.
+    """
+    with timed("pool"):
+        if db.in_transaction():
+            return
+        bind = db.get_bind()
+        pool = bind.pool
+        if 0 <= config.max_overflow <= pool.overflow() and pool.checkedin() == 0:
+            POOL_WAITS.inc(engine_label(bind))
+        try:
+            db.connection()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(engine_label(bind))
+            raise
+
+
 def execute_query(db: Session, query: str, params: Dict = None) -> List[Dict]:
     """Execute a SQL query and return results as list of dicts."""
     try:
-        result = db.execute(text(query), params or {})
+        checkout_connection(db)
+        with timed("sql"):
+            result = db.execute(text(query), params or {})
         if result.returns_rows:
-            columns = result.keys()
-            return [dict(zip(columns, row)) for row in result.fetchall()]
+            with timed("fetch"):
+                columns = result.keys()
+                return [dict(zip(columns, row)) for row in result.fetchall()]
         return []
     except Exception as e:
-        logger.error(f"Query execution error: {e}")
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+        raise database_error(e)
+
+
+def set_statement_timeout(db: Session, timeout_ms: int):
+    """Override statement_timeout for the rest of the current read transaction."""
+    execute_query(db, f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def parse_fields(
+    fields: Optional[str] = Query(None, description="Comma-separated list of columns to return")
+) -> Optional[List[str]]:
+    """Parse the ?fields= projection into a de-duplicated list of column names."""
+    if not fields:
+        return None
+    result = []
+    for field in fields.split(","):
+        field = field.strip()
+        if field and field not in result:
+            result.append(field)
+    return result or None
+
+
+def encode_json(data: Any) -> bytes:
+    """Serialize route data to compact UTF-8 JSON."""
+    with timed("encode"):
+        return json.dumps(
+            jsonable_encoder(data),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+def build_cached_response(data: Any, refreshed_at: Optional[datetime] = None) -> CachedResponse:
+    """Serialize data once and compute its ETag."""
+    body = encode_json(data)
+    return CachedResponse(data, body, make_etag(body), refreshed_at)
+
+
+def conditional_response(request: Request, entry: CachedResponse) -> Response:
+    """
+    Send a serialized entry, answering conditional GETs.
+    
+    Sends a strong ETag computed from the body and a Cache-Control header.
+    If the client's If-None-Match matches, returns 304 with no body.
+    Bodies are compressed when the client accepts it; the compressed body
+    is kept on the entry so cached responses are compressed only once.
+    """
+    encoding = None
+    if compressor is not None:
+        encoding = compressor.negotiate(request.headers.get("accept-encoding"), len(entry.body))
+    
+    # Each encoding is a different representation and gets its own ETag
+    etag = entry.etag if encoding is None else f'{entry.etag[:-1]}-{encoding}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": rest_config.get_cache_control(),
+    }
+    if compressor is not None:
+        headers["Vary"] = "Accept-Encoding"
+    
+    # Report how stale snapshot-backed data (materialized views) is
+    if entry.refreshed_at is not None:
+        refreshed_at = entry.refreshed_at
+        if refreshed_at.tzinfo is None:
+            refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+        age = max(0, int((datetime.now(timezone.utc) - refreshed_at).total_seconds()))
+        headers["X-Data-Refreshed-At"] = refreshed_at.isoformat()
+        headers["X-Data-Age"] = str(age)
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    if encoding is None:
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+    
+    headers["Content-Encoding"] = encoding
+    with timed("compress"):
+        body = compressor.encoded_body(entry, encoding)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def build_raw_cached_response(body: bytes) -> CachedResponse:
+    """Wrap JSON that the database already rendered, without parsing it."""
+    return CachedResponse(None, body, make_etag(body))
+
+
+def document_response(request: Request, db: Session, route: str, schema: str, params: Dict,
+                      tables: List[str], query: str, not_found: str) -> Response:
+    """
+    Serve a JSON document that Postgres builds in one statement.
+    
+    The query must return a single text column named document. It is sent
+    as-is, so Python does no per-row work.
+    """
+    def load():
+        try:
+            checkout_connection(db)
+            with timed("sql"):
+                row = db.execute(text(query), params).first()
+        except Exception as e:
+            raise database_error(e)
+        if row is None:
+            raise HTTPException(status_code=404, detail=not_found)
+        return build_raw_cached_response(row.document.encode("utf-8"))
+    
+    return cached_response(request, route, schema, params, load, tables=tables)
+
+
+def json_response(request: Request, data: Any) -> Response:
+    """Serialize data to JSON once and answer conditional GETs."""
+    return conditional_response(request, build_cached_response(data))
+
+
+def cached_response(
+    request: Request,
+    route: str,
+    schema: str,
+    params: Dict,
+    load: Callable[[], Any],
+    tables: Optional[List[str]] = None
+) -> Response:
+    """
+    Serve a route result from the server-side cache, loading it on a miss.
+    
+    Args:
+        request: Incoming request (for If-None-Match)
+        route: Route name, used as cache key and to look up its tables in ROUTE_QUERIES
+        schema: Validated schema name
+        params: Path params that identify the result
+        load: Callable that queries the database and returns the route data,
+            or an already built CachedResponse
+        tables: Tables the result depends on (defaults to the route's registry entry)
+    """
+    def build():
+        result = load()
+        if isinstance(result, CachedResponse):
+            return result
+        return build_cached_response(result)
+    
+    if response_cache is None:
+        return conditional_response(request, build())
+    
+    key = ResponseCache.make_key(route, schema, params)
+    entry = response_cache.get(key)
+    if entry is None:
+        tables = tables or ROUTE_QUERIES[route].tables
+        versions = response_cache.table_versions(schema, tables)
+        entry = response_cache.set(key, build(), schema, tables, versions)
+    
+    return conditional_response(request, entry)
+
+
+def load_route(db: Session, route: str, schema: str, params: Dict, fields: Optional[List[str]] = None) -> Any:
+    """Run a route's registered query and shape the result."""
+    route_query = ROUTE_QUERIES[route]
+    if route_query.timeout_ms:
+        set_statement_timeout(db, route_query.timeout_ms)
+    result = execute_query(db, route_query.build_sql(schema, fields), params)
+    
+    if route_query.single:
+        if not result:
+            raise HTTPException(status_code=404, detail=route_query.not_found.format(**params))
+        return result[0]
+    return result
+
+
+def route_response(
+    request: Request,
+    db: Session,
+    route: str,
+    schema: str,
+    params: Dict,
+    fields: Optional[List[str]] = None
+) -> Response:
+    """
+    Serve a registered route query through the response cache.
+    
+    When fields are given, only those columns are selected; unknown
+    fields are rejected with 400.
+    """
+    key_params = params
+    if fields:
+        try:
+            ROUTE_QUERIES[route].select_columns(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        key_params = {**params, "fields": ",".join(fields)}
+    
+    return cached_response(
+        request, route, schema, key_params,
+        lambda: load_route(db, route, schema, params, fields)
+    )
+
+
+def load_route_batch(db: Session, route: str, schema: str, ids: List[str]) -> Dict[str, Any]:
+    """
+    Run a route's registered query for many ids with a single = ANY(:ids) query.
+    
+    Returns:
+        Dict of id -> route result (a list, or an object/None for single-row routes)
+    """
+    route_query = ROUTE_QUERIES[route]
+    # One transaction may serve several routes: set each route's own timeout
+    set_statement_timeout(db, route_query.timeout_ms or config.read_statement_timeout_ms)
+    grouped = {i: [] for i in ids}
+    for row in execute_query(db, route_query.build_batch_sql(schema), {"ids": list(ids)}):
+        grouped.setdefault(str(row.pop(BATCH_KEY)), []).append(row)
+    
+    if route_query.single:
+        return {i: rows[0] if rows else None for i, rows in grouped.items()}
+    return grouped
+
+
+def cached_route_batch(db: Session, route: str, schema: str, ids: List[str]) -> Dict[str, Any]:
+    """
+    Resolve many ids for one route, serving what it can from the response cache.
+    
+    Only the ids that miss the cache go to the database, in one set-based
+    query; their results are cached per id for the single-lookup routes.
+    """
+    route_query = ROUTE_QUERIES[route]
+    results = {}
+    missing = []
+    for i in ids:
+        entry = None
+        if response_cache is not None:
+            entry = response_cache.get(ResponseCache.make_key(route, schema, {route_query.param: i}))
+        if entry is not None:
+            results[i] = entry.data
+        else:
+            missing.append(i)
+    
+    if missing:
+        versions = None
+        if response_cache is not None:
+            versions = response_cache.table_versions(schema, route_query.tables)
+        
+        for i, data in load_route_batch(db, route, schema, missing).items():
+            results[i] = data
+            if response_cache is not None and data is not None:
+                response_cache.set(
+                    ResponseCache.make_key(route, schema, {route_query.param: i}),
+                    build_cached_response(data), schema, route_query.tables, versions
+                )
+    
+    return {i: results[i] for i in ids}
 
 
 # ============================================================================
@@ -66,70 +486,41 @@ def execute_query(db: Session, query: str, params: Dict = None) -> List[Dict]:
 
 @app.get("/{schema}/properties")
 def get_properties(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves a list of all Properties from the database."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            p.id, 
-            pt.name as name, 
-            p.value, 
-            pt.kind as description, 
-            p.create_time as created_at, 
-            p.change_time as updated_at
-        FROM {schema}.properties p
-        LEFT JOIN {schema}.property_types pt ON p.type_id = pt.id
-        ORDER BY pt.name
-    """
-    
-    return execute_query(db, query)
+    return route_response(request, db, "get_properties", schema, {}, fields)
 
 
 @app.get("/{schema}/property_types")
 def get_property_types(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves a list of all available PropertyTypes."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            id, 
-            name as type_name, 
-            kind as description, 
-            create_time as created_at
-        FROM {schema}.property_types
-        ORDER BY name
-    """
-    
-    return execute_query(db, query)
+    return route_response(request, db, "get_property_types", schema, {}, fields)
 
 
 @app.get("/{schema}/metadata")
 def get_metadata(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves a list of all Metadata entries from the database."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            id, 
-            name as key, 
-            value, 
-            'system' as category, 
-            create_time as created_at, 
-            change_time as updated_at
-        FROM {schema}.metadata
-        ORDER BY name
-    """
-    
-    return execute_query(db, query)
+    return route_response(request, db, "get_metadata", schema, {}, fields)
 
 
 # ============================================================================
@@ -138,108 +529,100 @@ def get_metadata(
 
 @app.get("/{schema}/relationships/datasources_to_tenants")
 def get_datasources_to_tenants(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all DataSources and their associated AzureTenants relationships."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            d.id as datasource_id,
-            d.name as datasource_name,
-            d.datasource_type,
-            t.id as tenant_id,
-            t.tenant_name,
-            t.tenant_id_guid
-        FROM {schema}.datasources d
-        LEFT JOIN {schema}.datasource_tenant_mapping dtm ON d.id = dtm.datasource_id
-        LEFT JOIN {schema}.azure_tenants t ON dtm.tenant_id = t.id
-        ORDER BY d.name
-    """
+    if rest_config.matviews_enabled and not fields:
+        def load_from_view():
+            rows = execute_query(db, f"""
+                SELECT 
+                    datasource_id,
+                    datasource_name,
+                    datasource_type,
+                    tenant_id,
+                    tenant_name,
+                    tenant_id_guid
+                FROM {schema}.mv_datasources_to_tenants
+                ORDER BY datasource_name
+            """)
+            refreshed_at = get_refreshed_at(db, schema, "mv_datasources_to_tenants")
+            return build_cached_response(rows, refreshed_at)
+        
+        return cached_response(request, "get_datasources_to_tenants", schema, {}, load_from_view)
     
-    return execute_query(db, query)
+    return route_response(request, db, "get_datasources_to_tenants", schema, {}, fields)
 
 
 @app.get("/{schema}/systems/{system_id}/datasources")
 def get_system_datasources(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     system_id: str = Path(..., description="Unique identifier for the system"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all DataSources that belong to a specific System."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            d.id,
-            d.name,
-            d.datasource_type,
-            d.connection_string,
-            d.created_at,
-            d.updated_at
-        FROM {schema}.datasources d
-        WHERE d.system_id = :system_id
-        ORDER BY d.name
-    """
-    
-    return execute_query(db, query, {"system_id": system_id})
+    return route_response(request, db, "get_system_datasources", schema, {"system_id": system_id}, fields)
 
 
 @app.get("/{schema}/dataflows/{dataflow_id}/systems")
 def get_dataflow_systems(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     dataflow_id: str = Path(..., description="Unique identifier for the dataflow"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves the sender and receiver Systems for a specific DataFlow."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            df.id as dataflow_id,
-            df.name as dataflow_name,
-            sender.id as sender_system_id,
-            sender.name as sender_system_name,
-            sender.system_type as sender_system_type,
-            receiver.id as receiver_system_id,
-            receiver.name as receiver_system_name,
-            receiver.system_type as receiver_system_type
-        FROM {schema}.dataflows df
-        LEFT JOIN {schema}.systems sender ON df.sender_system_id = sender.id
-        LEFT JOIN {schema}.systems receiver ON df.receiver_system_id = receiver.id
-        WHERE df.id = :dataflow_id
-    """
+    params = {"dataflow_id": dataflow_id}
+    if not rest_config.matviews_enabled or fields:
+        return route_response(request, db, "get_dataflow_systems", schema, params, fields)
     
-    result = execute_query(db, query, {"dataflow_id": dataflow_id})
-    if not result:
-        raise HTTPException(status_code=404, detail=f"DataFlow '{dataflow_id}' not found")
-    return result[0]
+    def load():
+        result = execute_query(db, f"""
+            SELECT 
+                dataflow_id,
+                dataflow_name,
+                sender_system_id,
+                sender_system_name,
+                sender_system_type,
+                receiver_system_id,
+                receiver_system_name,
+                receiver_system_type
+            FROM {schema}.mv_dataflow_systems
+            WHERE dataflow_id = :dataflow_id
+        """, params)
+        if result:
+            refreshed_at = get_refreshed_at(db, schema, "mv_dataflow_systems")
+            return build_cached_response(result[0], refreshed_at)
+        
+        # Not in the view yet (created since the last refresh): use the live join
+        return load_route(db, "get_dataflow_systems", schema, params)
+    
+    return cached_response(request, "get_dataflow_systems", schema, params, load)
 
 
 @app.get("/{schema}/dataflows/{dataflow_id}/inventories")
 def get_dataflow_inventories(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     dataflow_id: str = Path(..., description="Unique identifier for the dataflow"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all technical interfaces (Inventories) that make up a specific DataFlow."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            i.id,
-            i.name,
-            i.interface_type,
-            i.endpoint_url,
-            i.created_at,
-            i.updated_at
-        FROM {schema}.inventories i
-        WHERE i.dataflow_id = :dataflow_id
-        ORDER BY i.name
-    """
-    
-    return execute_query(db, query, {"dataflow_id": dataflow_id})
+    return route_response(request, db, "get_dataflow_inventories", schema, {"dataflow_id": dataflow_id}, fields)
 
 
 # ============================================================================
@@ -248,149 +631,177 @@ def get_dataflow_inventories(
 
 @app.get("/{schema}/azure/tenants/{tenant_id}/subscriptions")
 def get_azure_tenant_subscriptions(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     tenant_id: str = Path(..., description="Unique identifier for the Azure tenant"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all Subscriptions within a specific AzureTenant."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            s.id,
-            s.subscription_name,
-            s.subscription_id_guid,
-            s.status,
-            s.created_at,
-            s.updated_at
-        FROM {schema}.azure_subscriptions s
-        WHERE s.tenant_id = :tenant_id
-        ORDER BY s.subscription_name
-    """
-    
-    return execute_query(db, query, {"tenant_id": tenant_id})
+    return route_response(request, db, "get_azure_tenant_subscriptions", schema, {"tenant_id": tenant_id}, fields)
 
 
 @app.get("/{schema}/azure/subscriptions/{subscription_id}/resource_groups")
 def get_azure_subscription_resource_groups(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     subscription_id: str = Path(..., description="Unique identifier for the Azure subscription"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all ResourceGroups within a specific AzureSubscription."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            rg.id,
-            rg.resource_group_name,
-            rg.location,
-            rg.created_at,
-            rg.updated_at
-        FROM {schema}.azure_resource_groups rg
-        WHERE rg.subscription_id = :subscription_id
-        ORDER BY rg.resource_group_name
-    """
-    
-    return execute_query(db, query, {"subscription_id": subscription_id})
+    return route_response(request, db, "get_azure_subscription_resource_groups", schema, {"subscription_id": subscription_id}, fields)
 
 
 @app.get("/{schema}/azure/api_management_services/{service_id}/apis")
 def get_azure_api_management_service_apis(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     service_id: str = Path(..., description="Unique identifier for the API Management service"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all APIs managed by a specific ApiManagementService."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            a.id,
-            a.api_name,
-            a.api_path,
-            a.api_version,
-            a.created_at,
-            a.updated_at
-        FROM {schema}.azure_api_management_apis a
-        WHERE a.service_id = :service_id
-        ORDER BY a.api_name
-    """
-    
-    return execute_query(db, query, {"service_id": service_id})
+    return route_response(request, db, "get_azure_api_management_service_apis", schema, {"service_id": service_id}, fields)
 
 
 @app.get("/{schema}/azure/api_management_apis/{api_id}/products")
 def get_azure_api_management_api_products(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     api_id: str = Path(..., description="Unique identifier for the API Management API"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all Products that a specific API is part of."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            p.id,
-            p.product_name,
-            p.description,
-            p.requires_subscription,
-            p.created_at,
-            p.updated_at
-        FROM {schema}.azure_api_management_products p
-        INNER JOIN {schema}.azure_api_product_mapping apm ON p.id = apm.product_id
-        WHERE apm.api_id = :api_id
-        ORDER BY p.product_name
-    """
-    
-    return execute_query(db, query, {"api_id": api_id})
+    return route_response(request, db, "get_azure_api_management_api_products", schema, {"api_id": api_id}, fields)
 
 
 @app.get("/{schema}/azure/standard_apps/{app_id}/workflows")
 def get_azure_standard_app_workflows(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     app_id: str = Path(..., description="Unique identifier for the Standard App"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all Workflows inside a specific StandardApp."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            w.id,
-            w.workflow_name,
-            w.state,
-            w.created_at,
-            w.updated_at
-        FROM {schema}.azure_logic_app_workflows w
-        WHERE w.standard_app_id = :app_id
-        ORDER BY w.workflow_name
-    """
-    
-    return execute_query(db, query, {"app_id": app_id})
+    return route_response(request, db, "get_azure_standard_app_workflows", schema, {"app_id": app_id}, fields)
 
 
 @app.get("/{schema}/azure/logic_app_workflows/{workflow_id}/versions")
 def get_azure_logic_app_workflow_versions(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     workflow_id: str = Path(..., description="Unique identifier for the Logic App workflow"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
-    """Retrieves all historical Versions of a specific LogicAppWorkflow."""
+    """
+    Retrieves all historical Versions of a specific LogicAppWorkflow.
+    
+    Returns metadata only by default; pass fields=...,definition for full
+    definitions, or use the definition and diff endpoints.
+    """
+    validate_schema(schema)
+    
+    return route_response(request, db, "get_azure_logic_app_workflow_versions", schema, {"workflow_id": workflow_id}, fields)
+
+
+@app.get("/{schema}/azure/logic_app_workflows/{workflow_id}/versions/diff")
+def get_azure_logic_app_workflow_version_diff(
+    request: Request,
+    schema: str = Path(..., description="Schema name: dev, prod, or test"),
+    workflow_id: str = Path(..., description="Unique identifier for the Logic App workflow"),
+    from_version: str = Query(..., alias="from", description="Version id to diff from"),
+    to_version: str = Query(..., alias="to", description="Version id to diff to"),
+    db: Session = Depends(get_read_db)
+):
+    """Returns a JSON Patch (RFC 6902) between the definitions of two Versions of a LogicAppWorkflow."""
+    validate_schema(schema)
+    
+    params = {"workflow_id": workflow_id, "from_version": from_version, "to_version": to_version}
+    tables = ["azure_logic_app_workflow_versions"]
+    
+    def load():
+        rows = execute_query(db, f"""
+            SELECT 
+                v.id,
+                v.version_number,
+                v.definition,
+                v.created_at
+            FROM {schema}.azure_logic_app_workflow_versions v
+            WHERE v.workflow_id = :workflow_id
+              AND v.id IN (:from_version, :to_version)
+        """, params)
+        versions = {row["id"]: row for row in rows}
+        for version_id in (from_version, to_version):
+            if version_id not in versions:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Version '{version_id}' not found for Logic App workflow '{workflow_id}'"
+                )
+        
+        def metadata(version_id):
+            return {k: v for k, v in versions[version_id].items() if k != "definition"}
+        
+        return build_cached_response({
+            "workflow_id": workflow_id,
+            "from": metadata(from_version),
+            "to": metadata(to_version),
+            "patch": json_diff(versions[from_version]["definition"], versions[to_version]["definition"]),
+        })
+    
+    key = ResponseCache.make_key("get_azure_logic_app_workflow_version_diff", schema, params)
+    entry = diff_cache.get(key)
+    if entry is None:
+        versions = diff_cache.table_versions(schema, tables)
+        entry = diff_cache.set(key, load(), schema, tables, versions)
+    
+    return conditional_response(request, entry)
+
+
+@app.get("/{schema}/azure/logic_app_workflows/{workflow_id}/versions/{version_id}/definition")
+def get_azure_logic_app_workflow_version_definition(
+    request: Request,
+    schema: str = Path(..., description="Schema name: dev, prod, or test"),
+    workflow_id: str = Path(..., description="Unique identifier for the Logic App workflow"),
+    version_id: str = Path(..., description="Unique identifier for the workflow version"),
+    db: Session = Depends(get_read_db)
+):
+    """Retrieves the full definition of one Version of a LogicAppWorkflow."""
     validate_schema(schema)
     
     query = f"""
-        SELECT 
-            v.id,
-            v.version_number,
-            v.definition,
-            v.created_at
+        SELECT json_build_object(
+            'id', v.id,
+            'workflow_id', v.workflow_id,
+            'version_number', v.version_number,
+            'created_at', v.created_at,
+            'definition', v.definition
+        )::text AS document
         FROM {schema}.azure_logic_app_workflow_versions v
         WHERE v.workflow_id = :workflow_id
-        ORDER BY v.created_at DESC
+          AND v.id = :version_id
     """
     
-    return execute_query(db, query, {"workflow_id": workflow_id})
+    return document_response(
+        request, db, "get_azure_logic_app_workflow_version_definition", schema,
+        {"workflow_id": workflow_id, "version_id": version_id},
+        tables=["azure_logic_app_workflow_versions"],
+        query=query,
+        not_found=f"Version '{version_id}' not found for Logic App workflow '{workflow_id}'"
+    )
 
 
 # ============================================================================
@@ -399,106 +810,58 @@ def get_azure_logic_app_workflow_versions(
 
 @app.get("/{schema}/btp/cloud_integration_packages/{package_id}/artefacts")
 def get_btp_cloud_integration_package_artefacts(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     package_id: str = Path(..., description="Unique identifier for the Cloud Integration package"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all integration Artefacts (like iFlows) within a Package."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            a.id,
-            a.artefact_name,
-            a.artefact_type,
-            a.version,
-            a.created_at,
-            a.updated_at
-        FROM {schema}.btp_cloud_integration_artefacts a
-        WHERE a.package_id = :package_id
-        ORDER BY a.artefact_name
-    """
-    
-    return execute_query(db, query, {"package_id": package_id})
+    return route_response(request, db, "get_btp_cloud_integration_package_artefacts", schema, {"package_id": package_id}, fields)
 
 
 @app.get("/{schema}/btp/cloud_integration_artefacts/{artefact_id}/runtime")
 def get_btp_cloud_integration_artefact_runtime(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     artefact_id: str = Path(..., description="Unique identifier for the Cloud Integration artefact"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Shows the runtime status and details for a specific deployed Artefact."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            r.id,
-            r.artefact_id,
-            a.artefact_name,
-            r.status,
-            r.deployment_status,
-            r.last_deployed_at,
-            r.error_message,
-            r.updated_at
-        FROM {schema}.btp_cloud_integration_artefact_runtime r
-        INNER JOIN {schema}.btp_cloud_integration_artefacts a ON r.artefact_id = a.id
-        WHERE r.artefact_id = :artefact_id
-    """
-    
-    result = execute_query(db, query, {"artefact_id": artefact_id})
-    if not result:
-        raise HTTPException(status_code=404, detail=f"Runtime info for artefact '{artefact_id}' not found")
-    return result[0]
+    return route_response(request, db, "get_btp_cloud_integration_artefact_runtime", schema, {"artefact_id": artefact_id}, fields)
 
 
 @app.get("/{schema}/btp/api_management_providers/{provider_id}/proxies")
 def get_btp_api_management_provider_proxies(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     provider_id: str = Path(..., description="Unique identifier for the API Management provider"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all API Proxies associated with a specific API Provider."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            p.id,
-            p.proxy_name,
-            p.proxy_endpoint,
-            p.created_at,
-            p.updated_at
-        FROM {schema}.btp_api_management_proxies p
-        WHERE p.provider_id = :provider_id
-        ORDER BY p.proxy_name
-    """
-    
-    return execute_query(db, query, {"provider_id": provider_id})
+    return route_response(request, db, "get_btp_api_management_provider_proxies", schema, {"provider_id": provider_id}, fields)
 
 
 @app.get("/{schema}/btp/api_management_proxies/{proxy_id}/products")
 def get_btp_api_management_proxy_products(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     proxy_id: str = Path(..., description="Unique identifier for the API Management proxy"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Lists which Products a specific API Proxy is included in."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            p.id,
-            p.product_name,
-            p.description,
-            p.created_at,
-            p.updated_at
-        FROM {schema}.btp_api_management_products p
-        INNER JOIN {schema}.btp_proxy_product_mapping ppm ON p.id = ppm.product_id
-        WHERE ppm.proxy_id = :proxy_id
-        ORDER BY p.product_name
-    """
-    
-    return execute_query(db, query, {"proxy_id": proxy_id})
+    return route_response(request, db, "get_btp_api_management_proxy_products", schema, {"proxy_id": proxy_id}, fields)
 
 
 # ============================================================================
@@ -507,83 +870,278 @@ def get_btp_api_management_proxy_products(
 
 @app.get("/{schema}/abap/datasources/{datasource_id}/partner_profiles")
 def get_abap_datasource_partner_profiles(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     datasource_id: str = Path(..., description="Unique identifier for the ABAP datasource"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all PartnerProfiles (e.g., iDoc partners) for a specific DataSource."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            pp.id,
-            pp.partner_number,
-            pp.partner_type,
-            pp.description,
-            pp.created_at,
-            pp.updated_at
-        FROM {schema}.abap_partner_profiles pp
-        WHERE pp.abap_datasource_id = :datasource_id
-        ORDER BY pp.partner_number
-    """
-    
-    return execute_query(db, query, {"datasource_id": datasource_id})
+    return route_response(request, db, "get_abap_datasource_partner_profiles", schema, {"datasource_id": datasource_id}, fields)
 
 
 @app.get("/{schema}/abap/ports/{port_id}/rfc_destinations")
 def get_abap_port_rfc_destinations(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     port_id: str = Path(..., description="Unique identifier for the ABAP port"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Shows the RfcDestinations (RFC destinations) associated with a specific AbapPort."""
     validate_schema(schema)
     
-    query = f"""
-        SELECT 
-            rd.id,
-            rd.destination_name,
-            rd.connection_type,
-            rd.target_host,
-            rd.created_at,
-            rd.updated_at
-        FROM {schema}.abap_rfc_destinations rd
-        WHERE rd.port_id = :port_id
-        ORDER BY rd.destination_name
-    """
-    
-    return execute_query(db, query, {"port_id": port_id})
+    return route_response(request, db, "get_abap_port_rfc_destinations", schema, {"port_id": port_id}, fields)
 
 
 @app.get("/{schema}/abap/soap_services/{service_id}/bindings")
 def get_abap_soap_service_bindings(
+    request: Request,
     schema: str = Path(..., description="Schema name: dev, prod, or test"),
     service_id: str = Path(..., description="Unique identifier for the ABAP SOAP service"),
-    db: Session = Depends(get_db)
+    fields: Optional[List[str]] = Depends(parse_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Retrieves all Bindings (endpoints) for a specific AbapSoapService."""
     validate_schema(schema)
     
+    return route_response(request, db, "get_abap_soap_service_bindings", schema, {"service_id": service_id}, fields)
+
+
+# ============================================================================
+# HIERARCHY ENDPOINTS
+# ============================================================================
+
+@app.get("/{schema}/azure/tenants/{tenant_id}/tree")
+def get_azure_tenant_tree(
+    request: Request,
+    schema: str = Path(..., description="Schema name: dev, prod, or test"),
+    tenant_id: str = Path(..., description="Unique identifier for the Azure tenant"),
+    db: Session = Depends(get_read_db)
+):
+    """Retrieves an AzureTenant with its Subscriptions and their ResourceGroups, nested."""
+    validate_schema(schema)
+    
+    query = f"""
+        SELECT json_build_object(
+            'id', t.id,
+            'tenant_name', t.tenant_name,
+            'tenant_id_guid', t.tenant_id_guid,
+            'created_at', t.created_at,
+            'updated_at', t.updated_at,
+            'subscriptions', COALESCE(subs.items, '[]'::json)
+        )::text AS document
+        FROM {schema}.azure_tenants t
+        LEFT JOIN LATERAL (
+            SELECT json_agg(json_build_object(
+                'id', s.id,
+                'subscription_name', s.subscription_name,
+                'subscription_id_guid', s.subscription_id_guid,
+                'status', s.status,
+                'created_at', s.created_at,
+                'updated_at', s.updated_at,
+                'resource_groups', COALESCE(rgs.items, '[]'::json)
+            ) ORDER BY s.subscription_name) AS items
+            FROM {schema}.azure_subscriptions s
+            LEFT JOIN LATERAL (
+                SELECT json_agg(json_build_object(
+                    'id', rg.id,
+                    'resource_group_name', rg.resource_group_name,
+                    'location', rg.location,
+                    'created_at', rg.created_at,
+                    'updated_at', rg.updated_at
+                ) ORDER BY rg.resource_group_name) AS items
+                FROM {schema}.azure_resource_groups rg
+                WHERE rg.subscription_id = s.id
+            ) rgs ON true
+            WHERE s.tenant_id = t.id
+        ) subs ON true
+        WHERE t.id = :tenant_id
+    """
+    
+    return document_response(
+        request, db, "get_azure_tenant_tree", schema, {"tenant_id": tenant_id},
+        tables=["azure_tenants", "azure_subscriptions", "azure_resource_groups"],
+        query=query,
+        not_found=f"AzureTenant '{tenant_id}' not found"
+    )
+
+
+@app.get("/{schema}/btp/cloud_integration_packages/{package_id}/tree")
+def get_btp_cloud_integration_package_tree(
+    request: Request,
+    schema: str = Path(..., description="Schema name: dev, prod, or test"),
+    package_id: str = Path(..., description="Unique identifier for the Cloud Integration package"),
+    db: Session = Depends(get_read_db)
+):
+    """Retrieves a Cloud Integration Package with its Artefacts and their runtime status, nested."""
+    validate_schema(schema)
+    
     query = f"""
-        SELECT 
-            b.id,
-            b.binding_name,
-            b.endpoint_url,
-            b.binding_type,
-            b.created_at,
-            b.updated_at
-        FROM {schema}.abap_soap_service_bindings b
-        WHERE b.service_id = :service_id
-        ORDER BY b.binding_name
+        SELECT json_build_object(
+            'id', p.id,
+            'package_name', p.package_name,
+            'description', p.description,
+            'version', p.version,
+            'created_at', p.created_at,
+            'updated_at', p.updated_at,
+            'artefacts', COALESCE(arts.items, '[]'::json)
+        )::text AS document
+        FROM {schema}.btp_cloud_integration_packages p
+        LEFT JOIN LATERAL (
+            SELECT json_agg(json_build_object(
+                'id', a.id,
+                'artefact_name', a.artefact_name,
+                'artefact_type', a.artefact_type,
+                'version', a.version,
+                'created_at', a.created_at,
+                'updated_at', a.updated_at,
+                'runtime', rt.item
+            ) ORDER BY a.artefact_name) AS items
+            FROM {schema}.btp_cloud_integration_artefacts a
+            LEFT JOIN LATERAL (
+                SELECT json_build_object(
+                    'id', r.id,
+                    'status', r.status,
+                    'deployment_status', r.deployment_status,
+                    'last_deployed_at', r.last_deployed_at,
+                    'error_message', r.error_message,
+                    'updated_at', r.updated_at
+                ) AS item
+                FROM {schema}.btp_cloud_integration_artefact_runtime r
+                WHERE r.artefact_id = a.id
+                ORDER BY r.updated_at DESC
+                LIMIT 1
+            ) rt ON true
+            WHERE a.package_id = p.id
+        ) arts ON true
+        WHERE p.id = :package_id
+    """
+    
+    return document_response(
+        request, db, "get_btp_cloud_integration_package_tree", schema, {"package_id": package_id},
+        tables=["btp_cloud_integration_packages", "btp_cloud_integration_artefacts", "btp_cloud_integration_artefact_runtime"],
+        query=query,
+        not_found=f"Cloud Integration package '{package_id}' not found"
+    )
+
+
+# ============================================================================
+# SEARCH ENDPOINT
+# ============================================================================
+
+@app.get("/{schema}/search")
+def search(
+    request: Request,
+    schema: str = Path(..., description="Schema name: dev, prod, or test"),
+    q: str = Query(..., min_length=2, max_length=200, description="Text to search for"),
+    types: Optional[str] = Query(None, description="Comma-separated entity types to search"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of hits"),
+    db: Session = Depends(get_read_db)
+):
+    """Searches systems, datasources, dataflows, Azure, BTP and ABAP entities by name, ranked by relevance."""
+    validate_schema(schema)
+    
+    q = q.strip()
+    try:
+        entity_types = parse_entity_types(types)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    params = {"q": q, "types": ",".join(entity_types), "limit": limit}
+    
+    def load():
+        view = execute_query(db, f"SELECT to_regclass('{schema}.{SEARCH_VIEW}') IS NOT NULL AS installed")
+        if not view[0]["installed"]:
+            raise HTTPException(
+                status_code=503,
+                detail="Search index is not installed. Run migrations/005_search_index.sql"
+            )
+        
+        query_params = {"q": q, "pattern": f"%{escape_like(q)}%", "limit": limit}
+        if entity_types:
+            query_params["entity_types"] = entity_types
+        hits = execute_query(db, build_search_sql(schema, entity_types), query_params)
+        for hit in hits:
+            hit["rank"] = float(hit["rank"])
+        return build_cached_response(hits, get_refreshed_at(db, schema, SEARCH_VIEW))
+    
+    return cached_response(request, "search", schema, params, load, tables=[SEARCH_VIEW])
+
+
+# ============================================================================
+# BATCH ENDPOINTS
+# ============================================================================
+
+class BatchLookup(BaseModel):
+    """A single route + id lookup."""
+    route: str
+    id: str
+
+
+class BatchRequest(BaseModel):
+    """Either many ids for one route, or a list of route + id lookups (or both)."""
+    route: Optional[str] = None
+    ids: List[str] = []
+    lookups: List[BatchLookup] = []
+
+
+@app.post("/{schema}/batch")
+def batch_lookups(
+    body: BatchRequest,
+    schema: str = Path(..., description="Schema name: dev, prod, or test"),
+    db: Session = Depends(get_read_db)
+):
     """
+    Resolves many relationship lookups in one request.
+    
+    Lookups are grouped by route and each route runs one set-based query,
+    so N lookups cost one round trip instead of N.
+    """
+    validate_schema(schema)
+    
+    groups: Dict[str, List[str]] = {}
+    if body.route:
+        groups.setdefault(body.route, []).extend(body.ids)
+    elif body.ids:
+        raise HTTPException(status_code=400, detail="'ids' requires 'route'")
+    for lookup in body.lookups:
+        groups.setdefault(lookup.route, []).append(lookup.id)
     
-    return execute_query(db, query, {"service_id": service_id})
+    batchable = sorted(name for name, q in ROUTE_QUERIES.items() if q.filter)
+    for route in groups:
+        if route not in batchable:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Route '{route}' cannot be batched. Must be one of: {', '.join(batchable)}"
+            )
+    
+    total = sum(len(ids) for ids in groups.values())
+    if total > rest_config.batch_max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many lookups ({total}). Maximum is {rest_config.batch_max_ids}"
+        )
+    
+    results = {}
+    for route, ids in groups.items():
+        unique_ids = list(dict.fromkeys(ids))
+        results[route] = cached_route_batch(db, route, schema, unique_ids)
+    
+    return {"results": results}
 
 
 # ============================================================================
 # HEALTH CHECK
 # ============================================================================
 
+def count_endpoints() -> int:
+    """Number of data endpoints (routes under /{schema}/)."""
+    return sum(isinstance(route, APIRoute) and route.path.startswith("/{schema}/") for route in app.routes)
+
+
 @app.get("/")
 def root():
     """Root endpoint with API information."""
@@ -591,20 +1149,81 @@ def root():
         "name": "Integration Platform API",
         "version": "1.0.0",
         "status": "running",
-        "endpoints": 20,
+        "endpoints": count_endpoints(),
         "documentation": "/docs"
     }
 
 
+@app.get("/health/live")
+def liveness_check():
+    """Liveness check: the process is serving requests. Does not touch the database."""
+    return {"status": "alive"}
+
+
 @app.get("/health")
-def health_check(db: Session = Depends(get_db)):
-    """Health check endpoint."""
-    try:
-        # Test database connection
-        db.execute(text("SELECT 1"))
-        return {"status": "healthy", "database": "connected"}
-    except Exception as e:
-        raise HTTPException(status_code=503, detail=f"Database connection failed: {str(e)}")
+def health_check():
+    """Readiness check: the database answers. The probe result is cached for a few seconds."""
+    result = readiness_probe.check()
+    if not result["ready"]:
+        raise HTTPException(status_code=503, detail=f"Database connection failed: {result['error']}")
+    return {"status": "healthy", "database": "connected"}
+
+
+def collect_pool_metrics():
+    """SQLAlchemy pool gauges for the primary and each replica."""
+    engines = [("primary", engine)] + [
+        (f"replica{i}", replica) for i, replica in enumerate(replica_router.engines)
+    ]
+    gauges = [
+        ("rest_db_pool_size", "Connections kept open by the pool.", "size"),
+        ("rest_db_pool_checked_out", "Connections currently checked out.", "checkedout"),
+        ("rest_db_pool_checked_in", "Idle connections in the pool.", "checkedin"),
+        ("rest_db_pool_overflow", "Connections open beyond pool_size (negative: unused slots).", "overflow"),
+    ]
+    for name, help, method in gauges:
+        yield name, "gauge", help, [({"engine": label}, getattr(e.pool, method)()) for label, e in engines]
+    
+    replicas = replica_router.stats()
+    if replicas:
+        yield "rest_db_replica_healthy", "gauge", "1 if the replica is in rotation.", [
+            ({"engine": f"replica{i}"}, int(r["healthy"])) for i, r in enumerate(replicas)
+        ]
+        yield "rest_db_replica_lag_seconds", "gauge", "Replay lag at the last health check.", [
+            ({"engine": f"replica{i}"}, r["lag"]) for i, r in enumerate(replicas) if r["lag"] is not None
+        ]
+
+
+def collect_cache_metrics():
+    """Hit/miss counters and sizes of the server-side caches."""
+    caches = [("diff", diff_cache)]
+    if response_cache is not None:
+        caches.insert(0, ("response", response_cache))
+    stats = [(label, cache.stats()) for label, cache in caches]
+    yield "rest_cache_hits_total", "counter", "Cache lookups that found a live entry.", [
+        ({"cache": label}, s["hits"]) for label, s in stats
+    ]
+    yield "rest_cache_misses_total", "counter", "Cache lookups that missed.", [
+        ({"cache": label}, s["misses"]) for label, s in stats
+    ]
+    yield "rest_cache_hit_ratio", "gauge", "Hits / lookups since start.", [
+        ({"cache": label}, s["hit_ratio"]) for label, s in stats
+    ]
+    yield "rest_cache_entries", "gauge", "Entries currently cached.", [
+        ({"cache": label}, s["entries"]) for label, s in stats
+    ]
+    yield "rest_cache_invalidations_total", "counter", "Entries evicted by table changes.", [
+        ({"cache": label}, s["invalidations"]) for label, s in stats
+    ]
+
+
+register_collector(collect_pool_metrics)
+register_collector(collect_cache_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics for this worker process."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 # Run with uvicorn
@@ -613,5 +1232,5 @@ if __name__ == "__main__":
     print("Starting Integration Platform REST API Server...")
     print("Server will run on http://localhost:3000")
     print("API Documentation: http://localhost:3000/docs")
-    print("Available endpoints: 20")
+    print(f"Available endpoints: {count_endpoints()}")
     uvicorn.run(app, host="0.0.0.0", port=3000)
@@ -0,0 +1,27 @@
+"""
+Shared fixtures for the unit tests.
+"""
+
+import pytest
+
+
+class FakeClock:
+    """Stands in for time.monotonic / time.time; advance() moves it forward."""
+    
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Patch time.monotonic and time.time with a clock the test controls."""
+    fake = FakeClock()
+    monkeypatch.setattr("time.monotonic", fake)
+    monkeypatch.setattr("time.time", fake)
+    return fake
@@ -0,0 +1,265 @@
+"""
+Tests for api_server/api_client.py, against httpx.MockTransport handlers.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+
+from api_server.api_client import APIClient
+from api_server.rate_limit import RateLimiter
+from api_server.resilience import CircuitBreaker
+from api_server.response_cache import ResponseCache
+
+
+def make_client(handler, **attributes) -> APIClient:
+    """An APIClient on a mock transport, with attributes overridden."""
+    client = APIClient()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.retries = 0
+    client.disk_cache = None
+    for name, value in attributes.items():
+        setattr(client, name, value)
+    return client
+
+
+def run(client: APIClient, coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await client.aclose()
+    return asyncio.run(main())
+
+
+def open_breaker(client: APIClient, group: str):
+    """Open the group's circuit after one failure."""
+    client.breaker.record_failure(group)
+    assert client.breaker.state(group) == "open"
+
+
+def test_get_returns_json():
+    client = make_client(lambda request: httpx.Response(200, json={"id": 1}))
+    result = run(client, client.get("/dev/properties"))
+    assert result["success"] is True
+    assert result["status_code"] == 200
+    assert result["data"] == {"id": 1}
+
+
+def test_http_error_returns_error_dict():
+    client = make_client(lambda request: httpx.Response(404, json={"detail": "Not found"}))
+    result = run(client, client.get("/dev/properties/missing"))
+    assert result["success"] is False
+    assert result["status_code"] == 404
+    assert result["error_detail"] == {"detail": "Not found"}
+
+
+def test_connect_error_returns_error_dict():
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+    
+    client = make_client(handler)
+    result = run(client, client.get("/dev/properties"))
+    assert result["success"] is False
+    assert result["error"] == "Connection Error"
+
+
+def test_invalid_url_returns_error_dict():
+    client = make_client(lambda request: httpx.Response(200, json={}))
+    result = run(client, client.get("/dev/azure/tenants/a\nb/subscriptions"))
+    assert result["success"] is False
+    assert result["error"] == "Request Error"
+
+
+def test_concurrent_gets_share_one_request():
+    calls = []
+    
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[{"id": 1}])
+    
+    client = make_client(handler, cache=ResponseCache(default_ttl=60))
+    
+    async def main():
+        results = await asyncio.gather(*(client.get("/dev/properties") for _ in range(5)))
+        return results + [await client.get("/dev/properties")]
+    
+    results = run(client, main())
+    assert calls == ["/dev/properties"]
+    assert sorted(r["cache"]["status"] for r in results) == ["coalesced"] * 4 + ["hit", "miss"]
+
+
+def test_expired_entry_is_revalidated():
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json={"id": 1}, headers={"ETag": '"v1"'})
+    
+    client = make_client(handler, cache=ResponseCache(default_ttl=60))
+    
+    async def main():
+        first = await client.get("/dev/properties")
+        key = client.cache.make_key("/dev/properties", None)
+        client.cache.get(key).stored_at -= 120
+        return first, await client.get("/dev/properties")
+    
+    first, second = run(client, main())
+    assert first["cache"]["status"] == "miss"
+    assert second["cache"]["status"] == "revalidated"
+    assert second["data"] == {"id": 1}
+    assert len(requests) == 2
+
+
+def test_get_retries_unavailable_responses():
+    statuses = iter([503, 502, 200])
+    client = make_client(lambda request: httpx.Response(next(statuses), json={}), cache=None)
+    client.retries = 2
+    result = run(client, client.get("/dev/properties"))
+    assert result["status_code"] == 200
+
+
+def test_breaker_fails_fast_once_open():
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503, json={})
+    
+    client = make_client(handler, cache=None, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    
+    async def main():
+        return [await client.get("/dev/properties") for _ in range(3)]
+    
+    results = run(client, main())
+    assert [r.get("status_code") for r in results[:2]] == [503, 503]
+    assert results[2]["error"] == "Circuit Open"
+    assert len(calls) == 2
+
+
+def test_breaker_is_per_schema_and_route():
+    def handler(request):
+        if request.url.path.startswith("/dev/"):
+            return httpx.Response(503, json={})
+        return httpx.Response(200, json={})
+    
+    client = make_client(handler, cache=None, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+    
+    async def main():
+        await client.get("/dev/azure/api_management_apis/a1/products")
+        return (
+            await client.get("/dev/azure/api_management_apis/a2/products"),
+            await client.get("/prod/azure/api_management_apis/a1/products"),
+            await client.get("/dev/btp/api_management_proxies/p1/products"),
+        )
+    
+    same_route, other_schema, other_product = run(client, main())
+    assert same_route["error"] == "Circuit Open"
+    assert other_schema["success"]
+    assert other_product["status_code"] == 503
+
+
+def test_rate_limited_trial_frees_the_breaker():
+    gate = asyncio.Event()
+    
+    async def handler(request):
+        if "slow" in request.url.path:
+            await gate.wait()
+        return httpx.Response(200, json={})
+    
+    client = make_client(
+        handler,
+        cache=None,
+        breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05),
+        rate_limiter=RateLimiter(max_in_flight=1),
+        queue_timeout=0.05
+    )
+    
+    async def main():
+        open_breaker(client, "dev/properties")
+        await asyncio.sleep(0.06)
+        slow = asyncio.ensure_future(client.get("/dev/slow"))
+        await asyncio.sleep(0.01)
+        
+        # The trial waits for the in-flight slot held by the slow call
+        limited = await client.get("/dev/properties")
+        gate.set()
+        await slow
+        return limited, await client.get("/dev/properties")
+    
+    limited, after = run(client, main())
+    assert limited["error"] == "Rate Limited"
+    assert after["success"]
+
+
+def test_cancelled_trial_frees_the_breaker():
+    async def handler(request):
+        if request.headers.get("X-Hang"):
+            await asyncio.sleep(10)
+        return httpx.Response(200, json={})
+    
+    client = make_client(handler, cache=None, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+    
+    async def main():
+        open_breaker(client, "dev/properties")
+        await asyncio.sleep(0.06)
+        trial = asyncio.ensure_future(client._make_request("GET", "/dev/properties", headers={"X-Hang": "1"}))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+        return await client.get("/dev/properties")
+    
+    assert run(client, main())["success"]
+
+
+def test_get_many_returns_results_by_key():
+    client = make_client(lambda request: httpx.Response(200, json={"path": request.url.path}), cache=None)
+    results = run(client, client.get_many({"a": "/dev/x/1", "b": "/dev/x/2"}))
+    assert {key: result["data"] for key, result in results.items()} == {
+        "a": {"path": "/dev/x/1"},
+        "b": {"path": "/dev/x/2"},
+    }
+
+
+def test_get_many_reports_exceptions_per_id():
+    def handler(request):
+        if request.url.path.endswith("bad"):
+            raise RuntimeError("boom")
+        return httpx.Response(200, json={"ok": True})
+    
+    client = make_client(handler, cache=None)
+    results = run(client, client.get_many({"a": "/dev/x/good", "b": "/dev/x/bad"}))
+    assert results["a"]["data"] == {"ok": True}
+    assert results["b"] == {"success": False, "error": "Request Error", "error_detail": "boom"}
+
+
+def test_failed_in_process_start_is_retried():
+    starts = []
+    
+    @asynccontextmanager
+    async def lifespan(app):
+        starts.append(app)
+        if len(starts) == 1:
+            raise RuntimeError("database unavailable")
+        yield
+    
+    class Router:
+        lifespan_context = staticmethod(lifespan)
+    
+    class App:
+        router = Router()
+    
+    client = make_client(lambda request: httpx.Response(200, json={}), cache=None, app=App())
+    
+    async def main():
+        return await client.get("/dev/properties"), await client.get("/dev/properties")
+    
+    failed, succeeded = run(client, main())
+    assert failed["error"] == "Startup Error"
+    assert succeeded["success"]
+    assert len(starts) == 2
+    assert client._app_lifespan is None
@@ -0,0 +1,135 @@
+"""
+Tests for api_server/disk_cache.py.
+"""
+
+import sqlite3
+
+import pytest
+
+from api_server import disk_cache
+from api_server.disk_cache import DiskCache
+from api_server.response_cache import CacheEntry
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+
+def entry(data, ttl: float = 60, **kwargs) -> CacheEntry:
+    return CacheEntry(200, data, 100, ttl, **kwargs)
+
+
+def body_bytes(cache: DiskCache) -> int:
+    return cache._conn.execute("SELECT coalesce(sum(length(body)), 0) FROM entries").fetchone()[0]
+
+
+def test_round_trip(path):
+    cache = DiskCache(path)
+    stored = entry({"id": 1, "name": "ä"}, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    cache.set(("/dev/properties", ()), stored)
+    
+    loaded = cache.get(("/dev/properties", ()))
+    assert loaded.data == {"id": 1, "name": "ä"}
+    assert loaded.etag == '"v1"'
+    assert loaded.last_modified == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert loaded.stored_at == stored.stored_at
+    assert cache.get(("/dev/missing", ())) is None
+
+
+def test_entries_survive_reopening(path):
+    DiskCache(path).set(("k",), entry([1, 2, 3]))
+    assert DiskCache(path).get(("k",)).data == [1, 2, 3]
+
+
+def test_namespaces_are_separate(path):
+    a = DiskCache(path, namespace="http://a")
+    b = DiskCache(path, namespace="http://b")
+    a.set(("k",), entry("a"))
+    assert b.get(("k",)) is None
+    
+    b.set(("k",), entry("b"))
+    a.clear()
+    assert a.get(("k",)) is None
+    assert b.get(("k",)).data == "b"
+
+
+def test_running_total_matches_bodies(path):
+    cache = DiskCache(path)
+    for i in range(10):
+        cache.set(("k", i), entry({"value": "x" * i * 10}))
+    cache.set(("k", 3), entry({"value": "replaced"}))
+    cache.delete(("k", 5))
+    
+    assert cache.stats()["entries"] == 9
+    assert cache.stats()["bytes"] == body_bytes(cache)
+
+
+def test_evicts_least_recently_used_below_cap(path, clock, monkeypatch):
+    monkeypatch.setattr(disk_cache, "ACCESS_UPDATE_INTERVAL", 0)
+    cache = DiskCache(path, max_bytes=10 ** 9)
+    for i in range(10):
+        cache.set(("k", i), entry({"i": i, "pad": "x" * 200}))
+        clock.advance(1)
+    size = body_bytes(cache) // 10
+    
+    # Reading k0 makes it the most recently used
+    cache.get(("k", 0))
+    clock.advance(1)
+    cache.max_bytes = size * 10
+    cache.set(("k", 10), entry({"i": 10, "pad": "x" * 200}))
+    
+    assert cache.get(("k", 0)) is not None
+    assert cache.get(("k", 1)) is None
+    assert cache.get(("k", 10)) is not None
+    assert body_bytes(cache) <= cache.max_bytes * disk_cache.EVICT_TO
+    assert cache.stats()["bytes"] == body_bytes(cache)
+
+
+def test_purges_expired_entries_without_validators(path, clock):
+    cache = DiskCache(path, stale_ttl=30)
+    cache.set(("plain",), entry(1, ttl=60))
+    cache.set(("validated",), entry(2, ttl=60, etag='"v"'))
+    clock.advance(100)
+    cache.set(("new",), entry(3))
+    
+    assert cache.get(("plain",)) is None
+    assert cache.get(("validated",)) is not None
+
+
+def test_reads_update_access_time_at_most_once_per_interval(path, clock):
+    cache = DiskCache(path)
+    cache.set(("k",), entry(1))
+    
+    def accessed_at():
+        return cache._conn.execute("SELECT accessed_at FROM entries").fetchone()[0]
+    
+    stored = accessed_at()
+    clock.advance(disk_cache.ACCESS_UPDATE_INTERVAL - 1)
+    cache.get(("k",))
+    assert accessed_at() == stored
+    
+    clock.advance(1)
+    cache.get(("k",))
+    assert accessed_at() == clock.now
+
+
+def test_unreadable_entry_is_dropped(path):
+    cache = DiskCache(path)
+    cache.set(("k",), entry(1))
+    cache._conn.execute("UPDATE entries SET body = x'00'")
+    assert cache.get(("k",)) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_old_layout_is_recreated(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, body BLOB)")
+    conn.execute("INSERT INTO entries VALUES ('k', x'00')")
+    conn.commit()
+    conn.close()
+    
+    cache = DiskCache(path)
+    assert cache.stats()["entries"] == 0
+    cache.set(("k",), entry(1))
+    assert cache.get(("k",)).data == 1
@@ -0,0 +1,31 @@
+"""
+Tests for rest_api/http_cache.py and the ?fields= parser in rest_api_server.py.
+"""
+
+from rest_api.http_cache import etag_matches, make_etag
+from rest_api_server import parse_fields
+
+
+def test_etag_is_strong_and_stable():
+    etag = make_etag(b'{"a":1}')
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(b'{"a":1}')
+    assert etag != make_etag(b'{"a":2}')
+
+
+def test_if_none_match():
+    etag = make_etag(b"body")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields("") is None
+    assert parse_fields(" , ,") is None
+    assert parse_fields("id, name,id,,type") == ["id", "name", "type"]
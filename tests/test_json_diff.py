@@ -0,0 +1,68 @@
+"""
+Tests for rest_api/json_diff.py.
+"""
+
+import copy
+
+from rest_api.json_diff import diff
+
+
+def apply(document, ops):
+    """Minimal RFC 6902 add/remove/replace, enough to check diff() output."""
+    document = copy.deepcopy(document)
+    for op in ops:
+        tokens = [t.replace("~1", "/").replace("~0", "~") for t in op["path"].split("/")[1:]]
+        if not tokens:
+            document = op["value"]
+            continue
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token) if isinstance(parent, list) else token]
+        last = int(tokens[-1]) if isinstance(parent, list) else tokens[-1]
+        if op["op"] == "remove":
+            del parent[last]
+        elif op["op"] == "add" and isinstance(parent, list):
+            parent.insert(last, op["value"])
+        else:
+            parent[last] = op["value"]
+    return document
+
+
+def test_equal_documents_have_no_ops():
+    assert diff({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}) == []
+
+
+def test_object_keys():
+    ops = diff({"keep": 1, "gone": 2, "changed": 3}, {"keep": 1, "changed": 4, "new": 5})
+    assert ops == [
+        {"op": "remove", "path": "/gone"},
+        {"op": "replace", "path": "/changed", "value": 4},
+        {"op": "add", "path": "/new", "value": 5},
+    ]
+
+
+def test_arrays_shrink_from_the_end():
+    ops = diff([1, 2, 3, 4], [1, 9])
+    assert ops == [
+        {"op": "replace", "path": "/1", "value": 9},
+        {"op": "remove", "path": "/3"},
+        {"op": "remove", "path": "/2"},
+    ]
+
+
+def test_keys_are_escaped():
+    assert diff({}, {"a/b~c": 1}) == [{"op": "add", "path": "/a~1b~0c", "value": 1}]
+
+
+def test_bool_and_int_differ():
+    assert diff({"x": 1}, {"x": True}) == [{"op": "replace", "path": "/x", "value": True}]
+
+
+def test_root_replacement():
+    assert diff([1], {"a": 1}) == [{"op": "replace", "path": "", "value": {"a": 1}}]
+
+
+def test_patch_turns_old_into_new():
+    old = {"actions": {"a/1": {"inputs": [1, 2, 3]}, "b": {"type": "Http"}}, "version": 1}
+    new = {"actions": {"a/1": {"inputs": [1, 5]}, "c": {"type": "Compose"}}, "version": 2, "tags": ["x"]}
+    assert apply(old, diff(old, new)) == new
@@ -0,0 +1,120 @@
+"""
+Tests for api_server/landscape.py.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from api_server.landscape import crawl
+
+SUBSCRIPTIONS = "/dev/azure/tenants/{}/subscriptions"
+RESOURCE_GROUPS = "/dev/azure/subscriptions/{}/resource_groups"
+
+
+class FakeClient:
+    """
+    Answers get() from a dict of endpoint -> rows (an int is an error status,
+    an exception is raised) and records the calls.
+    """
+    
+    def __init__(self, responses: Dict[str, Any]):
+        self.responses = responses
+        self.calls: List[str] = []
+    
+    async def get(self, endpoint: str) -> Dict[str, Any]:
+        self.calls.append(endpoint)
+        await asyncio.sleep(0)
+        response = self.responses.get(endpoint)
+        if isinstance(response, Exception):
+            raise response
+        if response is None:
+            return {"success": False, "status_code": 404, "error": "Not Found"}
+        if isinstance(response, int):
+            return {"success": False, "status_code": response, "error": "Server Error"}
+        return {"success": True, "status_code": 200, "data": response}
+
+
+def run(client: FakeClient, depth: int = 2, **kwargs) -> Dict[str, Any]:
+    return asyncio.run(asyncio.wait_for(crawl(client, "dev", "azure_tenant", "t1", depth, **kwargs), 5))
+
+
+def tenant_tree() -> FakeClient:
+    return FakeClient({
+        SUBSCRIPTIONS.format("t1"): [{"id": "s1"}, {"id": "s2"}],
+        RESOURCE_GROUPS.format("s1"): [{"id": "rg1"}, {"id": "rg2"}],
+        RESOURCE_GROUPS.format("s2"): [{"id": "rg3"}],
+    })
+
+
+def test_crawls_to_depth():
+    graph = run(tenant_tree(), depth=2)
+    assert set(graph["nodes"]) == {
+        "azure_tenant:t1",
+        "azure_subscription:s1", "azure_subscription:s2",
+        "azure_resource_group:rg1", "azure_resource_group:rg2", "azure_resource_group:rg3",
+    }
+    assert graph["nodes"]["azure_resource_group:rg3"]["depth"] == 2
+    assert {"from": "azure_subscription:s2", "to": "azure_resource_group:rg3",
+            "relation": "resource_groups"} in graph["edges"]
+    assert graph["errors"] == {} and not graph["truncated"]
+
+
+def test_depth_limits_requests():
+    client = tenant_tree()
+    graph = run(client, depth=1)
+    assert client.calls == [SUBSCRIPTIONS.format("t1")]
+    assert len(graph["nodes"]) == 3
+    
+    client = tenant_tree()
+    assert len(run(client, depth=0)["nodes"]) == 1
+    assert client.calls == []
+
+
+def test_shared_children_are_expanded_once():
+    client = FakeClient({
+        SUBSCRIPTIONS.format("t1"): [{"id": "s1"}, {"id": "s2"}],
+        RESOURCE_GROUPS.format("s1"): [{"id": "rg1"}],
+        RESOURCE_GROUPS.format("s2"): [{"id": "rg1"}],
+    })
+    graph = run(client, depth=2)
+    assert len(client.calls) == len(set(client.calls)) == 3
+    assert sum(edge["to"] == "azure_resource_group:rg1" for edge in graph["edges"]) == 2
+
+
+def test_max_nodes_truncates_without_dangling_edges():
+    client = FakeClient({SUBSCRIPTIONS.format("t1"): [{"id": f"s{i}"} for i in range(10)]})
+    graph = run(client, depth=1, max_nodes=4)
+    assert len(graph["nodes"]) == 4
+    assert graph["truncated"]
+    assert all(edge["to"] in graph["nodes"] for edge in graph["edges"])
+
+
+def test_errors_are_recorded_per_node():
+    client = FakeClient({
+        SUBSCRIPTIONS.format("t1"): [{"id": "s1"}, {"id": "s2"}, {"id": "s3"}],
+        RESOURCE_GROUPS.format("s1"): 500,
+        RESOURCE_GROUPS.format("s3"): [{"id": "rg1"}],
+    })
+    graph = run(client, depth=2)
+    
+    # A 404 (s2) means nothing to link, not an error
+    assert graph["errors"] == {"azure_subscription:s1": {"status_code": 500, "error": "Server Error"}}
+    assert "azure_resource_group:rg1" in graph["nodes"]
+
+
+def test_exceptions_do_not_stop_the_crawl():
+    client = FakeClient({
+        SUBSCRIPTIONS.format("t1"): [{"id": "s1"}, {"id": "s2"}],
+        RESOURCE_GROUPS.format("s1"): RuntimeError("boom"),
+        RESOURCE_GROUPS.format("s2"): [{"id": "rg1"}],
+    })
+    graph = run(client, depth=2, workers=1)
+    assert graph["errors"] == {"azure_subscription:s1": {"error": "RuntimeError", "error_detail": "boom"}}
+    assert "azure_resource_group:rg1" in graph["nodes"]
+
+
+def test_rows_without_id_are_skipped():
+    client = FakeClient({SUBSCRIPTIONS.format("t1"): {"text": "not json"}})
+    graph = run(client, depth=1)
+    assert list(graph["nodes"]) == ["azure_tenant:t1"]
+    assert graph["edges"] == []
@@ -0,0 +1,18 @@
+"""
+Tests for rest_api/matviews.py.
+"""
+
+from rest_api.matviews import MatviewRefresher
+
+
+def test_refresher_tracks_only_its_views():
+    refresher = MatviewRefresher(engine=None, views=["mv_search"])
+    refresher.mark_stale("dev", "systems")
+    refresher.mark_stale("dev", "azure_tenants")
+    assert list(refresher._dirty) == [("dev", "mv_search")]
+
+
+def test_refresher_tracks_every_view_by_default():
+    refresher = MatviewRefresher(engine=None)
+    refresher.mark_stale("dev", "systems")
+    assert sorted(view for _, view in refresher._dirty) == ["mv_dataflow_systems", "mv_search"]
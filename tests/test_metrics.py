@@ -0,0 +1,48 @@
+"""
+Tests for rest_api/metrics.py and the pool checkout counters in rest_api_server.py.
+"""
+
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+import rest_api_server
+from rest_api.metrics import POOL_TIMEOUTS, POOL_WAITS, Counter
+
+
+def test_counter_renders_labelled_series():
+    counter = Counter("jobs_total", "Jobs done.", ("queue",))
+    counter.inc("b")
+    counter.inc("a", amount=2)
+    counter.inc("b")
+    assert counter.render([("pid", "1")]) == [
+        "# HELP jobs_total Jobs done.",
+        "# TYPE jobs_total counter",
+        'jobs_total{pid="1",queue="a"} 2',
+        'jobs_total{pid="1",queue="b"} 2',
+    ]
+
+
+def test_exhausted_pool_counts_a_wait_and_a_timeout(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    monkeypatch.setattr(rest_api_server, "engine", engine)
+    monkeypatch.setattr(rest_api_server.config, "max_overflow", 0)
+    waits, timeouts = POOL_WAITS.value("primary"), POOL_TIMEOUTS.value("primary")
+    
+    holder, waiter = Session(bind=engine), Session(bind=engine)
+    try:
+        rest_api_server.checkout_connection(holder)
+        rest_api_server.checkout_connection(holder)
+        assert POOL_WAITS.value("primary") == waits
+        
+        with pytest.raises(exc.TimeoutError):
+            rest_api_server.checkout_connection(waiter)
+        assert POOL_WAITS.value("primary") == waits + 1
+        assert POOL_TIMEOUTS.value("primary") == timeouts + 1
+    finally:
+        holder.close()
+        waiter.close()
+        engine.dispose()
@@ -0,0 +1,100 @@
+"""
+Tests for api_server/rate_limit.py.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from api_server.rate_limit import Limit, QueueTimeout, RateLimiter, TokenBucket
+
+
+def test_bucket_allows_burst_then_waits():
+    async def run():
+        bucket = TokenBucket(rate=50, burst=3)
+        deadline = time.monotonic() + 5
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire(deadline)
+        burst = time.monotonic() - start
+        
+        await bucket.acquire(deadline)
+        return burst, time.monotonic() - start
+    
+    burst, total = asyncio.run(run())
+    assert burst < 0.01
+    # The fourth token takes 1/50 s to refill
+    assert total >= 0.015
+
+
+def test_bucket_times_out_before_waiting_past_deadline():
+    async def run():
+        bucket = TokenBucket(rate=1, burst=1)
+        await bucket.acquire(time.monotonic() + 5)
+        start = time.monotonic()
+        with pytest.raises(QueueTimeout):
+            await bucket.acquire(time.monotonic() + 0.1)
+        return time.monotonic() - start
+    
+    # Fails at once instead of sleeping until the deadline
+    assert asyncio.run(run()) < 0.05
+
+
+def test_limit_defaults():
+    assert Limit().bucket is None
+    assert Limit().semaphore is None
+    assert Limit(rate=5).bucket.burst == 5
+    assert Limit(rate=0.5).bucket.burst == 1.0
+    assert Limit(rate=5, burst=20).bucket.burst == 20
+
+
+def test_prefixes_match_with_or_without_schema():
+    async def run():
+        limiter = RateLimiter(prefix_rates={"/azure/": 10}, prefix_max_in_flight={"/btp/": 2})
+        return (
+            limiter.limits_for("/dev/azure/tenants/t1/subscriptions"),
+            limiter.limits_for("/azure/tenants"),
+            limiter.limits_for("/dev/btp/api_management_proxies/p1/products"),
+            limiter.limits_for("/dev/properties"),
+        )
+    
+    azure, azure_bare, btp, other = asyncio.run(run())
+    assert len(azure) == 2 and azure[1].bucket.rate == 10
+    assert len(azure_bare) == 2
+    assert len(btp) == 2 and btp[1].max_in_flight == 2
+    assert len(other) == 1
+
+
+def test_in_flight_cap_queues_and_times_out():
+    async def run():
+        limiter = RateLimiter(max_in_flight=1)
+        taken = await limiter.acquire("/dev/properties", time.monotonic() + 1)
+        with pytest.raises(QueueTimeout):
+            await limiter.acquire("/dev/properties", time.monotonic() + 0.05)
+        
+        # Released slots are handed to waiting calls
+        waiter = asyncio.ensure_future(limiter.acquire("/dev/properties", time.monotonic() + 1))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        RateLimiter.release(taken)
+        RateLimiter.release(await waiter)
+    
+    asyncio.run(run())
+
+
+def test_failed_acquire_releases_slots_it_took():
+    async def run():
+        limiter = RateLimiter(max_in_flight=2, prefix_max_in_flight={"/azure/": 1})
+        held = await limiter.acquire("/dev/azure/tenants", time.monotonic() + 1)
+        
+        # Takes the second global slot, then times out on the prefix slot
+        with pytest.raises(QueueTimeout):
+            await limiter.acquire("/dev/azure/tenants", time.monotonic() + 0.05)
+        
+        # The global slot was given back: another call gets it at once
+        other = await limiter.acquire("/dev/properties", time.monotonic() + 0.05)
+        RateLimiter.release(other)
+        RateLimiter.release(held)
+    
+    asyncio.run(run())
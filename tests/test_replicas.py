@@ -0,0 +1,52 @@
+"""
+Tests for postgres_server/replicas.py, against fake engines.
+"""
+
+import logging
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from postgres_server.replicas import ReplicaRouter
+
+
+class FakeEngine:
+    """Answers the lag query with a fixed row."""
+    
+    def __init__(self, name: str, lag: float = 0, receiver_status="streaming", in_recovery: bool = True):
+        self.url = name
+        self.row = SimpleNamespace(in_recovery=in_recovery, receiver_status=receiver_status, lag=lag)
+    
+    @contextmanager
+    def connect(self):
+        yield SimpleNamespace(execute=lambda query: SimpleNamespace(one=lambda: self.row))
+
+
+def healthy(router: ReplicaRouter):
+    return [status["url"] for status in router.stats() if status["healthy"]]
+
+
+def test_replicas_within_lag_are_used():
+    router = ReplicaRouter([FakeEngine("a", lag=1), FakeEngine("b", lag=60)], max_lag=30)
+    router.check()
+    assert healthy(router) == ["'a'"]
+    assert router.choose().url == "a"
+
+
+def test_stopped_wal_receiver_is_dropped():
+    router = ReplicaRouter([FakeEngine("a", receiver_status=None), FakeEngine("b", receiver_status="stopping")])
+    router.check()
+    assert healthy(router) == []
+    assert router.choose() is None
+
+
+def test_unknown_receiver_status_falls_back_to_lag(caplog):
+    router = ReplicaRouter([FakeEngine("a", lag=1, receiver_status="unknown"),
+                            FakeEngine("b", lag=60, receiver_status="unknown")], max_lag=30)
+    with caplog.at_level(logging.ERROR):
+        router.check()
+        router.check()
+    
+    assert healthy(router) == ["'a'"]
+    errors = [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR]
+    assert len(errors) == 2
+    assert all("pg_monitor" in message for message in errors)
@@ -0,0 +1,130 @@
+"""
+Tests for api_server/resilience.py.
+"""
+
+from api_server.resilience import CircuitBreaker, LatencyTracker, backoff_delay, endpoint_group
+
+
+def test_endpoint_group_is_the_route_template():
+    assert endpoint_group("/dev/azure/tenants/t1/subscriptions") == "dev/azure/tenants/{id}/subscriptions"
+    assert endpoint_group("/dev/azure/tenants/t2/subscriptions") == "dev/azure/tenants/{id}/subscriptions"
+    assert endpoint_group("/dev/properties/") == "dev/properties"
+    assert endpoint_group("/dev/systems/s1/datasources") == "dev/systems/{id}/datasources"
+    assert endpoint_group("/dev/relationships/datasources_to_tenants") == "dev/relationships/datasources_to_tenants"
+    assert endpoint_group("/dev/azure/logic_app_workflows/w1/versions/v1/definition") == (
+        "dev/azure/logic_app_workflows/{id}/versions/{id}/definition"
+    )
+    assert endpoint_group("/dev/azure/logic_app_workflows/w1/versions/diff") == (
+        "dev/azure/logic_app_workflows/{id}/versions/diff"
+    )
+
+
+def test_endpoint_group_separates_schemas_and_products():
+    groups = {
+        endpoint_group("/dev/azure/api_management_apis/a1/products"),
+        endpoint_group("/prod/azure/api_management_apis/a1/products"),
+        endpoint_group("/dev/btp/api_management_proxies/p1/products"),
+    }
+    assert len(groups) == 3
+
+
+def test_backoff_delay_is_capped():
+    for attempt in range(10):
+        delay = backoff_delay(attempt, base=0.2, cap=1.0)
+        assert 0 <= delay <= min(1.0, 0.2 * 2 ** attempt)
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure("g")
+    assert breaker.allow("g")
+    
+    breaker.record_failure("g")
+    assert breaker.state("g") == "open"
+    assert not breaker.allow("g")
+    assert breaker.retry_after("g") == 30
+    
+    # Other groups are unaffected
+    assert breaker.allow("other")
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure("g")
+    breaker.record_success("g")
+    breaker.record_failure("g")
+    assert breaker.state("g") == "closed"
+
+
+def test_half_open_admits_one_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure("g")
+    clock.advance(30)
+    
+    assert breaker.state("g") == "half-open"
+    assert [breaker.allow("g") for _ in range(3)] == [True, False, False]
+
+
+def test_trial_success_closes_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure("g")
+    clock.advance(30)
+    assert breaker.allow("g")
+    
+    breaker.record_success("g")
+    assert breaker.state("g") == "closed"
+    assert breaker.stats() == {}
+
+
+def test_trial_failure_reopens_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure("g")
+    clock.advance(30)
+    assert breaker.allow("g")
+    
+    breaker.record_failure("g")
+    assert breaker.state("g") == "open"
+    assert breaker.stats() == {"g": "open"}
+
+
+def test_released_trial_admits_another(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure("g")
+    clock.advance(30)
+    assert breaker.allow("g")
+    
+    breaker.release("g")
+    assert breaker.allow("g")
+
+
+def test_unfinished_trial_expires(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure("g")
+    clock.advance(30)
+    assert breaker.allow("g")
+    assert not breaker.allow("g")
+    
+    clock.advance(30)
+    assert breaker.allow("g")
+
+
+def test_latency_threshold_needs_min_samples():
+    tracker = LatencyTracker(window=100, min_samples=20, quantile=0.95)
+    for i in range(19):
+        tracker.record("g", i / 100)
+    assert tracker.threshold("g") is None
+    
+    for i in range(19, 100):
+        tracker.record("g", i / 100)
+    assert tracker.threshold("g") == 0.95
+    assert tracker.threshold("other") is None
+
+
+def test_latency_window_drops_old_samples():
+    tracker = LatencyTracker(window=10, min_samples=1, quantile=0.5)
+    for _ in range(10):
+        tracker.record("g", 5.0)
+    for _ in range(10):
+        tracker.record("g", 0.1)
+    assert tracker.threshold("g") == 0.1
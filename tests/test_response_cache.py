@@ -0,0 +1,97 @@
+"""
+Tests for api_server/response_cache.py.
+"""
+
+from api_server.response_cache import CacheEntry, ResponseCache
+
+
+def entry(size: int = 10, ttl: float = 60, **kwargs) -> CacheEntry:
+    return CacheEntry(200, {"size": size}, size, ttl, **kwargs)
+
+
+def test_make_key_ignores_param_order():
+    assert ResponseCache.make_key("/a", {"x": 1, "y": 2}) == ResponseCache.make_key("/a", {"y": 2, "x": 1})
+    assert ResponseCache.make_key("/a") == ResponseCache.make_key("/a", {})
+
+
+def test_ttl_by_last_path_segment():
+    cache = ResponseCache(default_ttl=60, endpoint_ttls={"property_types": 3600, "runtime": 0})
+    assert cache.ttl_for("/dev/property_types") == 3600
+    assert cache.ttl_for("/dev/btp/cloud_integration_artefacts/a1/runtime/") == 0
+    assert cache.ttl_for("/dev/properties") == 60
+
+
+def test_fresh_entry_is_a_hit(clock):
+    cache = ResponseCache()
+    cache.set("k", entry())
+    assert cache.get("k").is_fresh()
+    assert cache.stats()["hits"] == 1
+
+
+def test_expired_entry_without_validator_is_dropped(clock):
+    cache = ResponseCache(stale_ttl=0)
+    cache.set("k", entry(ttl=60))
+    clock.advance(61)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_expired_entry_kept_for_stale_window(clock):
+    cache = ResponseCache(stale_ttl=30)
+    cache.set("k", entry(ttl=60))
+    clock.advance(80)
+    stale = cache.get("k")
+    assert stale is not None and not stale.is_fresh()
+    
+    clock.advance(20)
+    assert cache.get("k") is None
+
+
+def test_expired_entry_with_validator_is_kept_and_refreshed(clock):
+    cache = ResponseCache()
+    cache.set("k", entry(ttl=60, etag='"v1"'))
+    clock.advance(600)
+    expired = cache.get("k")
+    assert expired.conditional_headers() == {"If-None-Match": '"v1"'}
+    
+    cache.refresh(expired, etag='"v2"')
+    assert expired.is_fresh()
+    assert expired.etag == '"v2"'
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_lru_eviction_by_entry_count():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", entry())
+    cache.set("b", entry())
+    cache.get("a")
+    cache.set("c", entry())
+    
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_eviction_by_bytes():
+    cache = ResponseCache(max_bytes=100)
+    cache.set("a", entry(size=40))
+    cache.set("b", entry(size=40))
+    cache.set("c", entry(size=40))
+    
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 80
+
+
+def test_oversized_entry_is_not_cached():
+    cache = ResponseCache(max_bytes=100)
+    cache.set("a", entry(size=40))
+    cache.set("big", entry(size=101))
+    assert cache.get("big") is None
+    assert cache.get("a") is not None
+
+
+def test_replacing_an_entry_keeps_byte_count():
+    cache = ResponseCache()
+    cache.set("a", entry(size=40))
+    cache.set("a", entry(size=10))
+    assert cache.stats()["bytes"] == 10
@@ -0,0 +1,11 @@
+"""
+Tests for rest_api_server.py routes that need no database.
+"""
+
+from rest_api_server import app, root
+
+
+def test_root_counts_the_data_endpoints():
+    paths = {route.path for route in app.routes}
+    assert "/{schema}/search" in paths and "/{schema}/batch" in paths
+    assert root()["endpoints"] == sum(path.startswith("/{schema}/") for path in paths)
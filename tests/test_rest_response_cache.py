@@ -0,0 +1,89 @@
+"""
+Tests for rest_api/response_cache.py and rest_api/notify_listener.py.
+"""
+
+from rest_api.notify_listener import NotifyListener
+from rest_api.response_cache import CachedResponse, ResponseCache
+
+
+def cached(data) -> CachedResponse:
+    return CachedResponse(data, b"{}", '"etag"')
+
+
+def test_write_to_a_table_evicts_dependent_entries():
+    cache = ResponseCache()
+    key = ResponseCache.make_key("get_properties", "dev")
+    other = ResponseCache.make_key("get_metadata", "dev")
+    cache.set(key, cached(1), "dev", ["properties"])
+    cache.set(other, cached(2), "dev", ["metadata"])
+    
+    assert cache.invalidate_table("dev", "properties") == 1
+    assert cache.get(key) is None
+    assert cache.get(other) is not None
+    
+    # Same table name in another schema
+    assert cache.invalidate_table("prod", "metadata") == 0
+
+
+def test_result_loaded_across_a_write_is_not_cached():
+    cache = ResponseCache()
+    key = ResponseCache.make_key("get_properties", "dev")
+    versions = cache.table_versions("dev", ["properties"])
+    cache.invalidate_table("dev", "properties")
+    
+    cache.set(key, cached(1), "dev", ["properties"], versions)
+    assert cache.get(key) is None
+
+
+def test_result_loaded_across_a_clear_is_not_cached():
+    cache = ResponseCache()
+    key = ResponseCache.make_key("get_properties", "dev")
+    
+    # "properties" was never invalidated, so only the epoch records the clear
+    versions = cache.table_versions("dev", ["properties"])
+    cache.clear()
+    
+    cache.set(key, cached(1), "dev", ["properties"], versions)
+    assert cache.get(key) is None
+
+
+def test_ttl_and_lru(clock):
+    cache = ResponseCache(max_entries=2, ttl=60)
+    for name in ("a", "b", "c"):
+        cache.set(name, cached(name), "dev", ["t"])
+    assert cache.get("a") is None
+    
+    clock.advance(61)
+    assert cache.get("c") is None
+
+
+def test_delayed_callbacks_are_debounced_per_table(clock):
+    listener = NotifyListener("postgresql://unused", "table_changed", poll_interval=5)
+    now, later = [], []
+    listener.add_callback(lambda schema, table: now.append(table))
+    listener.add_delayed_callback(lambda schema, table: later.append(table), 30)
+    
+    listener._dispatch("dev.properties")
+    clock.advance(20)
+    listener._dispatch("dev.properties")
+    listener._dispatch("dev.metadata")
+    assert now == ["properties", "properties", "metadata"]
+    assert listener._wait_time() == 5
+    
+    clock.advance(29)
+    assert listener._wait_time() == 1
+    listener._run_due()
+    assert later == []
+    
+    clock.advance(1)
+    listener._run_due()
+    assert sorted(later) == ["metadata", "properties"]
+    assert listener._wait_time() == 5
+
+
+def test_malformed_payload_is_ignored():
+    listener = NotifyListener("postgresql://unused", "table_changed")
+    calls = []
+    listener.add_callback(lambda schema, table: calls.append((schema, table)))
+    listener._dispatch("no_dot")
+    assert calls == []